@@ -0,0 +1,130 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+import os
+from functools import lru_cache
+from typing import Optional
+from models.auth.utils import MONGO_URI
+
+logger = logging.getLogger(__name__)
+
+# ---------------- CONFIG ----------------
+# AUTH_BACKEND=mongo (default) | memory  -- memory needs no database and
+# is meant for local load tests.
+AUTH_BACKEND = os.getenv("AUTH_BACKEND", "mongo").lower()
+MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "resume_ai")
+
+MONGO_POOL_OPTIONS = {
+    "maxPoolSize": int(os.getenv("MONGO_MAX_POOL_SIZE", "50")),
+    "minPoolSize": int(os.getenv("MONGO_MIN_POOL_SIZE", "2")),
+    "maxIdleTimeMS": int(os.getenv("MONGO_MAX_IDLE_MS", "60000")),
+    "serverSelectionTimeoutMS": int(os.getenv("MONGO_SELECT_TIMEOUT_MS", "5000")),
+    "connectTimeoutMS": int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000")),
+    "retryWrites": True,
+}
+
+USER_PROJECTION = {"_id": 0, "name": 1, "email": 1, "hashed_password": 1}
+
+
+class UserExistsError(Exception):
+    pass
+
+# ---------------- INTERFACE ----------------
+# A backend missing one of the abstract methods fails when it is created.
+class UserRepository(ABC):
+    async def ensure_indexes(self) -> None:
+        pass
+
+    @abstractmethod
+    async def find_by_email(self, email: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    async def create(self, user: dict) -> None:
+        # raises UserExistsError if the email is taken
+        ...
+
+    @abstractmethod
+    async def update_password_hash(self, email: str, hashed_password: str) -> None:
+        ...
+
+    async def close(self) -> None:
+        pass
+
+# ---------------- MONGO ----------------
+class MongoUserRepository(UserRepository):
+    def __init__(self, uri: str, db_name: str = MONGO_DB_NAME):
+        from pymongo import AsyncMongoClient
+
+        self.client = AsyncMongoClient(uri, **MONGO_POOL_OPTIONS)
+        self.users = self.client[db_name]["users"]
+
+    async def ensure_indexes(self) -> None:
+        # unique index -> O(log n) lookups and duplicate signups fail atomically
+        await self.users.create_index("email", unique=True, name="email_unique")
+
+    async def find_by_email(self, email: str) -> Optional[dict]:
+        return await self.users.find_one({"email": email}, USER_PROJECTION)
+
+    async def create(self, user: dict) -> None:
+        from pymongo.errors import DuplicateKeyError
+
+        try:
+            await self.users.insert_one(dict(user))
+        except DuplicateKeyError:
+            raise UserExistsError(user["email"])
+
+    async def update_password_hash(self, email: str, hashed_password: str) -> None:
+        await self.users.update_one(
+            {"email": email},
+            {"$set": {"hashed_password": hashed_password}}
+        )
+
+    async def close(self) -> None:
+        await self.client.close()
+
+# ---------------- IN-MEMORY ----------------
+class InMemoryUserRepository(UserRepository):
+    def __init__(self):
+        self._users = {}
+        self._lock = asyncio.Lock()
+
+    async def find_by_email(self, email: str) -> Optional[dict]:
+        user = self._users.get(email)
+        return dict(user) if user else None
+
+    async def create(self, user: dict) -> None:
+        async with self._lock:
+            if user["email"] in self._users:
+                raise UserExistsError(user["email"])
+            self._users[user["email"]] = dict(user)
+
+    async def update_password_hash(self, email: str, hashed_password: str) -> None:
+        if email in self._users:
+            self._users[email]["hashed_password"] = hashed_password
+
+# ---------------- FACTORY ----------------
+@lru_cache(maxsize=1)
+def get_user_repository() -> UserRepository:
+    if AUTH_BACKEND == "memory":
+        return InMemoryUserRepository()
+    if AUTH_BACKEND != "mongo":
+        raise ValueError(f"Unknown AUTH_BACKEND: {AUTH_BACKEND}")
+
+    if not MONGO_URI:
+        raise ValueError("MONGO_URI not found in .env")
+    return MongoUserRepository(MONGO_URI)
+
+
+async def init_user_repository() -> None:
+    try:
+        await get_user_repository().ensure_indexes()
+    except Exception as e:
+        # analysis endpoints don't need Mongo -- keep serving them
+        logger.warning("Could not ensure user indexes: %s", e)
+
+
+async def close_user_repository() -> None:
+    if get_user_repository.cache_info().currsize:
+        await get_user_repository().close()
+        get_user_repository.cache_clear()
@@ -1,45 +1,113 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, status
 from models.auth.schemas import SignupSchema, LoginSchema
+from models.auth.repository import get_user_repository, UserExistsError
+from models.auth.throttle import (
+    login_ip_limiter,
+    login_email_limiter,
+    signup_ip_limiter,
+    client_ip
+)
 from models.auth.utils import (
-    users_collection,
-    hash_password,
-    verify_password,
+    AUTH_REJECTED,
+    HashPoolBusy,
+    hash_password_async,
+    verify_password_async,
     create_access_token
 )
+from models.runtime.metrics import stage
 
 router = APIRouter(
     prefix="/auth",
     tags=["Authentication"]
 )
 
+# ---------------- HELPERS ----------------
+def _throttled(limiter, key: str, reason: str):
+    if not limiter.allow(key):
+        AUTH_REJECTED.inc(reason=reason)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many attempts, please try again later",
+            headers={"Retry-After": str(limiter.retry_after())}
+        )
+
+
+def _busy():
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication is busy, please retry shortly",
+        headers={"Retry-After": "1"}
+    )
+
 # ---------------- SIGNUP ----------------
 @router.post("/signup", status_code=status.HTTP_201_CREATED)
-def signup(data: SignupSchema):
-    if users_collection.find_one({"email": data.email}):
+async def signup(data: SignupSchema, request: Request):
+    _throttled(signup_ip_limiter, client_ip(request), "signup_ip")
+
+    users = get_user_repository()
+
+    # cheap pre-check so existing users don't pay for a bcrypt hash;
+    # the unique index still catches concurrent duplicate signups
+    with stage("mongo_find_user"):
+        existing = await users.find_by_email(data.email)
+
+    if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User already exists"
         )
 
-    users_collection.insert_one({
-        "name": data.name,
-        "email": data.email,
-        "hashed_password": hash_password(data.password)
-    })
+    try:
+        hashed = await hash_password_async(data.password)
+    except HashPoolBusy:
+        raise _busy()
+
+    try:
+        with stage("mongo_insert_user"):
+            await users.create({
+                "name": data.name,
+                "email": data.email,
+                "hashed_password": hashed
+            })
+    except UserExistsError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="User already exists"
+        )
 
     return {"message": "Signup successful"}
 
 # ---------------- LOGIN ----------------
 @router.post("/login")
-def login(data: LoginSchema):
-    user = users_collection.find_one({"email": data.email})
+async def login(data: LoginSchema, request: Request):
+    _throttled(login_ip_limiter, client_ip(request), "login_ip")
+    _throttled(login_email_limiter, data.email.lower(), "login_email")
 
-    if not user or not verify_password(data.password, user["hashed_password"]):
+    users = get_user_repository()
+
+    with stage("mongo_find_user"):
+        user = await users.find_by_email(data.email)
+
+    valid, new_hash = False, None
+    if user:
+        try:
+            valid, new_hash = await verify_password_async(
+                data.password, user["hashed_password"]
+            )
+        except HashPoolBusy:
+            raise _busy()
+
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
 
+    # stored hash used an old BCRYPT_ROUNDS -> upgrade it now
+    if new_hash:
+        with stage("mongo_update_user"):
+            await users.update_password_hash(user["email"], new_hash)
+
     token = create_access_token({"sub": user["email"]})
 
     return {
@@ -0,0 +1,61 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# ---------------- CONFIG ----------------
+# Attempts per window. Checked before any DB or bcrypt work so a login
+# flood is rejected for the cost of a dict lookup.
+LOGIN_LIMIT_PER_IP = int(os.getenv("LOGIN_LIMIT_PER_IP", "30"))
+LOGIN_LIMIT_PER_EMAIL = int(os.getenv("LOGIN_LIMIT_PER_EMAIL", "10"))
+SIGNUP_LIMIT_PER_IP = int(os.getenv("SIGNUP_LIMIT_PER_IP", "10"))
+THROTTLE_WINDOW_SECONDS = float(os.getenv("THROTTLE_WINDOW_SECONDS", "60"))
+THROTTLE_MAX_KEYS = int(os.getenv("THROTTLE_MAX_KEYS", "100000"))
+
+# Only honour X-Forwarded-For behind a proxy that sets it -- otherwise a
+# client could rotate it to dodge the per-IP limit.
+TRUST_PROXY_HEADERS = os.getenv("TRUST_PROXY_HEADERS", "0") == "1"
+
+
+class RateLimiter:
+    # Token bucket per key; least recently seen keys are evicted so the
+    # table stays bounded under a spray of random IPs / emails.
+
+    def __init__(self, limit: int, window: float = THROTTLE_WINDOW_SECONDS,
+                 max_keys: int = THROTTLE_MAX_KEYS):
+        self.capacity = float(limit)
+        self.rate = limit / window
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def allow(self, key: str) -> bool:
+        if self.capacity <= 0:
+            return True  # limit 0 disables the check
+
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.pop(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - last) * self.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed
+
+    def retry_after(self) -> int:
+        return max(1, int(1 / self.rate)) if self.rate else 1
+
+
+login_ip_limiter = RateLimiter(LOGIN_LIMIT_PER_IP)
+login_email_limiter = RateLimiter(LOGIN_LIMIT_PER_EMAIL)
+signup_ip_limiter = RateLimiter(SIGNUP_LIMIT_PER_IP)
+
+
+def client_ip(request) -> str:
+    forwarded = request.headers.get("x-forwarded-for")
+    if forwarded and TRUST_PROXY_HEADERS:
+        return forwarded.split(",", 1)[0].strip()
+    return request.client.host if request.client else "unknown"
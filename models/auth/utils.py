@@ -1,9 +1,20 @@
-from pymongo import MongoClient
 from passlib.context import CryptContext
 from jose import jwt
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+import asyncio
 import os
+import time
 from dotenv import load_dotenv
+from models.runtime.metrics import (
+    timed,
+    Counter,
+    STAGE_SECONDS,
+    POOL_ACTIVE,
+    POOL_QUEUE_DEPTH,
+    register_collector
+)
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 ENV_PATH = os.path.join(BASE_DIR, ".env")
@@ -16,28 +27,97 @@ MONGO_URI = os.getenv("MONGO_URI")
 if not SECRET_KEY:
     raise ValueError("SECRET_KEY not found in .env")
 
-if not MONGO_URI:
-    raise ValueError("MONGO_URI not found in .env")
-
 # ---------------- CONFIG ----------------
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Changing BCRYPT_ROUNDS makes every stored hash with another cost
+# "need update"; it is transparently re-hashed on the next good login.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# bcrypt releases the GIL, so a small dedicated pool hashes in parallel
+# without touching the event loop or the analysis endpoints' threads.
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", "2"))
+BCRYPT_MAX_PENDING = int(os.getenv("BCRYPT_MAX_PENDING", "32"))
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_desired_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_desired_rounds=BCRYPT_ROUNDS
+)
 
 # ---------------- DB ----------------
-client = MongoClient(MONGO_URI)
-db = client["resume_ai"]
-users_collection = db["users"]
+# See models.auth.repository (MONGO_URI is only required for AUTH_BACKEND=mongo)
 
 # ---------------- PASSWORD ----------------
+@timed("bcrypt_hash")
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
+@timed("bcrypt_verify")
 def verify_password(password: str, hashed: str) -> bool:
     return pwd_context.verify(password, hashed)
 
+@timed("bcrypt_verify")
+def verify_and_update_password(password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    # -> (valid, new_hash or None when the stored cost is current)
+    return pwd_context.verify_and_update(password, hashed)
+
+# ---------------- PASSWORD POOL ----------------
+class HashPoolBusy(Exception):
+    pass
+
+
+AUTH_REJECTED = Counter(
+    "resume_ai_auth_rejected_total",
+    "Auth requests shed before doing bcrypt work",
+    labels=("reason",)
+)
+
+_hash_pool = ThreadPoolExecutor(
+    max_workers=BCRYPT_WORKERS,
+    thread_name_prefix="bcrypt"
+)
+_pending = 0  # queued + running; only touched from the event loop
+
+
+def _timed_in_pool(submitted: float, fn, *args):
+    STAGE_SECONDS.observe_key(("bcrypt_queue_wait",), time.perf_counter() - submitted)
+    return fn(*args)
+
+
+async def _run_in_hash_pool(fn, *args):
+    global _pending
+    if _pending >= BCRYPT_MAX_PENDING:
+        AUTH_REJECTED.inc(reason="hash_pool_full")
+        raise HashPoolBusy()
+
+    _pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            _hash_pool, _timed_in_pool, time.perf_counter(), fn, *args
+        )
+    finally:
+        _pending -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_in_hash_pool(hash_password, password)
+
+
+async def verify_password_async(password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    return await _run_in_hash_pool(verify_and_update_password, password, hashed)
+
+
+@register_collector
+def _collect_hash_pool():
+    POOL_ACTIVE.set(min(_pending, BCRYPT_WORKERS), pool="bcrypt")
+    POOL_QUEUE_DEPTH.set(max(_pending - BCRYPT_WORKERS, 0), pool="bcrypt")
+
 # ---------------- JWT ----------------
+@timed("jwt_encode")
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -0,0 +1,66 @@
+import argparse
+import json
+import random
+import sys
+import time
+
+from models.bench.corpus import SIZES, generate_resume_pages, generate_jd
+
+# Run from the repo root:
+#   python -m models.bench.ats_bulk --resumes 10000 --out ats_bulk.json
+#
+# Scores N synthetic resume texts against one JD with the keyword ATS
+# scorer (resume_jb_matcher), once as a single batch and once one resume
+# per call (the old per-request path) on a sample, extrapolated to N.
+# PDF parsing is left out: it is the same per resume in both modes.
+
+def resume_texts(n: int):
+    sizes = list(SIZES)
+    return [
+        "\n".join("\n".join(page) for page in
+                  generate_resume_pages(random.Random(seed).choice(sizes), seed))
+        for seed in range(n)
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk vs per-resume keyword ATS scoring")
+    parser.add_argument("--resumes", type=int, default=10000)
+    parser.add_argument("--sample", type=int, default=300,
+                        help="resumes scored one per call (extrapolated)")
+    parser.add_argument("--out", default="ats_bulk_results.json")
+    args = parser.parse_args(argv)
+
+    from models.model.resume_jb_matcher import score_resumes
+
+    texts = resume_texts(args.resumes)
+    jd = generate_jd(0)
+
+    start = time.perf_counter()
+    bulk = score_resumes(texts, jd)
+    bulk_s = time.perf_counter() - start
+
+    sample = texts[:args.sample]
+    start = time.perf_counter()
+    single = [score_resumes([t], jd)[0] for t in sample]
+    single_s = (time.perf_counter() - start) * len(texts) / len(sample)
+
+    # every score is per (resume, JD) pair: bulk must equal per-resume
+    identical = bulk[:len(single)] == single
+    report = {
+        "resumes": len(texts),
+        "bulk_seconds": round(bulk_s, 3),
+        "per_resume_seconds_extrapolated": round(single_s, 3),
+        "speedup": round(single_s / bulk_s, 1),
+        "bulk_equals_per_resume": identical,
+    }
+    print(json.dumps(report, indent=2))
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Results saved at: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+import random
+
+# =================================================
+# SYNTHETIC RESUME / JD CORPUS
+# =================================================
+# Deterministic (seeded) so two benchmark runs see identical inputs.
+
+SKILLS = (
+    "react", "javascript", "node", "express", "mongodb", "python",
+    "sql", "html", "css", "machine learning", "docker", "aws",
+    "rest api", "angular", "firebase", "socket", "typescript", "redis"
+)
+
+ACTION_VERBS = (
+    "Built", "Developed", "Designed", "Implemented", "Optimized",
+    "Created", "Engineered", "Integrated", "Deployed"
+)
+
+WEAK_OPENERS = ("Worked on", "Responsible for", "Helped with")
+
+DOMAINS = ("finance", "healthcare", "ecommerce", "banking", "education")
+
+RESPONSIBILITIES = (
+    "design", "develop", "deploy", "optimize",
+    "maintain", "collaborate", "lead", "scale"
+)
+
+# Rough sizes -> (pages, bullets per page)
+SIZES = {
+    "small": (1, 8),
+    "medium": (2, 14),
+    "large": (4, 22),
+    "xlarge": (6, 30),
+}
+
+LINES_PER_PAGE = 48
+LINE_WIDTH = 90
+
+
+def _bullet(rng: random.Random) -> str:
+    opener = rng.choice(ACTION_VERBS + WEAK_OPENERS)
+    tools = ", ".join(rng.sample(SKILLS, 2))
+    return (
+        f"• {opener} a {rng.choice(DOMAINS)} platform using {tools}, "
+        f"serving {rng.randint(1, 90)}k users and cutting latency by {rng.randint(5, 60)}%"
+    )
+
+
+def _wrap(line: str):
+    while len(line) > LINE_WIDTH:
+        cut = line.rfind(" ", 0, LINE_WIDTH)
+        cut = cut if cut > 0 else LINE_WIDTH
+        yield line[:cut]
+        line = "  " + line[cut:].lstrip()
+    yield line
+
+
+def generate_resume_pages(size: str, seed: int):
+    rng = random.Random(seed)
+    n_pages, bullets_per_page = SIZES[size]
+
+    header = [
+        f"Candidate {seed}",
+        "Summary",
+        f"Software engineer with {rng.randint(0, 9)} years of experience "
+        f"in {rng.choice(DOMAINS)} systems.",
+        "Technical Skills",
+        ", ".join(rng.sample(SKILLS, rng.randint(4, 12))),
+        "Education",
+        "B.Tech in Computer Science",
+    ]
+
+    pages = []
+    for page_no in range(n_pages):
+        lines = list(header) if page_no == 0 else []
+        lines.append("Projects" if page_no % 2 else "Work Experience")
+        for _ in range(bullets_per_page):
+            lines.extend(_wrap(_bullet(rng)))
+        pages.append(lines[:LINES_PER_PAGE])
+    return pages
+
+
+def generate_jd(seed: int) -> str:
+    rng = random.Random(10_000 + seed)
+    skills = ", ".join(rng.sample(SKILLS, rng.randint(3, 7)))
+    duties = ", ".join(rng.sample(RESPONSIBILITIES, 3))
+    return (
+        f"We are hiring a backend engineer with {rng.randint(1, 6)}+ years "
+        f"of experience in {rng.choice(DOMAINS)}. Required skills: {skills}. "
+        f"You will {duties} production services and work on project based "
+        f"development with a small team."
+    )
+
+
+# =================================================
+# MINIMAL PDF WRITER
+# =================================================
+# Just enough PDF (one Helvetica font, one text stream per page) for
+# pdfplumber to extract the text back -- no third-party dependency.
+
+def _pdf_escape(line: str) -> bytes:
+    raw = line.encode("cp1252", errors="replace")
+    return raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def build_pdf(pages) -> bytes:
+    objects = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(b"")          # patched once the page tree id is known
+    page_tree = add(b"")
+    font = add(
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica "
+        b"/Encoding /WinAnsiEncoding >>"
+    )
+
+    page_ids = []
+    for lines in pages:
+        stream = [b"BT /F1 10 Tf 12 TL 50 780 Td"]
+        for line in lines:
+            stream.append(b"(" + _pdf_escape(line) + b") '")
+        stream.append(b"ET")
+        content = b"\n".join(stream)
+        content_id = add(
+            b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream"
+        )
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+            % (page_tree, font, content_id)
+        ))
+
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % page_tree
+    kids = b" ".join(b"%d 0 R" % i for i in page_ids)
+    objects[page_tree - 1] = (
+        b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids)
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + body + b"\nendobj\n"
+
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for off in offsets:
+        out += b"%010d 00000 n \n" % off
+    out += (
+        b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+        % (len(objects) + 1, catalog, xref)
+    )
+    return bytes(out)
+
+
+def build_corpus(per_size: int = 5, sizes=tuple(SIZES)):
+    # -> list of dicts: {"name", "size", "pages", "pdf", "jd"}
+    corpus = []
+    seed = 0
+    for size in sizes:
+        for _ in range(per_size):
+            pages = generate_resume_pages(size, seed)
+            corpus.append({
+                "name": f"{size}-{seed}",
+                "size": size,
+                "pages": len(pages),
+                "pdf": build_pdf(pages),
+                "jd": generate_jd(seed),
+            })
+            seed += 1
+    return corpus
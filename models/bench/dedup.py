@@ -0,0 +1,97 @@
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from models.bench.ats_bulk import resume_texts
+
+# Run from the repo root:
+#   python -m models.bench.dedup --resumes 5000 --out dedup.json
+#
+# Stores N synthetic resumes in a fresh near-duplicate store, then looks
+# up three kinds of incoming resume:
+#   reexport  same text, different layout / case / bullets (should match)
+#   edited    a few words changed (should match)
+#   unrelated resumes never stored (should not match)
+# and reports match rates and per-resume signature / lookup latency.
+
+def reexport(text: str, rng: random.Random) -> str:
+    lines = [l.replace("•", rng.choice(["-", "*", "·"])) for l in text.split("\n")]
+    words = " ".join(lines).split()
+    # re-wrap at another width, random case changes
+    out, width = [], rng.randint(60, 120)
+    line = ""
+    for w in words:
+        if len(line) + len(w) > width:
+            out.append(line)
+            line = ""
+        line += (w.upper() if rng.random() < 0.05 else w) + " "
+    return "\n".join(out + [line])
+
+
+def edited(text: str, rng: random.Random, changes: int = 3) -> str:
+    words = text.split(" ")
+    for _ in range(changes):
+        words[rng.randrange(len(words))] = rng.choice(["led", "built", "2024", "team"])
+    return " ".join(words)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Near-duplicate detection accuracy and latency")
+    parser.add_argument("--resumes", type=int, default=5000)
+    parser.add_argument("--probes", type=int, default=500)
+    parser.add_argument("--out", default="dedup_results.json")
+    args = parser.parse_args(argv)
+
+    store_path = os.path.join(tempfile.mkdtemp(), "dedup.sqlite")
+    os.environ["DEDUP_STORE_PATH"] = store_path
+    from models.model import resume_dedup as dedup
+
+    texts = resume_texts(args.resumes + args.probes)
+    stored, fresh = texts[:args.resumes], texts[args.resumes:]
+
+    start = time.perf_counter()
+    dedup.find_duplicates("bench", [(f"r{i}", t) for i, t in enumerate(stored)])
+    build_s = time.perf_counter() - start
+
+    rng = random.Random(0)
+    sample = rng.sample(range(len(stored)), args.probes)
+    probes = {
+        "reexport": [reexport(stored[i], rng) for i in sample],
+        "edited": [edited(stored[i], rng) for i in sample],
+        "unrelated": fresh,
+    }
+
+    store = dedup.get_dedup_store()
+    report = {"stored": len(stored), "build_seconds": round(build_s, 3), "probes": {}}
+    for kind, items in probes.items():
+        sig_s = lookup_s = 0.0
+        matched = 0
+        for text in items:
+            t0 = time.perf_counter()
+            sig = dedup.signature(text)
+            t1 = time.perf_counter()
+            found = dedup.best_match(sig, store.candidates(dedup.band_keys("bench", sig)))
+            t2 = time.perf_counter()
+            sig_s += t1 - t0
+            lookup_s += t2 - t1
+            matched += found is not None
+        report["probes"][kind] = {
+            "count": len(items),
+            "matched_rate": round(matched / len(items), 3),
+            "signature_ms": round(sig_s / len(items) * 1000, 3),
+            "lookup_ms": round(lookup_s / len(items) * 1000, 3),
+        }
+
+    print(json.dumps(report, indent=2))
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Results saved at: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+import argparse
+import json
+import re
+import sys
+import timeit
+
+from models.model.resume_features import (
+    SKILL_VOCAB,
+    WEAK_PHRASES,
+    extract_features,
+    extract_features_batch
+)
+
+# Run from the repo root:
+#   python -m models.bench.feature_extraction --out feature_extraction.json
+#
+# Checks the shared extractor returns the same features as the inline
+# regex extractor the old training script used, then times both (and
+# the batch path) on the same corpus.
+
+# =================================================
+# LEGACY EXTRACTOR (inline regex, as the old training script did)
+# =================================================
+def legacy_extract_features(text: str):
+    text = text.lower()
+
+    resume_length = len(text.split())
+    num_skills = sum(1 for skill in SKILL_VOCAB if skill in text)
+    num_projects = text.count("project")
+    num_bullets = len(re.findall(r"(?:•|-|–|\*)", text))
+
+    experience_years = 0
+    matches = re.findall(r"(\d+)\s*(?:years?|months?)", text)
+    if matches:
+        experience_years = max(map(int, matches))
+
+    grammar_issues = sum(text.count(p) for p in WEAK_PHRASES)
+
+    return [
+        resume_length,
+        num_skills,
+        num_projects,
+        num_bullets,
+        experience_years,
+        grammar_issues
+    ]
+
+
+SAMPLE = (
+    "Software Engineer with 3 years of experience building REST APIs in Python.\n"
+    "• Developed a React dashboard used by 2k users - deployed with Docker on AWS.\n"
+    "• Worked on a Node and Express project backed by MongoDB; responsible for CI.\n"
+    "Internship: 6 months, machine learning project, basic knowledge of SQL.\n"
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shared vs legacy feature extraction")
+    parser.add_argument("--resumes", type=int, default=500)
+    parser.add_argument("--out", default="feature_extraction_results.json")
+    args = parser.parse_args(argv)
+
+    corpus = [SAMPLE * (5 + i % 40) for i in range(args.resumes)]
+
+    # Same numbers, or the trained model would silently drift
+    for text in corpus[:40]:
+        assert legacy_extract_features(text) == extract_features(text)
+
+    legacy = min(timeit.repeat(
+        lambda: [legacy_extract_features(t) for t in corpus], number=3, repeat=5
+    ))
+    shared = min(timeit.repeat(
+        lambda: [extract_features(t) for t in corpus], number=3, repeat=5
+    ))
+    batch = min(timeit.repeat(
+        lambda: extract_features_batch(corpus), number=3, repeat=5
+    ))
+
+    report = {
+        "resumes": len(corpus),
+        "legacy_ms": round(legacy * 1000, 1),
+        "shared_ms": round(shared * 1000, 1),
+        "batch_ms": round(batch * 1000, 1),
+        "shared_speedup": round(legacy / shared, 2),
+        "batch_speedup": round(legacy / batch, 2),
+    }
+    print(json.dumps(report, indent=2))
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Results saved at: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from models.bench.ats_bulk import resume_texts
+from models.bench.corpus import generate_jd
+
+# Run from the repo root:
+#   python -m models.bench.fidelity --resumes 5000 --out fidelity.json
+#
+# Per fidelity mode (fast / balanced / accurate):
+#   score-only   embed N resumes in batches + dot with the JD vector
+#                (pre-screening throughput, resumes/sec on one process)
+#   full         full_gap_analysis on a sample, fresh chunk store
+# and how far each mode's scores / verdicts / missing skills land from
+# the accurate mode's on the same resumes.
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fast / balanced / accurate semantic matching")
+    parser.add_argument("--resumes", type=int, default=5000)
+    parser.add_argument("--full", type=int, default=100,
+                        help="resumes run through the full gap analysis per mode")
+    parser.add_argument("--batch", type=int, default=256)
+    parser.add_argument("--modes", default="fast,balanced,accurate")
+    parser.add_argument("--out", default="fidelity_results.json")
+    args = parser.parse_args(argv)
+
+    os.environ["CHUNK_STORE_PATH"] = os.path.join(tempfile.mkdtemp(), "chunks.sqlite")
+    from models.model import semantic_resume_jb_matcher as semantic
+    from models.model.fidelity import encode_mode
+    from models.model.jd_profile import get_jd_profile, mode_profile
+
+    texts = [t.lower()[:semantic.MAX_TEXT_CHARS] for t in resume_texts(args.resumes)]
+    profile = get_jd_profile(generate_jd(0))
+    modes = args.modes.split(",")
+
+    report = {"resumes": len(texts), "full_sample": args.full, "modes": {}}
+    scores, results = {}, {}
+    for mode in modes:
+        jd_vec = mode_profile(profile, mode).vector
+        encode_mode(["warm up"], mode)  # model / table load not timed
+
+        start = time.perf_counter()
+        mode_scores = np.concatenate([
+            np.asarray(encode_mode(texts[i:i + args.batch], mode), dtype=np.float32) @ jd_vec
+            for i in range(0, len(texts), args.batch)
+        ]) * 100
+        score_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results[mode] = [semantic.full_gap_analysis(t, profile, mode) for t in texts[:args.full]]
+        full_s = time.perf_counter() - start
+
+        scores[mode] = mode_scores
+        report["modes"][mode] = {
+            "score_only_resumes_per_second": round(len(texts) / score_s, 1),
+            "full_analysis_ms_per_resume": round(full_s / args.full * 1000, 3),
+        }
+
+    if "accurate" in modes:
+        for mode in modes:
+            same = [
+                (r["verdict"] == a["verdict"], r["missing_skills"] == a["missing_skills"])
+                for r, a in zip(results[mode], results["accurate"])
+            ]
+            report["modes"][mode]["vs_accurate"] = {
+                "mean_abs_score_diff": round(float(np.abs(scores[mode] - scores["accurate"]).mean()), 3),
+                "score_correlation": round(float(np.corrcoef(scores[mode], scores["accurate"])[0, 1]), 4),
+                "same_verdict_rate": round(float(np.mean([v for v, _ in same])), 3),
+                "same_missing_skills_rate": round(float(np.mean([m for _, m in same])), 3),
+            }
+
+    print(json.dumps(report, indent=2))
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Results saved at: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from models.bench.ats_bulk import resume_texts
+from models.bench.corpus import generate_jd
+
+# Run from the repo root:
+#   python -m models.bench.load_shedding --requests 400 --concurrency 32 --out load.json
+#
+# Fires a burst of semantic analyses from C threads (queue depth = C
+# once the burst is going), with load shedding off and on, and reports
+# wall time, p50 / p95 request latency and how many requests ran at
+# each level. Each request analyses a distinct resume, nothing cached.
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Semantic analysis under a burst, shedding off / on")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--out", default="load_shedding_results.json")
+    args = parser.parse_args(argv)
+
+    from models.model import semantic_resume_jb_matcher as semantic
+    from models.model.jd_profile import get_jd_profile
+    from models.runtime import load_control
+
+    profile = get_jd_profile(generate_jd(0))
+    texts = resume_texts(args.requests * 2)
+    report = {"requests": args.requests, "concurrency": args.concurrency, "runs": {}}
+
+    for run, enabled in (("shedding_off", False), ("shedding_on", True)):
+        load_control.DEGRADE_ENABLED = enabled
+        controller = load_control.LoadController("bench", semantic.LOAD_LEVELS)
+        batch = texts[:args.requests] if enabled else texts[args.requests:]
+
+        def request(text):
+            with controller.admit() as admission:
+                mode, reduced = semantic.load_plan(admission.level, "accurate")
+                semantic.full_gap_analysis(text.lower()[:semantic.MAX_TEXT_CHARS], profile, mode, reduced)
+            return admission.level, time.monotonic() - admission.start
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.concurrency) as pool:
+            results = list(pool.map(request, batch))
+        wall = time.perf_counter() - start
+
+        latencies = np.array([s for _, s in results]) * 1000
+        report["runs"][run] = {
+            "wall_seconds": round(wall, 3),
+            "p50_ms": round(float(np.percentile(latencies, 50)), 1),
+            "p95_ms": round(float(np.percentile(latencies, 95)), 1),
+            "levels": dict(Counter(level for level, _ in results)),
+        }
+
+    print(json.dumps(report, indent=2))
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Results saved at: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+from models.bench.corpus import build_corpus
+
+# Run from the repo root (Linux only, reads /proc):
+#   python -m models.bench.memory --workers 4 --out memory.json
+#
+# Starts gunicorn (models/gunicorn.conf.py) once with PRELOAD_MODELS=0
+# (every worker loads its own models, like uvicorn --workers) and once
+# with PRELOAD_MODELS=1 (load in master, fork), sends some traffic, and
+# reports RSS / PSS / USS of the master and of each worker.
+#
+# PSS splits shared pages between the processes sharing them, so the
+# PSS total is what the box actually pays; RSS double-counts shared pages.
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+CONF = os.path.join("models", "gunicorn.conf.py")
+
+MODES = {"per_worker": "0", "preload": "1"}
+
+# =================================================
+# /proc
+# =================================================
+def memory_kb(pid: int) -> dict:
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup", "r") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 3 and parts[-1] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss_mb": round(fields.get("Rss", 0) / 1024, 1),
+        "pss_mb": round(fields.get("Pss", 0) / 1024, 1),
+        "uss_mb": round((fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)) / 1024, 1),
+        "shared_mb": round((fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0)) / 1024, 1),
+    }
+
+
+def children(pid: int):
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children", "r") as f:
+            return [int(p) for p in f.read().split()]
+    except OSError:
+        found = []
+        for entry in os.listdir("/proc"):
+            if entry.isdigit():
+                try:
+                    with open(f"/proc/{entry}/stat", "r") as f:
+                        if int(f.read().rsplit(")", 1)[1].split()[1]) == pid:
+                            found.append(int(entry))
+                except OSError:
+                    continue
+        return found
+
+# =================================================
+# SERVER
+# =================================================
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_until_settled(master: int, workers: int, timeout: float):
+    # all workers forked and their RSS unchanged for 2 s (models loaded)
+    deadline = time.time() + timeout
+    last, stable_since = None, None
+    while time.time() < deadline:
+        pids = children(master)
+        if len(pids) >= workers:
+            rss = sum(memory_kb(p)["rss_mb"] for p in pids)
+            if last is not None and abs(rss - last) < 1:
+                stable_since = stable_since or time.time()
+                if time.time() - stable_since >= 2:
+                    return pids
+            else:
+                stable_since = None
+            last = rss
+        time.sleep(0.5)
+    raise RuntimeError("workers did not settle in time")
+
+
+def post_semantic(base_url: str, doc):
+    # /semantic is unauthenticated and touches the embedding model
+    boundary = "benchboundary"
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"job_description\"\r\n\r\n"
+        f"{doc['jd']}\r\n"
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"resume\"; filename=\"r.pdf\"\r\n"
+        "Content-Type: application/pdf\r\n\r\n"
+    ).encode() + doc["pdf"] + f"\r\n--{boundary}--\r\n".encode()
+    req = urllib.request.Request(
+        f"{base_url}/semantic/full-gap-analysis", data=body,
+        headers={"Content-Type": f"multipart/form-data; boundary={boundary}"}
+    )
+    urllib.request.urlopen(req, timeout=120).read()
+
+
+def send_traffic(base_url: str, corpus, requests: int):
+    for i in range(requests):
+        post_semantic(base_url, corpus[i % len(corpus)])
+
+
+def start_server(workers: int, **env_overrides):
+    # -> (gunicorn master process, port); result cache off so every
+    # request does real work
+    port = free_port()
+    env = dict(
+        os.environ,
+        WEB_CONCURRENCY=str(workers),
+        BIND=f"127.0.0.1:{port}",
+        RESULT_CACHE_BACKEND="none",
+        **env_overrides
+    )
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", CONF, "models.main:app"],
+        cwd=REPO_ROOT, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    return proc, port
+
+
+def run_mode(mode: str, workers: int, requests: int, corpus, timeout: float) -> dict:
+    proc, port = start_server(workers, PRELOAD_MODELS=MODES[mode])
+    try:
+        pids = wait_until_settled(proc.pid, workers, timeout)
+        idle = {p: memory_kb(p) for p in pids}
+
+        send_traffic(f"http://127.0.0.1:{port}", corpus, requests)
+        pids = children(proc.pid)
+        busy = {p: memory_kb(p) for p in pids}
+        master = memory_kb(proc.pid)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+    return {
+        "master": master,
+        "workers_idle": list(idle.values()),
+        "workers_after_traffic": list(busy.values()),
+        "total_pss_mb": round(master["pss_mb"] + sum(m["pss_mb"] for m in busy.values()), 1),
+        "total_rss_mb": round(master["rss_mb"] + sum(m["rss_mb"] for m in busy.values()), 1),
+    }
+
+# =================================================
+# CLI
+# =================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RSS / PSS per worker: per-worker load vs pre-fork preload")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=list(MODES))
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--out", default="memory_results.json")
+    args = parser.parse_args(argv)
+
+    corpus = build_corpus(2, ("small", "medium"))
+    report = {"workers": args.workers, "requests": args.requests, "modes": {}}
+
+    for mode in args.modes:
+        result = run_mode(mode, args.workers, args.requests, corpus, args.timeout)
+        report["modes"][mode] = result
+
+        print(f"{mode}: total PSS {result['total_pss_mb']} MB, total RSS {result['total_rss_mb']} MB")
+        print(f"  master   {result['master']}")
+        for i, m in enumerate(result["workers_after_traffic"]):
+            print(f"  worker {i} {m}")
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Results saved at: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
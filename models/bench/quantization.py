@@ -0,0 +1,97 @@
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from models.bench.ats_bulk import resume_texts
+from models.bench.corpus import generate_jd
+
+# Run from the repo root:
+#   python -m models.bench.quantization --resumes 10000 --out quantization.json
+#
+# Embeds N synthetic resumes and Q JDs once, then for each storage
+# format compares quantized scores with float32: bytes per vector,
+# score error, recall@K of the top-K per JD, search latency, and for
+# int8 also recall after exact float32 re-scoring of a shortlist.
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Quantized vs float32 embedding search")
+    parser.add_argument("--resumes", type=int, default=10000)
+    parser.add_argument("--jds", type=int, default=20)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--shortlist", type=int, default=40,
+                        help="rows re-scored in float32 for int8+rescore")
+    parser.add_argument("--out", default="quantization_results.json")
+    args = parser.parse_args(argv)
+
+    from models.model import semantic_resume_jb_matcher as semantic
+    from models.model.embeddings import encode_texts
+    from models.model.jd_profile import get_jd_profile
+    from models.runtime.quantization import QuantizedMatrix, pack
+
+    texts = [t.lower()[:semantic.MAX_TEXT_CHARS] for t in resume_texts(args.resumes)]
+    resumes = np.asarray(encode_texts(texts), dtype=np.float32)
+    queries = np.stack([get_jd_profile(generate_jd(k)).vector for k in range(args.jds)])
+    k = args.top_k
+
+    # float32 reference, tiled the same way (same summation order)
+    exact = QuantizedMatrix(resumes, "float32").scores(queries)
+    # k-th best exact score per JD; a returned row counts as a hit if its
+    # exact score reaches it (ties in the corpus count either way)
+    kth = -np.partition(-exact, k - 1, axis=0)[k - 1]
+
+    def recall(tops):
+        return round(float(np.mean([
+            np.count_nonzero(exact[t, j] >= kth[j] - 1e-6) / k for j, t in enumerate(tops)
+        ])), 4)
+
+    report = {
+        "resumes": len(resumes),
+        "dim": int(resumes.shape[1]),
+        "jds": len(queries),
+        "top_k": k,
+        "json_list_bytes_per_vector": len(json.dumps(resumes[0].tolist())),
+        "formats": {},
+    }
+
+    for fmt in ("float32", "float16", "int8"):
+        matrix = QuantizedMatrix(resumes, fmt)
+        start = time.perf_counter()
+        tops = [matrix.top_k(q, k)[0] for q in queries]
+        search_ms = (time.perf_counter() - start) / len(queries) * 1000
+
+        error = np.abs(matrix.scores(queries) - exact)
+        entry = {
+            "ram_bytes_per_vector": round(matrix.nbytes / len(matrix), 1),
+            "stored_bytes_per_vector": len(json.dumps(pack(resumes[0], fmt))),
+            "mean_abs_score_error": float(error.mean()),
+            "max_abs_score_error": float(error.max()),
+            f"recall_at_{k}": recall(tops),
+            "search_ms_per_jd": round(search_ms, 3),
+        }
+
+        if fmt == "int8":
+            start = time.perf_counter()
+            tops = [
+                matrix.top_k(q, k, exact_rows=lambda rows: resumes[rows],
+                             shortlist=args.shortlist)[0]
+                for q in queries
+            ]
+            entry["rescored"] = {
+                "shortlist": args.shortlist,
+                f"recall_at_{k}": recall(tops),
+                "search_ms_per_jd": round((time.perf_counter() - start) / len(queries) * 1000, 3),
+            }
+        report["formats"][fmt] = entry
+
+    print(json.dumps(report, indent=2))
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Results saved at: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
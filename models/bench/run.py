@@ -0,0 +1,325 @@
+import argparse
+import importlib
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from models.bench.corpus import SIZES, build_corpus
+
+# Run as: python -m models.bench.run --out bench.json [--baseline old.json]
+
+# =================================================
+# TARGETS
+# =================================================
+# "wrap" lists module attributes timed as their own stage while the
+# analyzer runs; whatever is left over is reported as "score".
+
+# analyzer modules (and the result cache with them) are imported only
+# once main() has set RESULT_CACHE_BACKEND
+
+def _semantic(mod, path, jd):
+    from models.model.jd_profile import get_jd_profile
+    text = mod.extract_text_from_pdf(path)
+    return mod.full_gap_analysis(text, get_jd_profile(jd))
+
+
+def _quality(mod, path, jd):
+    return mod.compute_resume_quality_score(mod.extract_text_from_pdf(path))
+
+
+def _improvement(mod, path, jd):
+    from models.model.jd_profile import get_jd_profile
+    return mod.generate_resume_improvements(mod.extract_text_from_pdf(path), get_jd_profile(jd))
+
+
+def _ml(mod, path, jd):
+    text = mod.extract_text_from_pdf(path)
+    return float(mod.get_model().predict([mod.extract_features(text)])[0])
+
+
+TARGETS = {
+    "semantic": {
+        "module": "models.model.semantic_resume_jb_matcher",
+        "endpoint": "/semantic/full-gap-analysis",
+        "needs_jd": True,
+        "core": _semantic,
+        "wrap": {"extract_text_from_pdf": "parse", "embed": "embed"},
+    },
+    "quality": {
+        "module": "models.model.resume_quality_score",
+        "endpoint": "/quality/score",
+        "needs_jd": False,
+        "core": _quality,
+        "wrap": {"extract_text_from_pdf": "parse"},
+    },
+    "improvement": {
+        "module": "models.model.resume_improvement_engine",
+        "endpoint": "/improvement/suggestions",
+        "needs_jd": True,
+        "core": _improvement,
+        "wrap": {"extract_text_from_pdf": "parse"},
+    },
+    "ml": {
+        "module": "models.model.resume_ml_score",
+        "endpoint": "/ml-score/predict",
+        "needs_jd": False,
+        "core": _ml,
+        "wrap": {"extract_text_from_pdf": "parse"},
+    },
+}
+
+# =================================================
+# STATS
+# =================================================
+def percentile(values, q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * q
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def summarize(latencies_ms) -> dict:
+    return {
+        "count": len(latencies_ms),
+        "mean_ms": round(sum(latencies_ms) / max(len(latencies_ms), 1), 3),
+        "p50_ms": round(percentile(latencies_ms, 0.50), 3),
+        "p95_ms": round(percentile(latencies_ms, 0.95), 3),
+        "p99_ms": round(percentile(latencies_ms, 0.99), 3),
+        "max_ms": round(max(latencies_ms, default=0.0), 3),
+    }
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / scale, 1)
+
+# =================================================
+# CORE (IN-PROCESS FUNCTIONS)
+# =================================================
+@contextmanager
+def _timed_attrs(mod, wrap: dict, stages: dict):
+    originals = {}
+
+    def timed(fn, stage):
+        def inner(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                stages[stage] = stages.get(stage, 0.0) + time.perf_counter() - start
+        return inner
+
+    for attr, stage in wrap.items():
+        originals[attr] = getattr(mod, attr)
+        setattr(mod, attr, timed(originals[attr], stage))
+    try:
+        yield
+    finally:
+        for attr, fn in originals.items():
+            setattr(mod, attr, fn)
+
+
+def bench_core(name: str, spec: dict, corpus, repeat: int) -> dict:
+    mod = importlib.import_module(spec["module"])
+
+    # warm-up: lazy model loads must not land in the first sample
+    _run_core_once(mod, spec, corpus[0], {})
+
+    totals, stage_samples = [], {}
+    for _ in range(repeat):
+        for doc in corpus:
+            stages = {}
+            start = time.perf_counter()
+            _run_core_once(mod, spec, doc, stages)
+            totals.append((time.perf_counter() - start) * 1000)
+            for stage, secs in stages.items():
+                stage_samples.setdefault(stage, []).append(secs * 1000)
+
+    return {
+        "latency": summarize(totals),
+        "stages": {s: summarize(v) for s, v in stage_samples.items()},
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def _run_core_once(mod, spec, doc, stages: dict):
+    start = time.perf_counter()
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+        tmp.write(doc["pdf"])
+        path = tmp.name
+    stages["upload"] = time.perf_counter() - start
+
+    try:
+        start = time.perf_counter()
+        with _timed_attrs(mod, spec["wrap"], stages):
+            spec["core"](mod, path, doc["jd"])
+        inner = sum(stages.get(s, 0.0) for s in spec["wrap"].values())
+        stages["score"] = time.perf_counter() - start - inner
+    finally:
+        os.remove(path)
+
+# =================================================
+# HTTP (ENDPOINTS)
+# =================================================
+def make_client(base_url: str = None, token: str = None):
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+
+    if base_url:
+        import httpx
+        return httpx.Client(base_url=base_url, headers=headers, timeout=300)
+
+    from fastapi.testclient import TestClient
+    from models.main import app
+    from models.auth.dependencies import get_current_user
+
+    app.dependency_overrides[get_current_user] = lambda: "bench@localhost"
+    return TestClient(app, headers=headers)
+
+
+def _post(client, spec, doc) -> float:
+    files = {"resume": (f"{doc['name']}.pdf", doc["pdf"], "application/pdf")}
+    data = {"job_description": doc["jd"]} if spec["needs_jd"] else None
+
+    start = time.perf_counter()
+    resp = client.post(spec["endpoint"], files=files, data=data)
+    elapsed = (time.perf_counter() - start) * 1000
+    if resp.status_code != 200:
+        raise RuntimeError(f"{spec['endpoint']} -> {resp.status_code}: {resp.text[:200]}")
+    return elapsed
+
+
+def bench_http(name: str, spec: dict, client, corpus, repeat: int, concurrency: int) -> dict:
+    _post(client, spec, corpus[0])  # warm-up
+
+    sequential = [_post(client, spec, doc) for _ in range(repeat) for doc in corpus]
+
+    jobs = [doc for _ in range(repeat) for doc in corpus]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        concurrent = list(pool.map(lambda d: _post(client, spec, d), jobs))
+    wall = time.perf_counter() - start
+
+    return {
+        "latency": summarize(sequential),
+        "concurrent": {
+            "concurrency": concurrency,
+            "latency": summarize(concurrent),
+            "throughput_rps": round(len(jobs) / wall, 3),
+        },
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+# =================================================
+# BASELINE COMPARISON
+# =================================================
+def compare(current: dict, baseline: dict, tolerance: float):
+    regressions = []
+    for key, result in current["results"].items():
+        old = baseline.get("results", {}).get(key)
+        if not old or "latency" not in result or "latency" not in old:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            before, after = old["latency"][metric], result["latency"][metric]
+            if not before:
+                continue
+            ratio = after / before
+            flag = "REGRESSION" if ratio > 1 + tolerance else ""
+            print(f"{key:24s} {metric:7s} {before:10.2f} -> {after:10.2f}  x{ratio:5.2f} {flag}")
+            if flag:
+                regressions.append((key, metric, ratio))
+    return regressions
+
+# =================================================
+# CLI
+# =================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resume-AI latency / throughput benchmark")
+    parser.add_argument("--targets", nargs="+", default=list(TARGETS), choices=list(TARGETS))
+    parser.add_argument("--mode", choices=("core", "http", "both"), default="both")
+    parser.add_argument("--sizes", nargs="+", default=list(SIZES), choices=list(SIZES))
+    parser.add_argument("--per-size", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--base-url", help="benchmark a running server instead of in-process")
+    parser.add_argument("--token", help="bearer token for --base-url")
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--baseline", help="previous results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    parser.add_argument("--cache", choices=("none", "lru", "sqlite"), default="none",
+                        help="result cache backend for in-process runs (none = measure real work)")
+    args = parser.parse_args(argv)
+
+    # must be set before the analyzer modules are imported; a cache
+    # created before that (e.g. by an importing caller) is dropped
+    os.environ["RESULT_CACHE_BACKEND"] = args.cache
+    from models.runtime.cache import get_result_cache
+    get_result_cache.cache_clear()
+
+    corpus = build_corpus(args.per_size, tuple(args.sizes))
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "corpus": {
+                "documents": len(corpus),
+                "sizes": args.sizes,
+                "pdf_bytes": sum(len(d["pdf"]) for d in corpus),
+            },
+            "repeat": args.repeat,
+            "concurrency": args.concurrency,
+            "result_cache": args.cache,
+        },
+        "results": {},
+    }
+
+    client = None
+    for name in args.targets:
+        spec = TARGETS[name]
+
+        if args.mode in ("core", "both"):
+            try:
+                report["results"][f"core:{name}"] = bench_core(name, spec, corpus, args.repeat)
+            except Exception as e:
+                report["results"][f"core:{name}"] = {"skipped": repr(e)}
+
+        if args.mode in ("http", "both"):
+            try:
+                client = client or make_client(args.base_url, args.token)
+                report["results"][f"http:{name}"] = bench_http(
+                    name, spec, client, corpus, args.repeat, args.concurrency
+                )
+            except Exception as e:
+                report["results"][f"http:{name}"] = {"skipped": repr(e)}
+
+        for key in (f"core:{name}", f"http:{name}"):
+            if key in report["results"]:
+                print(key, json.dumps(report["results"][key].get("latency")
+                                      or report["results"][key]))
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Results saved at: {args.out}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+import argparse
+import json
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from models.bench.corpus import build_corpus
+from models.bench.memory import start_server, wait_until_settled, post_semantic
+from models.bench.run import summarize
+from models.runtime.threads import available_cores
+
+# Run from the repo root:
+#   python -m models.bench.threads --workers 2 --budgets 1 2 4 --out threads.json
+#
+# For each per-worker thread budget, starts gunicorn with that
+# THREADS_PER_WORKER, drives --concurrency parallel requests and
+# reports throughput + latency. "oversubscribed" gives every worker all
+# cores (the old default) for comparison.
+
+# =================================================
+# BENCH
+# =================================================
+def run_budget(budget, workers: int, corpus, requests: int, concurrency: int, timeout: float) -> dict:
+    threads = available_cores() if budget == "oversubscribed" else int(budget)
+    proc, port = start_server(workers, THREADS_PER_WORKER=str(threads))
+    base_url = f"http://127.0.0.1:{port}"
+
+    try:
+        wait_until_settled(proc.pid, workers, timeout)
+        with urllib.request.urlopen(f"{base_url}/diagnostics/threads", timeout=30) as resp:
+            effective = json.load(resp)
+
+        for doc in corpus[:concurrency]:
+            post_semantic(base_url, doc)  # warm-up
+
+        def one(i):
+            start = time.perf_counter()
+            post_semantic(base_url, corpus[i % len(corpus)])
+            return (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            latencies = list(pool.map(one, range(requests)))
+        wall = time.perf_counter() - start
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+    return {
+        "threads_per_worker": threads,
+        "effective": {k: effective.get(k) for k in ("budget", "torch", "threadpools")},
+        "latency": summarize(latencies),
+        "throughput_rps": round(requests / wall, 3),
+    }
+
+# =================================================
+# CLI
+# =================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Throughput across per-worker thread budgets")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--budgets", nargs="+", default=["1", "2", "oversubscribed"])
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="parallel clients (default: 2 per worker)")
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--out", default="threads_results.json")
+    args = parser.parse_args(argv)
+
+    concurrency = args.concurrency or 2 * args.workers
+    corpus = build_corpus(2, ("small", "medium", "large"))
+    report = {
+        "cores": available_cores(),
+        "workers": args.workers,
+        "concurrency": concurrency,
+        "results": {},
+    }
+
+    for budget in args.budgets:
+        result = run_budget(budget, args.workers, corpus, args.requests, concurrency, args.timeout)
+        report["results"][budget] = result
+        print(f"threads/worker={result['threads_per_worker']:<3} "
+              f"rps={result['throughput_rps']:<8} p50={result['latency']['p50_ms']}ms "
+              f"p95={result['latency']['p95_ms']}ms")
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Results saved at: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from models.bench.ats_bulk import resume_texts
+from models.bench.corpus import generate_jd
+
+# Run from the repo root:
+#   python -m models.bench.two_stage --resumes 5000 --out two_stage.json
+#
+# Ranks N synthetic resumes against a few JDs, exhaustively (embed every
+# resume) and two-stage (lexical prefilter -> embed only the top-M), and
+# reports latency per JD and recall@K of the two-stage top-K against the
+# exhaustive top-K. Resume vectors are encoded fresh (no chunk store) so
+# both modes pay the embedding cost they would on unseen resumes.
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Two-stage vs exhaustive ranking")
+    parser.add_argument("--resumes", type=int, default=5000)
+    parser.add_argument("--jds", type=int, default=5)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--prefilter", default="50,100,200,500",
+                        help="comma separated top-M values")
+    parser.add_argument("--out", default="two_stage_results.json")
+    args = parser.parse_args(argv)
+
+    from models.model import semantic_resume_jb_matcher as semantic
+    from models.model.candidate_ranking import rank_candidates
+    from models.model.embeddings import encode_texts
+    from models.model.jd_profile import get_jd_profile
+    from models.runtime.quantization import QuantizedMatrix
+
+    def vectors(texts):
+        return QuantizedMatrix(encode_texts(texts), "float32")
+
+    texts = [t.lower()[:semantic.MAX_TEXT_CHARS] for t in resume_texts(args.resumes)]
+    profiles = [get_jd_profile(generate_jd(k)) for k in range(args.jds)]
+    k = args.top_k
+
+    def run(mode, top_m):
+        start = time.perf_counter()
+        ranked = [
+            [i for i, _, _ in rank_candidates(texts, p, k, top_m, mode, vectors)[0]]
+            for p in profiles
+        ]
+        return ranked, (time.perf_counter() - start) / len(profiles)
+
+    exact, exact_s = run("exhaustive", len(texts))
+    report = {
+        "resumes": len(texts),
+        "jds": len(profiles),
+        "top_k": k,
+        "exhaustive_seconds_per_jd": round(exact_s, 3),
+        "two_stage": [],
+    }
+
+    for top_m in (int(m) for m in args.prefilter.split(",")):
+        ranked, seconds = run("two_stage", top_m)
+        recall = np.mean([len(set(a) & set(b)) / len(b) for a, b in zip(ranked, exact)])
+        report["two_stage"].append({
+            "prefilter_top_m": top_m,
+            "seconds_per_jd": round(seconds, 3),
+            "speedup": round(exact_s / seconds, 1),
+            f"recall_at_{k}": round(float(recall), 3),
+        })
+
+    print(json.dumps(report, indent=2))
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Results saved at: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
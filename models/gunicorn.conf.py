@@ -0,0 +1,45 @@
+import os
+
+# Pre-fork serving: models load once in the master and are shared
+# copy-on-write by the workers. Run from the repo root:
+#
+#   gunicorn -c models/gunicorn.conf.py models.main:app
+#
+# (plain `uvicorn --workers N` spawns fresh interpreters, so every
+# worker loads its own copy of each model)
+
+# ---------------- SERVER ----------------
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.getenv("WORKER_TIMEOUT", "120"))
+graceful_timeout = 30
+
+# PRELOAD_MODELS=0 -> every worker loads its own models (for comparison)
+preload_app = os.getenv("PRELOAD_MODELS", "1") == "1"
+
+# ---------------- THREADS ----------------
+# Per-worker budget = cores // workers (see models.runtime.threads).
+# The BLAS / OpenMP env has to be in place before the master preloads
+# the app; each worker resizes its pools in the app lifespan.
+os.environ["WEB_CONCURRENCY"] = str(workers)
+
+from models.runtime.threads import configure_env, set_torch_threads  # noqa: E402
+configure_env()
+
+# ---------------- HOOKS ----------------
+def when_ready(server):
+    # master, after the app is imported and before any worker forks
+    if not preload_app:
+        return
+    from models.runtime.preload import warm_models, freeze_heap
+
+    set_torch_threads(1)  # no OpenMP pool in the master -> fork-safe
+    warm_models()
+    freeze_heap()
+
+
+def post_worker_init(worker):
+    if not preload_app:
+        from models.runtime.preload import warm_models
+        warm_models()
@@ -1,12 +1,40 @@
+# Thread budget env (OMP/MKL/OPENBLAS) must be set before numpy / torch load
+from models.runtime.threads import configure_env, apply_budget, effective_settings
+configure_env()
+
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from models.auth.router import router as auth_router
-from models.model.semantic_resume_jb_matcher import router as semantic_router
+from models.auth.repository import init_user_repository, close_user_repository
+from models.model.semantic_resume_jb_matcher import router as semantic_router, SEMANTIC_LOAD
+from models.model.semantic_jd_matcher import router as semantic_match_router
 from models.model.resume_quality_score import router as quality_router
 from models.model.resume_improvement_engine import router as improvement_router
 from models.model.resume_ml_score import router as ml_score_router
+from models.model.analysis_jobs import router as jobs_router
+from models.model.resume_incremental import router as incremental_router
+from models.model.jd_registry import router as jd_router
+from models.model.match_matrix import router as matrix_router
+from models.model.resume_jb_matcher import router as ats_router
+from models.model.candidate_ranking import router as rank_router
+from models.model.resume_index import router as resume_index_router
+from models.auth.utils import SECRET_KEY, ALGORITHM
+from models.runtime.metrics import render_metrics
+from models.runtime.profiling import install_profiler
+from models.runtime.jobs import shutdown_job_manager
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    apply_budget()                 # per worker: torch / BLAS / OpenMP pools
+    await init_user_repository()   # unique email index
+    yield
+    shutdown_job_manager()
+    await close_user_repository()
 
-app = FastAPI(title="AI Resume ATS System")
+
+app = FastAPI(title="AI Resume ATS System", lifespan=lifespan)
 
 # ✅ CORS FIX
 app.add_middleware(
@@ -17,13 +45,42 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in cProfile dumps for slow requests (PROFILE_* env vars)
+install_profiler(app, SECRET_KEY, ALGORITHM)
+
 # Routers
 app.include_router(semantic_router)
+app.include_router(semantic_match_router)
 app.include_router(quality_router)
 app.include_router(improvement_router)
 app.include_router(ml_score_router)
+app.include_router(jobs_router)
+app.include_router(incremental_router)
+app.include_router(jd_router)
+app.include_router(matrix_router)
+app.include_router(ats_router)
+app.include_router(rank_router)
+app.include_router(resume_index_router)
 app.include_router(auth_router)
 
 @app.get("/")
 def root():
     return {"status": "ATS Backend Running"}
+
+# Prometheus text exposition format (async so pool collectors run on the event loop)
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(
+        render_metrics(),
+        media_type="text/plain; version=0.0.4"
+    )
+
+# Effective per-worker thread settings (torch, BLAS/OpenMP pools, forest n_jobs)
+@app.get("/diagnostics/threads", include_in_schema=False)
+async def thread_diagnostics():
+    return effective_settings()
+
+# Load level of the semantic analyzer in this worker (models.runtime.load_control)
+@app.get("/diagnostics/load", include_in_schema=False)
+async def load_diagnostics():
+    return SEMANTIC_LOAD.status()
@@ -1,8 +1,9 @@
 import joblib
-from ml.train_resume_score_model import extract_features
+from models.model.resume_features import extract_features, check_schema_version
 from models.model.resume_quality_score import compute_resume_quality_score
 
 model = joblib.load("models/resume_score_model.pkl")
+check_schema_version(model)
 
 
 with open("models/sample_resume.txt", "r", encoding="utf-8") as f:
@@ -1,6 +1,5 @@
 import pandas as pd
 import numpy as np
-import re
 import joblib
 
 from sklearn.model_selection import train_test_split
@@ -9,6 +8,11 @@ from sklearn.metrics import mean_absolute_error
 
 # ✅ CORRECT IMPORT (works when run as module)
 from models.model.resume_quality_score import compute_resume_quality_score
+from models.model.resume_features import (
+    FEATURE_SCHEMA,
+    FEATURE_SCHEMA_VERSION,
+    extract_features_batch
+)
 
 
 # =================================================
@@ -16,48 +20,6 @@ from models.model.resume_quality_score import compute_resume_quality_score
 # =================================================
 DATA_PATH = "models/archive/Resume/Resume.csv"
 
-SKILL_VOCAB = [
-    "react", "javascript", "node", "express", "mongodb",
-    "python", "sql", "html", "css", "machine learning",
-    "docker", "aws", "api", "rest"
-]
-
-WEAK_PHRASES = [
-    "worked on",
-    "responsible for",
-    "helped with",
-    "basic knowledge",
-    "good knowledge"
-]
-
-
-# =================================================
-# FEATURE EXTRACTION
-# =================================================
-def extract_features(text: str):
-    text = text.lower()
-
-    resume_length = len(text.split())
-    num_skills = sum(1 for skill in SKILL_VOCAB if skill in text)
-    num_projects = text.count("project")
-    num_bullets = len(re.findall(r"(?:•|-|–|\*)", text))
-
-    experience_years = 0
-    exp_matches = re.findall(r"(\d+)\s*(?:years?|months?)", text)
-    if exp_matches:
-        experience_years = max(map(int, exp_matches))
-
-    grammar_issues = sum(text.count(p) for p in WEAK_PHRASES)
-
-    return [
-        resume_length,
-        num_skills,
-        num_projects,
-        num_bullets,
-        experience_years,
-        grammar_issues
-    ]
-
 
 # =================================================
 # TRAINING PIPELINE
@@ -68,19 +30,15 @@ df = df[["Resume_str"]].dropna()
 
 print(f"✅ Total resumes loaded: {len(df)}")
 
-X, y = [], []
-
-print("⚙️ Extracting features & generating labels...")
-
-for resume_text in df["Resume_str"]:
-    features = extract_features(resume_text)
-    rule_score = compute_resume_quality_score(resume_text)["resume_score"]
+resumes = df["Resume_str"].astype(str).tolist()
 
-    X.append(features)
-    y.append(rule_score)
+print(f"⚙️ Extracting features (schema v{FEATURE_SCHEMA_VERSION}) & generating labels...")
 
-X = np.array(X)
-y = np.array(y)
+X = extract_features_batch(resumes)
+y = np.array([
+    compute_resume_quality_score(resume_text)["resume_score"]
+    for resume_text in resumes
+])
 
 print("📊 Feature matrix shape:", X.shape)
 print("🎯 Label vector shape:", y.shape)
@@ -99,6 +57,8 @@ model = RandomForestRegressor(
 )
 
 model.fit(X_train, y_train)
+model.feature_schema_version_ = FEATURE_SCHEMA_VERSION
+model.feature_schema_ = FEATURE_SCHEMA
 
 predictions = model.predict(X_test)
 mae = mean_absolute_error(y_test, predictions)
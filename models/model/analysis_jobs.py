@@ -0,0 +1,229 @@
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, status
+from models.runtime.profiling import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from typing import Optional
+import asyncio
+import os
+import time
+from models.auth.dependencies import get_current_user
+from models.model import semantic_resume_jb_matcher as semantic
+from models.model import resume_quality_score as quality
+from models.model import resume_improvement_engine as improvement
+from models.model import resume_ml_score as ml
+from models.runtime.cache import cached_result, content_hash
+from models.model.jd_profile import JDProfile
+from models.model.jd_registry import resolve_jd, resolve_jd_requirements
+from models.model.pdf_text import parse_pages, joined, combined_budget
+from models.model.resume_index import index_resumes
+from models.runtime.jobs import get_job_manager, JobQueueFull, TERMINAL
+from models.runtime.streaming import sse_event, STREAM_HEADERS
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["Async Analysis Jobs"]
+)
+
+# =================================================
+# CONSTANTS
+# =================================================
+ANALYZERS = ("semantic", "quality", "improvements", "ml")
+
+SSE_POLL_SECONDS = float(os.getenv("JOBS_SSE_POLL_SECONDS", "0.25"))
+SSE_HEARTBEAT_SECONDS = 15.0
+
+# =================================================
+# PIPELINE
+# =================================================
+# The PDF is parsed once, at the largest page/char budget among the
+# requested analyzers; each analyzer's text is identical to what its
+# sync endpoint extracts, so results share the same result-cache entries.
+
+BUDGETS = {
+    "semantic": (semantic.MAX_PAGES, semantic.MAX_TEXT_CHARS),
+    "quality": (quality.MAX_PAGES, quality.MAX_TEXT_CHARS),
+    "improvements": (improvement.MAX_PAGES, None),
+    "ml": (ml.MAX_PAGES, ml.MAX_TEXT_CHARS),
+}
+
+def analysis_pipeline(pdf_bytes: bytes, profile: JDProfile, analyzers,
+                      owner: Optional[str] = None, filename: Optional[str] = None):
+    resume_hash = content_hash(pdf_bytes)
+
+    def run(ctx):
+        max_pages, max_chars = combined_budget(*(BUDGETS[a] for a in analyzers))
+        pages, skipped = parse_pages(pdf_bytes, max_pages, max_chars, analyzer="jobs")
+        if not joined(pages, max_pages).strip():
+            raise HTTPException(400, "Unable to extract resume text")
+        ctx.report("parse", {
+            "pages_parsed": len(pages),
+            "pages_skipped": skipped,
+            "characters": sum(len(p) for p in pages)
+        })
+        index_resumes(owner, [(resume_hash, filename, joined(pages, max_pages))])
+
+        steps = {
+            "semantic": lambda: cached_result(
+                "semantic", semantic.ANALYZER_VERSION,
+                (resume_hash, profile.jd_id),
+                lambda: semantic.full_gap_analysis(
+                    joined(pages, semantic.MAX_PAGES).lower()[:semantic.MAX_TEXT_CHARS],
+                    profile
+                )
+            ),
+            "quality": lambda: cached_result(
+                "quality", quality.ANALYZER_VERSION, (resume_hash,),
+                lambda: quality.compute_resume_quality_score(
+                    joined(pages, quality.MAX_PAGES)[:quality.MAX_TEXT_CHARS]
+                )
+            ),
+            "improvements": lambda: cached_result(
+                "improvement", improvement.ANALYZER_VERSION,
+                (resume_hash, profile.jd_id),
+                lambda: improvement.generate_resume_improvements(
+                    joined(pages, improvement.MAX_PAGES), profile
+                )
+            ),
+            "ml": lambda: cached_result(
+                "ml", ml.ANALYZER_VERSION, (resume_hash,),
+                lambda: ml.score_text(
+                    joined(pages, ml.MAX_PAGES)[:ml.MAX_TEXT_CHARS]
+                )
+            ),
+        }
+
+        for name in analyzers:
+            ctx.check_cancelled()
+            try:
+                value = steps[name]()
+            except Exception as e:
+                # one analyzer failing shouldn't throw away the others
+                ctx.error(name, str(getattr(e, "detail", None) or repr(e)))
+                continue
+            ctx.report(name, value)
+
+    return run
+
+# =================================================
+# HELPERS
+# =================================================
+def _parse_analyzers(raw: Optional[str]):
+    if not raw:
+        return ANALYZERS
+    names = tuple(dict.fromkeys(a.strip() for a in raw.split(",") if a.strip()))
+    unknown = [a for a in names if a not in ANALYZERS]
+    if unknown or not names:
+        raise HTTPException(400, f"Unknown analyzers: {', '.join(unknown)}")
+    return names
+
+
+def _owned_job(job_id: str, current_user: str):
+    job = get_job_manager().store.get(job_id)
+    if job is None or job["owner"] != current_user:
+        raise HTTPException(404, "Job not found")
+    return job
+
+
+def _public(job: dict) -> dict:
+    return {k: v for k, v in job.items() if k != "owner"}
+
+# =================================================
+# API
+# =================================================
+@router.post("/analyze", status_code=status.HTTP_202_ACCEPTED)
+async def submit_analysis(
+    resume: UploadFile = File(...),
+    job_description: Optional[str] = Form(None),
+    jd_id: Optional[str] = Form(None),
+    analyzers: Optional[str] = Form(None),
+    current_user: str = Depends(get_current_user)
+):
+    if not resume.filename.lower().endswith(".pdf"):
+        raise HTTPException(400, "Only PDF allowed")
+
+    names = _parse_analyzers(analyzers)
+    # only the semantic analyzer needs JD vectors
+    resolve = resolve_jd if "semantic" in names else resolve_jd_requirements
+    profile = await run_in_threadpool(resolve, job_description, jd_id)
+    data = await resume.read()
+
+    # the first call opens the job store and fails orphans: off the loop
+    manager = await run_in_threadpool(get_job_manager)
+    try:
+        job_id = await run_in_threadpool(
+            manager.submit,
+            current_user, "analysis", analysis_pipeline(data, profile, names, current_user, resume.filename)
+        )
+    except JobQueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Analysis queue is full, please retry shortly",
+            headers={"Retry-After": "5"}
+        )
+
+    return {
+        "job_id": job_id,
+        "status": "queued",
+        "analyzers": ["parse", *names],
+        "status_url": f"/jobs/{job_id}",
+        "events_url": f"/jobs/{job_id}/events"
+    }
+
+
+@router.get("/{job_id}")
+async def job_status(job_id: str, current_user: str = Depends(get_current_user)):
+    # job store calls are sqlite: off the event loop
+    return _public(await run_in_threadpool(_owned_job, job_id, current_user))
+
+
+@router.delete("/{job_id}")
+async def cancel_job(job_id: str, current_user: str = Depends(get_current_user)):
+    await run_in_threadpool(_owned_job, job_id, current_user)
+    manager = await run_in_threadpool(get_job_manager)
+    if not await run_in_threadpool(manager.cancel, job_id):
+        raise HTTPException(409, "Job already finished")
+    return {"job_id": job_id, "status": "cancelled"}
+
+
+@router.get("/{job_id}/events")
+async def job_events(job_id: str, current_user: str = Depends(get_current_user)):
+    await run_in_threadpool(_owned_job, job_id, current_user)
+    store = (await run_in_threadpool(get_job_manager)).store
+
+    async def stream():
+        sent_results, sent_errors = set(), set()
+        last_status, last_beat = None, time.monotonic()
+
+        while True:
+            job = await run_in_threadpool(store.get, job_id)
+            if job is None:
+                yield sse_event("status", {"job_id": job_id, "status": "expired"})
+                return
+
+            for name, value in job["results"].items():
+                if name not in sent_results:
+                    sent_results.add(name)
+                    yield sse_event("result", {"analyzer": name, "result": value})
+
+            for name, message in job["errors"].items():
+                if name not in sent_errors:
+                    sent_errors.add(name)
+                    yield sse_event("error", {"analyzer": name, "detail": message})
+
+            if job["status"] != last_status:
+                last_status = job["status"]
+                yield sse_event("status", {"job_id": job_id, "status": last_status})
+
+            if last_status in TERMINAL:
+                return
+
+            if time.monotonic() - last_beat > SSE_HEARTBEAT_SECONDS:
+                last_beat = time.monotonic()
+                yield ": keep-alive\n\n"
+
+            await asyncio.sleep(SSE_POLL_SECONDS)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers=STREAM_HEADERS
+    )
@@ -0,0 +1,227 @@
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
+from models.runtime.profiling import run_in_threadpool
+from typing import List, Optional
+import os
+import numpy as np
+from models.auth.dependencies import get_current_user
+from models.model import semantic_resume_jb_matcher as semantic
+from models.model.jd_profile import JDProfile
+from models.model.jd_registry import resolve_jd
+from models.model.match_matrix import resume_vectors
+from models.model.pdf_text import parse_pages, joined
+from models.model.resume_dedup import find_duplicates, canonical_hashes, duplicate_flag
+from models.model.resume_index import index_resumes
+from models.model.resume_jb_matcher import clean_text, ngram_counts
+from models.model.skill_taxonomy import mentions_skill
+from models.runtime.cache import cached_result, content_hash
+from models.runtime.metrics import stage, timed
+
+router = APIRouter(
+    prefix="/rank",
+    tags=["Candidate Ranking"]
+)
+
+# =================================================
+# CONFIG (ENV)
+# =================================================
+RANK_MAX_RESUMES = int(os.getenv("RANK_MAX_RESUMES", "10000"))
+RANK_MAX_TOP_K = 100
+
+# two_stage: lexical prefilter keeps the top-M, only those are embedded.
+# exhaustive: every resume is embedded (the reference ranking).
+RANK_MODES = ("two_stage", "exhaustive")
+RANK_DEFAULT_PREFILTER = int(os.getenv("RANK_DEFAULT_PREFILTER", "200"))
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# lexical score = (1 - w) * BM25 (scaled to the pool's best) + w * share
+# of the JD's skills the resume names
+LEXICAL_SKILL_WEIGHT = float(os.getenv("LEXICAL_SKILL_WEIGHT", "0.5"))
+
+# =================================================
+# STAGE 1: LEXICAL PREFILTER
+# =================================================
+# Built per request over the pool: BM25 on clean_text tokens (the JD's
+# terms are the query) and an inverted index JD skill -> resumes.
+
+def bm25_scores(texts, query: str) -> np.ndarray:
+    # row 0 of the count matrix is the query; its terms are the columns scored
+    counts = ngram_counts(
+        [clean_text(query)] + [clean_text(t) for t in texts], bigrams=False
+    )
+    docs = counts[1:]
+    terms = counts[0].indices
+    if not len(terms):
+        return np.zeros(len(texts))
+
+    lengths = np.asarray(docs.sum(axis=1)).ravel()
+    avg_length = lengths.mean() or 1.0
+    tf = docs[:, terms].tocsr()
+
+    df = tf.getnnz(axis=0)
+    idf = np.log(1 + (len(texts) - df + 0.5) / (df + 0.5))
+    rows = np.repeat(np.arange(len(texts)), np.diff(tf.indptr))
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[rows] / avg_length)
+    tf.data = idf[tf.indices] * tf.data * (BM25_K1 + 1) / (tf.data + norm)
+    return np.asarray(tf.sum(axis=1)).ravel()
+
+
+def skill_postings(texts, skills) -> dict:
+    # skill -> sorted positions of the texts that name it (only the
+    # JD's skills are indexed; nothing else is queried)
+    return {
+        skill: np.array(
+            [i for i, text in enumerate(texts) if mentions_skill(text, skill)],
+            dtype=np.int64
+        )
+        for skill in skills
+    }
+
+
+def skill_coverage(postings: dict, n: int) -> np.ndarray:
+    if not postings:
+        return np.zeros(n)
+    hits = np.concatenate(list(postings.values()))
+    return np.bincount(hits, minlength=n) / len(postings)
+
+
+@timed("lexical_prefilter")
+def lexical_scores(texts, profile: JDProfile) -> np.ndarray:
+    bm25 = bm25_scores(texts, profile.text)
+    if bm25.max() > 0:
+        bm25 = bm25 / bm25.max()
+    coverage = skill_coverage(skill_postings(texts, profile.skills), len(texts))
+    return (1 - LEXICAL_SKILL_WEIGHT) * bm25 + LEXICAL_SKILL_WEIGHT * coverage
+
+# =================================================
+# STAGE 2: SEMANTIC RE-RANK
+# =================================================
+# Same score as /semantic/full-gap-analysis (resume vector . JD vector),
+# on the candidates only. vectors(texts) -> QuantizedMatrix of the
+# L2-normalised rows, scored from their stored codes (see VECTOR_STORAGE).
+
+@timed("rank_candidates")
+def rank_candidates(texts, profile: JDProfile, top_k: int, top_m: int,
+                    mode: str = "two_stage", vectors=resume_vectors):
+    # -> ([(text index, semantic score 0-100, lexical score or None)]
+    #     best first, number of texts embedded)
+    lexical = None
+    candidates = np.arange(len(texts))
+    if mode == "two_stage" and len(texts) > top_m:
+        lexical = lexical_scores(texts, profile)
+        candidates = np.argpartition(-lexical, top_m - 1)[:top_m]
+
+    with stage("rerank"):
+        matrix = vectors([texts[i] for i in candidates])
+        best, scores = matrix.top_k(profile.vector, top_k)
+
+    ranked = [
+        (
+            int(candidates[k]),
+            float(score) * 100,
+            None if lexical is None else float(lexical[candidates[k]])
+        )
+        for k, score in zip(best, scores)
+    ]
+    return ranked, len(candidates)
+
+# =================================================
+# ANALYSIS
+# =================================================
+def parse_resumes(files):
+    # -> ([(filename, pdf hash, text)], skipped filenames); same text
+    # the semantic endpoint analyses
+    parsed, skipped = [], []
+    for name, data in files:
+        try:
+            pages, _ = parse_pages(
+                data, semantic.MAX_PAGES, semantic.MAX_TEXT_CHARS, analyzer="rank"
+            )
+        except Exception:
+            pages = []
+        text = joined(pages, semantic.MAX_PAGES).lower()[:semantic.MAX_TEXT_CHARS]
+        if text.strip():
+            parsed.append((name, content_hash(data), text))
+        else:
+            skipped.append(name)
+    return parsed, skipped
+
+
+def rank_resumes(files, profile: JDProfile, mode: str, top_k: int,
+                 top_m: int, gaps: bool, owner: Optional[str] = None) -> dict:
+    parsed, skipped = parse_resumes(files)
+    if not parsed:
+        raise HTTPException(400, "Unable to extract text from any resume")
+    index_resumes(owner, [(h, name, text) for name, h, text in parsed])
+
+    texts = [text for _, _, text in parsed]
+    duplicates = find_duplicates(owner, [(name, text) for name, _, text in parsed])
+    # near-duplicates reuse the cached vector of the resume they duplicate
+    keys = dict(zip(texts, canonical_hashes(texts, duplicates)))
+
+    ranked, embedded = rank_candidates(
+        texts, profile, top_k, top_m, mode,
+        vectors=lambda batch: resume_vectors(batch, [keys[t] for t in batch])
+    )
+
+    results = []
+    for rank, (i, score, lexical) in enumerate(ranked, start=1):
+        name, data_hash, text = parsed[i]
+        item = {
+            "rank": rank,
+            "filename": name,
+            "duplicate_of": duplicate_flag(duplicates[i]),
+            "semantic_match_score": round(score, 2),
+            "verdict": semantic.match_verdict(score),
+            "lexical_score": None if lexical is None else round(lexical * 100, 2),
+        }
+        if gaps:
+            # shares the /semantic/full-gap-analysis result cache
+            item["analysis"] = cached_result(
+                "semantic", semantic.ANALYZER_VERSION, (data_hash, profile.jd_id),
+                lambda: semantic.full_gap_analysis(text, profile)
+            )
+        results.append(item)
+
+    return {
+        "status": "success",
+        "mode": mode,
+        "jd_id": profile.jd_id,
+        "pool_size": len(parsed),
+        "semantic_candidates": embedded,
+        "skipped_resumes": skipped,
+        "results": results,
+    }
+
+# =================================================
+# API
+# =================================================
+@router.post("/candidates")
+async def rank_resume_pool(
+    resumes: List[UploadFile] = File(...),
+    job_description: Optional[str] = Form(None),
+    jd_id: Optional[str] = Form(None),
+    mode: str = Form("two_stage"),
+    top_k: int = Form(10),
+    prefilter_top_m: int = Form(RANK_DEFAULT_PREFILTER),
+    gaps: bool = Form(False),
+    current_user: str = Depends(get_current_user)
+):
+    if mode not in RANK_MODES:
+        raise HTTPException(400, f"mode must be one of: {', '.join(RANK_MODES)}")
+    if len(resumes) > RANK_MAX_RESUMES:
+        raise HTTPException(400, f"At most {RANK_MAX_RESUMES} resumes per request")
+    if not 1 <= top_k <= RANK_MAX_TOP_K:
+        raise HTTPException(400, f"top_k must be between 1 and {RANK_MAX_TOP_K}")
+    if prefilter_top_m < top_k:
+        raise HTTPException(400, "prefilter_top_m must be at least top_k")
+    if any(not r.filename.lower().endswith(".pdf") for r in resumes):
+        raise HTTPException(400, "Only PDF allowed")
+
+    profile = await run_in_threadpool(resolve_jd, job_description, jd_id)
+    files = [(r.filename, await r.read()) for r in resumes]
+
+    return await run_in_threadpool(
+        rank_resumes, files, profile, mode, top_k, prefilter_top_m, gaps, current_user
+    )
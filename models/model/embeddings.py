@@ -0,0 +1,71 @@
+import logging
+import os
+from functools import lru_cache
+from sentence_transformers import SentenceTransformer
+from models.runtime.metrics import Counter
+from models.runtime.embedding_service import (
+    EmbeddingClient,
+    EmbeddingServiceError,
+    EMBEDDING_SERVICE_SOCKET
+)
+
+logger = logging.getLogger(__name__)
+
+# ===============================
+# LOAD MODEL (LAZY + SAFE)
+# ===============================
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+@lru_cache(maxsize=1)
+def get_model():
+    return SentenceTransformer(MODEL_NAME)
+
+# ===============================
+# ENCODING
+# ===============================
+# EMBEDDING_SERVICE_SOCKET set -> encode in the shared embedding service
+# process instead of loading the model in every API worker.
+EMBEDDING_SERVICE_FALLBACK = os.getenv("EMBEDDING_SERVICE_FALLBACK", "1") == "1"
+
+EMBED_FALLBACKS = Counter(
+    "resume_ai_embedding_service_fallbacks_total",
+    "Encodes done locally because the embedding service was unreachable"
+)
+
+@lru_cache(maxsize=1)
+def get_embedding_client():
+    if not EMBEDDING_SERVICE_SOCKET:
+        return None
+    return EmbeddingClient(EMBEDDING_SERVICE_SOCKET, MODEL_NAME)
+
+
+def encode_texts(texts):
+    # -> float32 array (len(texts), dim), L2-normalised
+    client = get_embedding_client()
+    if client is not None:
+        try:
+            return client.encode(texts)
+        except EmbeddingServiceError as e:
+            if not EMBEDDING_SERVICE_FALLBACK:
+                raise
+            EMBED_FALLBACKS.inc()
+            logger.warning("%s -- encoding locally", e)
+    return get_model().encode(texts, normalize_embeddings=True)
+
+# ===============================
+# QUANTIZED ENCODER ("balanced")
+# ===============================
+# Same model with its Linear layers dynamically quantized to int8
+# (CPU): ~1/4 of the weight memory and a faster encode, vectors within
+# a small error of the full model. Always local, never the service.
+
+@lru_cache(maxsize=1)
+def get_quantized_model():
+    import torch
+    model = SentenceTransformer(MODEL_NAME, device="cpu")
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def encode_texts_quantized(texts):
+    # -> float32 array (len(texts), dim), L2-normalised
+    return get_quantized_model().encode(texts, normalize_embeddings=True)
@@ -0,0 +1,44 @@
+import os
+from fastapi import HTTPException
+from models.model.embeddings import MODEL_NAME, encode_texts, encode_texts_quantized
+from models.model.static_embeddings import encode_texts_static
+
+# =================================================
+# FIDELITY MODES
+# =================================================
+#   accurate  the transformer (embedding service or local model)
+#   balanced  the same model, int8 dynamically quantized, local
+#   fast      static wordpiece vectors, mean-pooled, pure NumPy
+# Every mode returns L2-normalised vectors of the model's dimension, so
+# analyzers and thresholds are the same; only the vectors are coarser.
+FIDELITY_MODES = ("fast", "balanced", "accurate")
+SEMANTIC_DEFAULT_MODE = os.getenv("SEMANTIC_DEFAULT_MODE", "accurate")
+if SEMANTIC_DEFAULT_MODE not in FIDELITY_MODES:
+    raise ValueError(f"SEMANTIC_DEFAULT_MODE must be one of: {', '.join(FIDELITY_MODES)}")
+
+# keys for everything embedded in a mode (chunk store, skill matrix);
+# accurate keeps the plain model name, so existing entries stay valid
+MODE_TAGS = {
+    "accurate": MODEL_NAME,
+    "balanced": f"{MODEL_NAME}-qint8",
+    "fast": f"static-{MODEL_NAME}",
+}
+
+MODE_ENCODERS = {
+    "accurate": encode_texts,
+    "balanced": encode_texts_quantized,
+    "fast": encode_texts_static,
+}
+
+
+def resolve_mode(mode) -> str:
+    # request value (None = server default) -> mode, 400 on unknown
+    mode = mode or SEMANTIC_DEFAULT_MODE
+    if mode not in FIDELITY_MODES:
+        raise HTTPException(400, f"mode must be one of: {', '.join(FIDELITY_MODES)}")
+    return mode
+
+
+def encode_mode(texts, mode: str = "accurate"):
+    # -> float32 array (len(texts), dim), L2-normalised
+    return MODE_ENCODERS[mode](texts)
@@ -0,0 +1,254 @@
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from typing import Optional
+import os
+import re
+import numpy as np
+from models.model.embeddings import encode_texts
+from models.model.fidelity import encode_mode
+from models.model.skill_taxonomy import find_skills
+from models.runtime.cache import LRUBackend, content_hash
+from models.runtime.metrics import stage, timed, CACHE_HITS, CACHE_MISSES, TEXTS_EMBEDDED
+
+# =================================================
+# CONFIG (ENV)
+# =================================================
+JD_PROFILE_CACHE_SIZE = int(os.getenv("JD_PROFILE_CACHE_SIZE", "256"))
+
+# same budget the semantic analyzer embeds
+MAX_JD_CHARS = 4000
+
+# Bump when extraction changes: registered profiles are rebuilt on load
+# (bump the semantic / improvement ANALYZER_VERSIONs along with it)
+PROFILE_VERSION = 2
+
+YEAR_REQUIREMENT_REGEX = re.compile(r"(\d+)\+?\s*years?")
+
+RESPONSIBILITY_KEYWORDS = (
+    "design", "develop", "deploy",
+    "optimize", "maintain", "collaborate",
+    "lead", "scale"
+)
+
+DOMAINS = ("finance", "healthcare", "ecommerce", "banking", "education", "ai", "ml")
+
+RESPONSIBILITY_PROBE = "experience to {r} systems"
+DOMAIN_PROBE = "{domain} domain experience"
+
+# =================================================
+# EXTRACTION
+# =================================================
+def normalize_jd(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def jd_key(text: str) -> str:
+    # profile ID: same JD modulo case / whitespace -> same ID. Stable
+    # across model / profile versions, so registered IDs stay valid.
+    return content_hash(normalize_jd(text))
+
+
+def extract_experience_requirement(jd: str):
+    m = YEAR_REQUIREMENT_REGEX.search(jd)
+    return int(m.group(1)) if m else None
+
+
+def extract_responsibility_requirements(jd: str):
+    return [k for k in RESPONSIBILITY_KEYWORDS if k in jd]
+
+
+def extract_domain(jd: str):
+    for d in DOMAINS:
+        if d in jd:
+            return d
+    return None
+
+# =================================================
+# REQUIREMENTS (NO VECTORS)
+# =================================================
+# What keyword analyzers (improvement suggestions) need from a JD:
+# regex / taxonomy extraction only, no model load or encode.
+
+@dataclass(frozen=True)
+class JDRequirements:
+    jd_id: str
+    text: str                       # normalised (lowercase, single spaces)
+    required_years: Optional[int]
+    skills: tuple
+    responsibilities: tuple
+    domain: Optional[str]
+
+
+def extract_requirements(text: str) -> JDRequirements:
+    jd = normalize_jd(text)
+    return JDRequirements(
+        jd_id=jd_key(text),
+        text=jd,
+        required_years=extract_experience_requirement(jd),
+        skills=tuple(find_skills(jd)),
+        responsibilities=tuple(extract_responsibility_requirements(jd)),
+        domain=extract_domain(jd),
+    )
+
+
+@lru_cache(maxsize=JD_PROFILE_CACHE_SIZE)
+def get_jd_requirements(text: str) -> JDRequirements:
+    return extract_requirements(text)
+
+# =================================================
+# PROFILE
+# =================================================
+# Everything analyzers derive from the JD alone, computed once per
+# unique JD: requirements plus the JD vector and the probe vectors the
+# gap detectors compare the resume against.
+
+@dataclass(frozen=True)
+class JDProfile:
+    jd_id: str
+    text: str                       # normalised (lowercase, single spaces)
+    required_years: Optional[int]
+    skills: tuple
+    responsibilities: tuple
+    domain: Optional[str]
+    vector: np.ndarray = field(repr=False, compare=False)
+    responsibility_vectors: np.ndarray = field(repr=False, compare=False)
+    domain_vector: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+
+    def summary(self) -> dict:
+        return {
+            "jd_id": self.jd_id,
+            "required_years": self.required_years,
+            "skills": list(self.skills),
+            "responsibilities": list(self.responsibilities),
+            "domain": self.domain,
+            "characters": len(self.text),
+            "embedding_dim": int(self.vector.shape[0]),
+        }
+
+    # ---- storage: requirements as JSON, vectors as one float32 blob ----
+    def requirements(self) -> dict:
+        return {
+            "required_years": self.required_years,
+            "skills": list(self.skills),
+            "responsibilities": list(self.responsibilities),
+            "domain": self.domain,
+        }
+
+    def vector_blob(self) -> bytes:
+        rows = [self.vector[None], self.responsibility_vectors]
+        if self.domain_vector is not None:
+            rows.append(self.domain_vector[None])
+        return np.concatenate(rows).astype(np.float32).tobytes()
+
+    @classmethod
+    def from_stored(cls, jd_id: str, text: str, requirements: dict, blob: bytes):
+        n_resp = len(requirements["responsibilities"])
+        has_domain = requirements["domain"] is not None
+        vectors = np.frombuffer(blob, dtype=np.float32)
+        vectors = vectors.reshape(1 + n_resp + has_domain, -1)
+        return cls(
+            jd_id=jd_id,
+            text=text,
+            required_years=requirements["required_years"],
+            skills=tuple(requirements["skills"]),
+            responsibilities=tuple(requirements["responsibilities"]),
+            domain=requirements["domain"],
+            vector=vectors[0],
+            responsibility_vectors=vectors[1:1 + n_resp],
+            domain_vector=vectors[-1] if has_domain else None,
+        )
+
+
+def probe_texts(responsibilities, domain):
+    probes = [RESPONSIBILITY_PROBE.format(r=r) for r in responsibilities]
+    if domain:
+        probes.append(DOMAIN_PROBE.format(domain=domain))
+    return probes
+
+
+@timed("jd_profile")
+def build_jd_profile(text: str) -> JDProfile:
+    req = extract_requirements(text)
+    probes = probe_texts(req.responsibilities, req.domain)
+
+    # JD + all its probes in one encode call
+    TEXTS_EMBEDDED.inc(1 + len(probes))
+    with stage("embed"):
+        vectors = np.asarray(encode_texts([req.text[:MAX_JD_CHARS], *probes]), dtype=np.float32)
+
+    return JDProfile(
+        jd_id=req.jd_id,
+        text=req.text,
+        required_years=req.required_years,
+        skills=req.skills,
+        responsibilities=req.responsibilities,
+        domain=req.domain,
+        vector=vectors[0],
+        responsibility_vectors=vectors[1:1 + len(req.responsibilities)],
+        domain_vector=vectors[-1] if req.domain else None,
+    )
+
+# =================================================
+# CACHE
+# =================================================
+# In-process only; registered JDs are also kept on disk by
+# models.model.jd_registry, which refills this cache on lookup.
+
+@lru_cache(maxsize=1)
+def get_profile_cache():
+    return LRUBackend(max_entries=JD_PROFILE_CACHE_SIZE, ttl=0)
+
+
+def cached_jd_profile(jd_id: str) -> Optional[JDProfile]:
+    profile = get_profile_cache().get(jd_id)
+    if profile is not None:
+        CACHE_HITS.inc(cache="jd_profile")
+    else:
+        CACHE_MISSES.inc(cache="jd_profile")
+    return profile
+
+
+def remember_jd_profile(profile: JDProfile):
+    get_profile_cache().set(profile.jd_id, profile)
+
+
+def forget_jd_profile(jd_id: str):
+    get_profile_cache().delete(jd_id)
+
+
+def get_jd_profile(text: str) -> JDProfile:
+    profile = cached_jd_profile(jd_key(text))
+    if profile is None:
+        profile = build_jd_profile(text)
+        remember_jd_profile(profile)
+    return profile
+
+# =================================================
+# FIDELITY MODES
+# =================================================
+# Profiles are built (and registered) with the accurate encoder; a
+# cheaper mode compares the resume against the JD + probes re-embedded
+# with its own encoder -- vectors from different encoders don't compare.
+
+def mode_profile(profile: JDProfile, mode: str) -> JDProfile:
+    if mode == "accurate":
+        return profile
+    return _mode_profile(profile, mode)
+
+
+@lru_cache(maxsize=JD_PROFILE_CACHE_SIZE)
+def _mode_profile(profile: JDProfile, mode: str) -> JDProfile:
+    probes = probe_texts(profile.responsibilities, profile.domain)
+    TEXTS_EMBEDDED.inc(1 + len(probes))
+    with stage("embed"):
+        vectors = np.asarray(
+            encode_mode([profile.text[:MAX_JD_CHARS], *probes], mode), dtype=np.float32
+        )
+
+    n_resp = len(profile.responsibilities)
+    return replace(
+        profile,
+        vector=vectors[0],
+        responsibility_vectors=vectors[1:1 + n_resp],
+        domain_vector=vectors[-1] if profile.domain else None,
+    )
@@ -0,0 +1,229 @@
+from fastapi import APIRouter, Form, HTTPException, Depends, status
+from models.runtime.profiling import run_in_threadpool
+from functools import lru_cache
+from typing import Optional
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from models.auth.dependencies import get_current_user
+from models.model.embeddings import MODEL_NAME
+from models.model.jd_profile import (
+    PROFILE_VERSION,
+    JDProfile,
+    jd_key,
+    build_jd_profile,
+    cached_jd_profile,
+    remember_jd_profile,
+    forget_jd_profile,
+    get_jd_profile,
+    get_jd_requirements
+)
+
+router = APIRouter(
+    prefix="/jd",
+    tags=["Job Descriptions"]
+)
+
+# =================================================
+# CONFIG (ENV)
+# =================================================
+JD_REGISTRY_PATH = os.getenv(
+    "JD_REGISTRY_PATH",
+    os.path.join(tempfile.gettempdir(), "resume_ai_jd_registry.sqlite")
+)
+MAX_JD_TITLE_CHARS = 200
+
+# =================================================
+# STORE (SQLITE)
+# =================================================
+# profiles: one row per unique JD (normalised text, parsed requirements,
+#   vectors as a float32 blob), shared by everyone who registered it.
+# registrations: who registered which JD, under what title.
+# Every worker on the node reads the same file, so a jd_id registered
+# through one worker resolves on all of them (and after restarts).
+
+class JDRegistry:
+    def __init__(self, path: str = JD_REGISTRY_PATH):
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS jd_profiles ("
+            "jd_id TEXT PRIMARY KEY, text TEXT NOT NULL, requirements TEXT NOT NULL, "
+            "vectors BLOB NOT NULL, model TEXT NOT NULL, version INTEGER NOT NULL, "
+            "created REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS jd_registrations ("
+            "jd_id TEXT NOT NULL, owner TEXT NOT NULL, title TEXT, created REAL NOT NULL, "
+            "PRIMARY KEY (owner, jd_id))"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS jd_registrations_jd ON jd_registrations(jd_id)"
+        )
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        # re-open after fork: a sqlite handle must not cross processes
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def save_profile(self, profile: JDProfile):
+        self._conn().execute(
+            "INSERT OR REPLACE INTO jd_profiles "
+            "(jd_id, text, requirements, vectors, model, version, created) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                profile.jd_id, profile.text, json.dumps(profile.requirements()),
+                profile.vector_blob(), MODEL_NAME, PROFILE_VERSION, time.time()
+            )
+        )
+
+    def load_profile(self, jd_id: str) -> Optional[JDProfile]:
+        row = self._conn().execute(
+            "SELECT text, requirements, vectors, model, version "
+            "FROM jd_profiles WHERE jd_id = ?", (jd_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        text, requirements, blob, model, version = row
+        if model != MODEL_NAME or version != PROFILE_VERSION:
+            # stored with another model / extractor: rebuild from the text
+            profile = build_jd_profile(text)
+            self.save_profile(profile)
+            return profile
+        return JDProfile.from_stored(jd_id, text, json.loads(requirements), blob)
+
+    def register(self, owner: str, profile: JDProfile, title: Optional[str]):
+        self.save_profile(profile)
+        self._conn().execute(
+            "INSERT OR REPLACE INTO jd_registrations (jd_id, owner, title, created) "
+            "VALUES (?, ?, ?, ?)",
+            (profile.jd_id, owner, title, time.time())
+        )
+
+    def registrations(self, owner: str):
+        rows = self._conn().execute(
+            "SELECT r.jd_id, r.title, r.created, p.requirements "
+            "FROM jd_registrations r JOIN jd_profiles p ON p.jd_id = r.jd_id "
+            "WHERE r.owner = ? ORDER BY r.created DESC", (owner,)
+        ).fetchall()
+        return [
+            {"jd_id": r[0], "title": r[1], "created": r[2], **json.loads(r[3])}
+            for r in rows
+        ]
+
+    def unregister(self, owner: str, jd_id: str) -> bool:
+        conn = self._conn()
+        cur = conn.execute(
+            "DELETE FROM jd_registrations WHERE owner = ? AND jd_id = ?", (owner, jd_id)
+        )
+        if not cur.rowcount:
+            return False
+        # drop the profile once nobody references it
+        conn.execute(
+            "DELETE FROM jd_profiles WHERE jd_id = ? AND NOT EXISTS "
+            "(SELECT 1 FROM jd_registrations WHERE jd_id = ?)", (jd_id, jd_id)
+        )
+        return True
+
+
+@lru_cache(maxsize=1)
+def get_jd_registry():
+    return JDRegistry()
+
+# =================================================
+# LOOKUP
+# =================================================
+def lookup_jd(jd_id: str) -> Optional[JDProfile]:
+    # process LRU first, then the registry (which refills the LRU)
+    profile = cached_jd_profile(jd_id)
+    if profile is None:
+        profile = get_jd_registry().load_profile(jd_id)
+        if profile is not None:
+            remember_jd_profile(profile)
+    return profile
+
+
+def resolve_jd(job_description: Optional[str], jd_id: Optional[str]) -> JDProfile:
+    # analysis endpoints take either the JD text or a registered jd_id
+    if jd_id:
+        profile = lookup_jd(jd_id)
+        if profile is None:
+            raise HTTPException(404, "Unknown jd_id, register the job description first")
+        return profile
+    if not job_description or not job_description.strip():
+        raise HTTPException(400, "job_description or jd_id is required")
+    return get_jd_profile(job_description)
+
+
+def resolve_jd_requirements(job_description: Optional[str], jd_id: Optional[str]):
+    # same inputs for keyword analyzers: a registered jd_id resolves to its
+    # stored profile, raw text is parsed without embedding anything
+    if jd_id:
+        return resolve_jd(None, jd_id)
+    if not job_description or not job_description.strip():
+        raise HTTPException(400, "job_description or jd_id is required")
+    return get_jd_requirements(job_description)
+
+
+def register_jd(owner: str, job_description: str, title: Optional[str]) -> JDProfile:
+    profile = lookup_jd(jd_key(job_description)) or get_jd_profile(job_description)
+    get_jd_registry().register(owner, profile, title)
+    return profile
+
+
+def unregister_jd(owner: str, jd_id: str) -> bool:
+    removed = get_jd_registry().unregister(owner, jd_id)
+    if removed:
+        # this worker's LRU; lookup_jd reloads it if others still use it
+        forget_jd_profile(jd_id)
+    return removed
+
+# =================================================
+# API
+# =================================================
+@router.post("", status_code=status.HTTP_201_CREATED)
+async def create_jd(
+    job_description: str = Form(...),
+    title: Optional[str] = Form(None),
+    current_user: str = Depends(get_current_user)
+):
+    if not job_description.strip():
+        raise HTTPException(400, "job_description is empty")
+    if title is not None:
+        title = title.strip()[:MAX_JD_TITLE_CHARS] or None
+
+    profile = await run_in_threadpool(register_jd, current_user, job_description, title)
+    return {"status": "success", "title": title, **profile.summary()}
+
+
+@router.get("")
+async def list_jds(current_user: str = Depends(get_current_user)):
+    items = await run_in_threadpool(get_jd_registry().registrations, current_user)
+    return {"status": "success", "job_descriptions": items}
+
+
+@router.get("/{jd_id}")
+async def get_jd(jd_id: str, current_user: str = Depends(get_current_user)):
+    profile = await run_in_threadpool(lookup_jd, jd_id)
+    if profile is None:
+        raise HTTPException(404, "Job description not found")
+    return {"status": "success", **profile.summary()}
+
+
+@router.delete("/{jd_id}")
+async def delete_jd(jd_id: str, current_user: str = Depends(get_current_user)):
+    removed = await run_in_threadpool(unregister_jd, current_user, jd_id)
+    if not removed:
+        raise HTTPException(404, "Job description not found")
+    return {"status": "success", "jd_id": jd_id}
@@ -0,0 +1,259 @@
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
+from models.runtime.profiling import run_in_threadpool
+from typing import List, Optional
+import os
+import numpy as np
+from models.auth.dependencies import get_current_user
+from models.model import semantic_resume_jb_matcher as semantic
+from models.model.embeddings import MODEL_NAME, encode_texts
+from models.model.jd_profile import get_jd_profile
+from models.model.jd_registry import lookup_jd
+from models.model.pdf_text import parse_pages, joined
+from models.model.resume_chunks import lookup_chunks
+from models.model.resume_dedup import find_duplicates, canonical_hashes, duplicate_flag
+from models.model.skill_taxonomy import find_skills
+from models.runtime.cache import content_hash
+from models.runtime.metrics import stage, timed, TEXTS_EMBEDDED
+from models.runtime.quantization import QuantizedMatrix, pack
+
+router = APIRouter(
+    prefix="/match",
+    tags=["Resume x JD Matrix"]
+)
+
+# =================================================
+# CONFIG (ENV)
+# =================================================
+MATRIX_MAX_RESUMES = int(os.getenv("MATRIX_MAX_RESUMES", "1000"))
+MATRIX_MAX_JDS = int(os.getenv("MATRIX_MAX_JDS", "200"))
+MATRIX_MAX_TOP_N = 50
+
+# Similarities are computed MATRIX_TILE_SIZE x MATRIX_TILE_SIZE at a
+# time, so peak memory is one tile plus the running top-N lists, not
+# resumes x JDs.
+MATRIX_TILE_SIZE = int(os.getenv("MATRIX_TILE_SIZE", "1024"))
+
+# The full matrix is only returned when asked for and this small
+MATRIX_MAX_RETURNED_CELLS = int(os.getenv("MATRIX_MAX_RETURNED_CELLS", "100000"))
+
+# =================================================
+# INPUTS
+# =================================================
+def resume_texts(files):
+    # -> (texts, skipped filenames); same text the semantic endpoint embeds
+    texts, skipped = [], []
+    for name, data in files:
+        try:
+            pages, _ = parse_pages(
+                data, semantic.MAX_PAGES, semantic.MAX_TEXT_CHARS, analyzer="matrix"
+            )
+        except Exception:
+            pages = []
+        text = joined(pages, semantic.MAX_PAGES).lower()[:semantic.MAX_TEXT_CHARS]
+        if text.strip():
+            texts.append((name, text))
+        else:
+            skipped.append(name)
+    return texts, skipped
+
+
+def resume_vectors(texts, hashes=None) -> QuantizedMatrix:
+    # cached by text hash in the chunk store (or by the given hashes: a
+    # near-duplicate passes the hash of the resume it duplicates); only
+    # new resumes are embedded, in one batch. Rows stay in their stored
+    # format -- searched from the codes, never dequantized as a whole.
+    prefix = f"vec:{MODEL_NAME}:resume:"
+    hashes = hashes or [content_hash(t) for t in texts]
+
+    def encode(missing):
+        batch = [texts[i] for i in missing]
+        TEXTS_EMBEDDED.inc(len(batch))
+        with stage("embed"):
+            return [pack(v) for v in encode_texts(batch)]
+
+    values, _ = lookup_chunks(
+        "resume_vectors", [prefix + h for h in hashes], encode
+    )
+    return QuantizedMatrix.from_packed(values)
+
+
+def jd_profiles(jd_ids, job_descriptions):
+    profiles = []
+    for jd_id in jd_ids:
+        profile = lookup_jd(jd_id)
+        if profile is None:
+            raise HTTPException(404, f"Unknown jd_id: {jd_id}")
+        profiles.append(profile)
+    profiles.extend(get_jd_profile(jd) for jd in job_descriptions if jd.strip())
+    # same JD twice -> one column
+    return list({p.jd_id: p for p in profiles}.values())
+
+# =================================================
+# TILED TOP-N
+# =================================================
+def merge_top(best_scores, best_index, scores, offset: int, n: int):
+    # best_*: (rows, n) running top-n; scores: (rows, cols) new tile
+    # whose column j is item offset + j -> updated top-n per row
+    index = np.broadcast_to(
+        np.arange(offset, offset + scores.shape[1]), scores.shape
+    )
+    all_scores = np.concatenate([best_scores, scores], axis=1)
+    all_index = np.concatenate([best_index, index], axis=1)
+
+    keep = np.argpartition(-all_scores, n - 1, axis=1)[:, :n]
+    rows = np.arange(all_scores.shape[0])[:, None]
+    return all_scores[rows, keep], all_index[rows, keep]
+
+
+def ranked(scores, index):
+    # per row: [(item, score), ...] best first, padding dropped
+    order = np.argsort(-scores, axis=1)
+    out = []
+    for row_scores, row_index, row_order in zip(scores, index, order):
+        out.append([
+            (int(row_index[k]), float(row_scores[k]))
+            for k in row_order if row_index[k] >= 0
+        ])
+    return out
+
+
+@timed("match_matrix")
+def top_matches(resumes: QuantizedMatrix, jds: np.ndarray, n: int,
+                tile: int = MATRIX_TILE_SIZE, keep_matrix: bool = False):
+    # resumes (R, dim) quantized, jds (J, dim) float32, rows L2-normalised
+    # -> cosine = dot, scored tile by tile straight from the stored codes.
+    # -> (top-n JDs per resume, top-n resumes per JD, full matrix or None)
+    R, J = len(resumes), len(jds)
+    n_jd, n_res = min(n, J), min(n, R)
+
+    row_scores = np.full((R, n_jd), -np.inf, dtype=np.float32)
+    row_index = np.full((R, n_jd), -1, dtype=np.int64)
+    col_scores = np.full((J, n_res), -np.inf, dtype=np.float32)
+    col_index = np.full((J, n_res), -1, dtype=np.int64)
+    matrix = np.empty((R, J), dtype=np.float32) if keep_matrix else None
+
+    for r0 in range(0, R, tile):
+        rows = min(tile, R - r0)
+        for j0 in range(0, J, tile):
+            scores = resumes.scores(jds[j0:j0 + tile], r0, r0 + rows)
+            if matrix is not None:
+                matrix[r0:r0 + rows, j0:j0 + scores.shape[1]] = scores
+
+            rs, ri = merge_top(
+                row_scores[r0:r0 + rows], row_index[r0:r0 + rows],
+                scores, j0, n_jd
+            )
+            row_scores[r0:r0 + rows], row_index[r0:r0 + rows] = rs, ri
+
+            cs, ci = merge_top(
+                col_scores[j0:j0 + scores.shape[1]], col_index[j0:j0 + scores.shape[1]],
+                scores.T, r0, n_res
+            )
+            col_scores[j0:j0 + scores.shape[1]], col_index[j0:j0 + scores.shape[1]] = cs, ci
+
+    return ranked(row_scores, row_index), ranked(col_scores, col_index), matrix
+
+# =================================================
+# GAP SUMMARY (TOP PAIRS ONLY)
+# =================================================
+# Text-only, no extra embeddings: JD skills not named in the resume and
+# the experience gap. /semantic/full-gap-analysis has the full version.
+
+def gap_summary(resume_text: str, resume_skills: set, profile) -> dict:
+    return {
+        "missing_skills": [s for s in profile.skills if s not in resume_skills],
+        "missing_experience": semantic.detect_experience_gap(resume_text, profile),
+    }
+
+# =================================================
+# ANALYSIS
+# =================================================
+def match_matrix(files, jd_ids, job_descriptions, top_n: int,
+                 gaps: bool, include_matrix: bool, owner: Optional[str] = None) -> dict:
+    profiles = jd_profiles(jd_ids, job_descriptions)
+    if not profiles:
+        raise HTTPException(400, "Provide jd_ids and/or job_descriptions")
+    if len(profiles) > MATRIX_MAX_JDS:
+        raise HTTPException(400, f"At most {MATRIX_MAX_JDS} job descriptions")
+
+    texts, skipped = resume_texts(files)
+    if not texts:
+        raise HTTPException(400, "Unable to extract text from any resume")
+
+    names = [name for name, _ in texts]
+    duplicates = find_duplicates(owner, texts)
+    resumes = resume_vectors(
+        [t for _, t in texts], canonical_hashes([t for _, t in texts], duplicates)
+    )
+    jds = np.stack([p.vector for p in profiles]).astype(np.float32)
+
+    keep_matrix = include_matrix and len(resumes) * len(jds) <= MATRIX_MAX_RETURNED_CELLS
+    per_resume, per_jd, matrix = top_matches(resumes, jds, top_n, keep_matrix=keep_matrix)
+
+    skills = {}
+
+    def pair(i: int, j: int, score: float) -> dict:
+        item = {"score": round(score * 100, 2)}
+        if gaps:
+            if i not in skills:
+                skills[i] = set(find_skills(texts[i][1]))
+            item["gaps"] = gap_summary(texts[i][1], skills[i], profiles[j])
+        return item
+
+    result = {
+        "status": "success",
+        "shape": [len(resumes), len(jds)],
+        "skipped_resumes": skipped,
+        "resumes": [
+            {
+                "index": i,
+                "filename": names[i],
+                "duplicate_of": duplicate_flag(duplicates[i]),
+                "top_jds": [{"jd_id": profiles[j].jd_id, **pair(i, j, s)} for j, s in top],
+            }
+            for i, top in enumerate(per_resume)
+        ],
+        "job_descriptions": [
+            {
+                "jd_id": profiles[j].jd_id,
+                "top_resumes": [
+                    {"index": i, "filename": names[i], "score": round(s * 100, 2)}
+                    for i, s in top
+                ],
+            }
+            for j, top in enumerate(per_jd)
+        ],
+    }
+    if include_matrix:
+        result["matrix"] = (
+            np.round(matrix.astype(np.float64) * 100, 2).tolist() if matrix is not None else None
+        )
+    return result
+
+# =================================================
+# API
+# =================================================
+@router.post("/matrix")
+async def resume_jd_matrix(
+    resumes: List[UploadFile] = File(...),
+    jd_ids: Optional[str] = Form(None),
+    job_descriptions: Optional[List[str]] = Form(None),
+    top_n: int = Form(5),
+    gaps: bool = Form(False),
+    include_matrix: bool = Form(False),
+    current_user: str = Depends(get_current_user)
+):
+    if len(resumes) > MATRIX_MAX_RESUMES:
+        raise HTTPException(400, f"At most {MATRIX_MAX_RESUMES} resumes per request")
+    if not 1 <= top_n <= MATRIX_MAX_TOP_N:
+        raise HTTPException(400, f"top_n must be between 1 and {MATRIX_MAX_TOP_N}")
+    if any(not r.filename.lower().endswith(".pdf") for r in resumes):
+        raise HTTPException(400, "Only PDF allowed")
+
+    files = [(r.filename, await r.read()) for r in resumes]
+    ids = [i.strip() for i in (jd_ids or "").split(",") if i.strip()]
+
+    return await run_in_threadpool(
+        match_matrix, files, ids, job_descriptions or [], top_n, gaps, include_matrix,
+        current_user
+    )
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import pdfplumber
+from models.runtime.metrics import stage, PAGES_PARSED, PAGES_SKIPPED
+
+# =================================================
+# BUDGETED PDF PARSING
+# =================================================
+# Analyzers only keep the first max_chars of the joined page texts, so
+# parsing stops as soon as the text gathered so far covers the budget.
+# The result is identical to parsing all max_pages and truncating.
+
+def read_pages(path: str, max_pages: int, max_chars=None, analyzer: str = "shared"):
+    # -> (page texts, pages skipped)
+    texts, size = [], 0
+    with pdfplumber.open(path) as pdf:
+        pages = pdf.pages[:max_pages]
+        for page in pages:
+            if max_chars is not None and size >= max_chars:
+                break
+            t = page.extract_text() or ""
+            texts.append(t)
+            if t:
+                size += len(t) + (1 if size else 0)  # + "\n" separator
+
+    skipped = len(pages) - len(texts)
+    PAGES_PARSED.inc(len(texts), analyzer=analyzer)
+    if skipped:
+        PAGES_SKIPPED.inc(skipped, analyzer=analyzer)
+    return texts, skipped
+
+
+def joined(pages, max_pages: int) -> str:
+    return "\n".join(p for p in pages[:max_pages] if p)
+
+
+def extract_text(path: str, max_pages: int, max_chars=None, analyzer: str = "shared") -> str:
+    pages, _ = read_pages(path, max_pages, max_chars, analyzer)
+    text = joined(pages, max_pages)
+    return text[:max_chars] if max_chars is not None else text
+
+# =================================================
+# SHARED PARSE (SEVERAL ANALYZERS)
+# =================================================
+# Parse once at the largest budget; each analyzer then derives its own
+# view with joined(pages, its MAX_PAGES)[:its MAX_TEXT_CHARS].
+
+def combined_budget(*budgets):
+    # budgets: (max_pages, max_chars or None) per analyzer
+    max_pages = max(p for p, _ in budgets)
+    chars = [c for _, c in budgets]
+    return max_pages, (None if None in chars else max(chars))
+
+
+def parse_pages(pdf_bytes: bytes, max_pages: int, max_chars=None, analyzer: str = "shared"):
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+        tmp.write(pdf_bytes)
+        path = tmp.name
+
+    try:
+        with stage("pdf_parse"):
+            return read_pages(path, max_pages, max_chars, analyzer)
+    finally:
+        os.remove(path)
@@ -0,0 +1,105 @@
+import os
+import re
+import tempfile
+from functools import lru_cache
+from models.model import resume_quality_score as quality
+from models.model.fidelity import MODE_TAGS, encode_mode
+from models.runtime.cache import LRUBackend, SQLiteBackend, TieredBackend, content_hash
+from models.runtime.metrics import stage, CACHE_HITS, CACHE_MISSES, TEXTS_EMBEDDED
+from models.runtime.quantization import pack, unpack_rows
+
+# =================================================
+# CONFIG (ENV)
+# =================================================
+# Per-chunk values (vectors, feature counts) keyed by chunk content
+# hash, in an in-process LRU in front of a SQLite file all workers share.
+CHUNK_STORE_PATH = os.getenv(
+    "CHUNK_STORE_PATH",
+    os.path.join(tempfile.gettempdir(), "resume_ai_chunks.sqlite")
+)
+CHUNK_STORE_MAX_ENTRIES = int(os.getenv("CHUNK_STORE_MAX_ENTRIES", "200000"))
+CHUNK_STORE_MEMORY_ENTRIES = int(os.getenv("CHUNK_STORE_MEMORY_ENTRIES", "20000"))
+
+SECTION_HEADINGS = {
+    alias: section
+    for section, aliases in quality.REQUIRED_SECTIONS.items()
+    for alias in aliases
+}
+
+SENTENCE_SPLIT_REGEX = re.compile(r"(?<=[.!?])\s+")
+
+# =================================================
+# STORE
+# =================================================
+@lru_cache(maxsize=1)
+def get_chunk_store():
+    return TieredBackend(
+        LRUBackend(max_entries=CHUNK_STORE_MEMORY_ENTRIES, ttl=0),
+        SQLiteBackend(CHUNK_STORE_PATH, CHUNK_STORE_MAX_ENTRIES, ttl=0, table="chunks")
+    )
+
+# =================================================
+# CHUNKING
+# =================================================
+# Section = last heading line seen; chunk = one sentence, lowercased
+# and whitespace-normalised -> (section, content hash, text). Heading
+# lines are chunks too, so per-chunk counts add up to whole-text counts.
+
+def split_chunks(text: str):
+    chunks = []
+    section = "header"
+    for line in text.lower().split("\n"):
+        heading = " ".join(line.split()).rstrip(":").strip()
+        if heading in SECTION_HEADINGS:
+            section = SECTION_HEADINGS[heading]
+
+        for sentence in SENTENCE_SPLIT_REGEX.split(line):
+            sentence = " ".join(sentence.split())
+            if sentence:
+                chunks.append((section, content_hash(sentence), sentence))
+    return chunks
+
+# =================================================
+# LOOKUPS
+# =================================================
+def lookup_chunks(kind: str, keys, compute_missing):
+    # compute_missing(indexes) -> values for keys[i], each distinct key
+    # computed once. -> (values in key order, number computed)
+    store = get_chunk_store()
+    found = {k: store.get(k) for k in dict.fromkeys(keys)}
+    missing = [k for k, v in found.items() if v is None]
+
+    CACHE_HITS.inc(len(found) - len(missing), cache=kind)
+    if missing:
+        CACHE_MISSES.inc(len(missing), cache=kind)
+        first = {}
+        for i, k in enumerate(keys):
+            first.setdefault(k, i)
+        for k, value in zip(missing, compute_missing([first[k] for k in missing])):
+            found[k] = value
+            store.set(k, value)
+    return [found[k] for k in keys], len(missing)
+
+
+def chunk_vectors(chunks, mode: str = "accurate"):
+    # only chunks never seen before are embedded, in one batch. Stored
+    # in the VECTOR_STORAGE format -> ((n, dim) float32, number embedded)
+    if mode == "fast":
+        # table lookups are cheaper than the store round trip
+        TEXTS_EMBEDDED.inc(len(chunks))
+        with stage("embed"):
+            return encode_mode([c[2] for c in chunks], mode), len(chunks)
+
+    prefix = f"vec:{MODE_TAGS[mode]}:"
+
+    def encode(missing):
+        texts = [chunks[i][2] for i in missing]
+        TEXTS_EMBEDDED.inc(len(texts))
+        with stage("embed"):
+            vecs = encode_mode(texts, mode)
+        return [pack(v) for v in vecs]
+
+    values, embedded = lookup_chunks(
+        "chunk_vectors", [prefix + h for _, h, _ in chunks], encode
+    )
+    return unpack_rows(values), embedded
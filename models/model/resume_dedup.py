@@ -0,0 +1,242 @@
+from functools import lru_cache
+import hashlib
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+import numpy as np
+from models.runtime.cache import content_hash
+from models.runtime.metrics import Counter, timed
+
+logger = logging.getLogger(__name__)
+
+# =================================================
+# CONFIG (ENV)
+# =================================================
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "1") == "1"
+DEDUP_STORE_PATH = os.getenv(
+    "DEDUP_STORE_PATH",
+    os.path.join(tempfile.gettempdir(), "resume_ai_dedup.sqlite")
+)
+
+# estimated Jaccard similarity of word shingles at which two resumes
+# count as the same candidate / template
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.8"))
+
+SHINGLE_SIZE = 5
+NUM_PERM = 128
+# 21 bands x 6 rows: pairs at J=0.8 become candidates 99.8% of the
+# time, at J=0.5 28% (then dropped by the signature compare)
+LSH_ROWS = 6
+LSH_BANDS = NUM_PERM // LSH_ROWS
+
+# Bump when shingling / hashing changes (old signatures are ignored)
+SIGNATURE_VERSION = 1
+
+# words = runs of [a-z0-9] (as bytes, via one translate)
+TOKEN_TABLE = bytes(
+    c if chr(c) in "abcdefghijklmnopqrstuvwxyz0123456789" else 32 for c in range(256)
+)
+
+DUPLICATES_FOUND = Counter(
+    "resume_ai_near_duplicates_total",
+    "Resumes matched to a previously seen near-identical resume"
+)
+
+# =================================================
+# MINHASH
+# =================================================
+# Shingle = SHINGLE_SIZE consecutive words (case, punctuation and layout
+# ignored, so re-exports of the same PDF shingle the same). Each
+# permutation is a multiply-shift hash; a signature is NUM_PERM uint32
+# minima = 512 bytes per resume.
+
+_rng = np.random.default_rng(20240607)
+PERM_A = _rng.integers(1, 2**63, NUM_PERM, dtype=np.uint64) | np.uint64(1)
+PERM_B = _rng.integers(0, 2**63, NUM_PERM, dtype=np.uint64)
+EMPTY_SIGNATURE = np.full(NUM_PERM, 0xFFFFFFFF, dtype=np.uint32)
+
+
+def shingle_hashes(text: str) -> np.ndarray:
+    tokens = text.lower().encode("ascii", "replace").translate(TOKEN_TABLE).split()
+    words = np.fromiter(map(zlib.crc32, tokens), dtype=np.uint64, count=len(tokens))
+    n = max(len(words) - SHINGLE_SIZE + 1, min(len(words), 1))
+    shingles = np.zeros(n, dtype=np.uint64)
+    for j in range(min(SHINGLE_SIZE, len(words))):
+        # uint64 arithmetic wraps: a rolling polynomial hash of the words
+        shingles = shingles * np.uint64(1000003) + words[j:j + n]
+    # fold to 32 bits for the multiply-shift permutations
+    return np.unique((shingles ^ (shingles >> np.uint64(32))) & np.uint64(0xFFFFFFFF))
+
+
+def signature(text: str) -> np.ndarray:
+    shingles = shingle_hashes(text)
+    if not len(shingles):
+        return EMPTY_SIGNATURE
+    hashed = np.multiply.outer(shingles, PERM_A)
+    hashed += PERM_B
+    hashed >>= np.uint64(32)
+    return hashed.min(axis=0).astype(np.uint32)
+
+
+def band_keys(owner: str, sig: np.ndarray):
+    # one bucket per band, scoped to the owner (and signature version)
+    prefix = f"{SIGNATURE_VERSION}:{owner}:".encode()
+    return [
+        int.from_bytes(
+            hashlib.blake2b(
+                prefix + bytes([band]) + sig[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes(),
+                digest_size=8
+            ).digest(),
+            "big", signed=True
+        )
+        for band in range(LSH_BANDS)
+    ]
+
+# =================================================
+# STORE (SQLITE)
+# =================================================
+# signatures: one row per (owner, text hash); lsh: band bucket -> doc.
+# A lookup is one indexed query over the resume's LSH_BANDS buckets,
+# then a vectorized compare against the few candidates it returns.
+
+class DedupStore:
+    def __init__(self, path: str = DEDUP_STORE_PATH):
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS signatures ("
+            "doc_id INTEGER PRIMARY KEY AUTOINCREMENT, owner TEXT NOT NULL, "
+            "text_hash TEXT NOT NULL, filename TEXT, signature BLOB NOT NULL, "
+            "created REAL NOT NULL, UNIQUE (owner, text_hash))"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS lsh (bucket INTEGER NOT NULL, doc_id INTEGER NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS lsh_bucket ON lsh(bucket)")
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        # re-open after fork: a sqlite handle must not cross processes
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def candidates(self, buckets):
+        # -> [(text_hash, filename, signature)] sharing at least one bucket
+        rows = self._conn().execute(
+            "SELECT s.text_hash, s.filename, s.signature FROM signatures s "
+            "WHERE s.doc_id IN (SELECT doc_id FROM lsh WHERE bucket IN "
+            f"({','.join('?' * len(buckets))}))",
+            buckets
+        ).fetchall()
+        return [(r[0], r[1], np.frombuffer(r[2], dtype=np.uint32)) for r in rows]
+
+    def add(self, owner: str, entries):
+        # entries: [(text_hash, filename, signature, buckets)]
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for text_hash, filename, sig, buckets in entries:
+                cur = conn.execute(
+                    "INSERT OR IGNORE INTO signatures "
+                    "(owner, text_hash, filename, signature, created) VALUES (?, ?, ?, ?, ?)",
+                    (owner, text_hash, filename, sig.tobytes(), time.time())
+                )
+                if cur.rowcount:
+                    conn.executemany(
+                        "INSERT INTO lsh (bucket, doc_id) VALUES (?, ?)",
+                        [(b, cur.lastrowid) for b in buckets]
+                    )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+
+@lru_cache(maxsize=1)
+def get_dedup_store():
+    return DedupStore()
+
+# =================================================
+# MATCHING
+# =================================================
+def best_match(sig: np.ndarray, candidates):
+    # -> (text_hash, filename, similarity) of the closest candidate at or
+    # above DEDUP_THRESHOLD, else None. Share of equal minima = estimated
+    # Jaccard similarity of the shingle sets.
+    if not candidates:
+        return None
+    scores = (np.stack([c[2] for c in candidates]) == sig).mean(axis=1)
+    best = int(scores.argmax())
+    if scores[best] < DEDUP_THRESHOLD:
+        return None
+    return candidates[best][0], candidates[best][1], float(scores[best])
+
+
+@timed("dedup")
+def find_duplicates(owner: str, items):
+    # items: [(filename, text)] -> per item None, or {"text_hash",
+    # "filename", "similarity"} of the earlier near-identical resume
+    # (previously analyzed by this owner, or earlier in this batch) --
+    # never of an identical text, which is simply the same resume.
+    # Items that match nothing are remembered for later batches.
+    matches = [None] * len(items)
+    if not DEDUP_ENABLED or not owner:
+        return matches
+
+    try:
+        store = get_dedup_store()
+        batch = {}      # bucket -> [(text_hash, filename, signature)]
+        new = []
+        for i, (filename, text) in enumerate(items):
+            text_hash = content_hash(text)
+            sig = signature(text)
+            buckets = band_keys(owner, sig)
+
+            seen = [c for b in buckets for c in batch.get(b, ())]
+            # the same text again (a re-upload) already shares its cache
+            # entries: only other texts count as duplicates
+            candidates = [c for c in store.candidates(buckets) + seen if c[0] != text_hash]
+            found = best_match(sig, candidates)
+            if found is None:
+                new.append((text_hash, filename, sig, buckets))
+                for b in buckets:
+                    batch.setdefault(b, []).append((text_hash, filename, sig))
+                continue
+
+            DUPLICATES_FOUND.inc()
+            matches[i] = {
+                "text_hash": found[0],
+                "filename": found[1],
+                "similarity": round(found[2], 3),
+            }
+
+        if new:
+            store.add(owner, new)
+    except Exception as e:
+        # dedup is an optimisation: on failure every resume is analysed
+        logger.warning("Near-duplicate lookup failed: %s", e)
+        return [None] * len(items)
+    return matches
+
+
+def canonical_hashes(texts, matches):
+    # content hash to key cached per-resume values by: a near-duplicate
+    # reuses the entry of the resume it duplicates
+    return [m["text_hash"] if m else content_hash(t) for t, m in zip(texts, matches)]
+
+
+def duplicate_flag(match):
+    # response field: what this resume duplicates (no internal hashes)
+    return None if match is None else {
+        "filename": match["filename"], "similarity": match["similarity"]
+    }
@@ -0,0 +1,89 @@
+import numpy as np
+
+# =================================================
+# FEATURE SCHEMA (SHARED BY TRAINING + SERVING)
+# =================================================
+# Bump the version whenever a feature is added, removed, reordered
+# or its definition changes -- models trained on another version
+# are rejected at load time.
+FEATURE_SCHEMA_VERSION = 1
+
+FEATURE_SCHEMA = (
+    "resume_length",
+    "num_skills",
+    "num_projects",
+    "num_bullets",
+    "experience_years",
+    "grammar_issues",
+)
+
+NUM_FEATURES = len(FEATURE_SCHEMA)
+
+SKILL_VOCAB = (
+    "react", "javascript", "node", "express", "mongodb",
+    "python", "sql", "html", "css", "machine learning",
+    "docker", "aws", "api", "rest"
+)
+
+WEAK_PHRASES = (
+    "worked on",
+    "responsible for",
+    "helped with",
+    "basic knowledge",
+    "good knowledge"
+)
+
+# Single-character bullets -> str.count is much cheaper than a regex scan
+BULLET_CHARS = ("•", "-", "–", "*")
+
+# Same matches as r"(\d+)\s*(?:years?|months?)", but found by jumping
+# between keyword hits instead of testing the regex at every offset
+EXP_KEYWORDS = ("year", "month")
+
+# =================================================
+# EXTRACTION
+# =================================================
+def max_experience_years(text: str) -> int:
+    best = 0
+    for keyword in EXP_KEYWORDS:
+        i = text.find(keyword)
+        while i != -1:
+            end = i
+            while end and text[end - 1].isspace():
+                end -= 1
+            start = end
+            while start and text[start - 1].isdecimal():
+                start -= 1
+            if start < end:
+                best = max(best, int(text[start:end]))
+            i = text.find(keyword, i + len(keyword))
+    return best
+
+
+def extract_features(text: str) -> list:
+    text = text.lower()
+
+    return [
+        len(text.split()),
+        sum(1 for s in SKILL_VOCAB if s in text),
+        text.count("project"),
+        sum(text.count(c) for c in BULLET_CHARS),
+        max_experience_years(text),
+        sum(text.count(p) for p in WEAK_PHRASES),
+    ]
+
+
+def extract_features_batch(texts) -> np.ndarray:
+    rows = [extract_features(t) for t in texts]
+    return np.array(rows, dtype=np.float64).reshape(len(rows), NUM_FEATURES)
+
+
+def check_schema_version(model) -> None:
+    # Models pickled before the schema was versioned carry no tag and
+    # are assumed to be version 1.
+    version = getattr(model, "feature_schema_version_", 1)
+    if version != FEATURE_SCHEMA_VERSION:
+        raise RuntimeError(
+            f"ML model was trained on feature schema v{version}, "
+            f"server expects v{FEATURE_SCHEMA_VERSION}"
+        )
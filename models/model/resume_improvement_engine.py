@@ -1,9 +1,16 @@
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
-import pdfplumber
+from models.runtime.profiling import run_in_threadpool
+from typing import Optional
 import re
 import tempfile
 import os
 from models.auth.dependencies import get_current_user
+from models.runtime.metrics import timed
+from models.model.pdf_text import extract_text
+from models.model.skill_taxonomy import find_skills
+from models.model.jd_profile import JDRequirements
+from models.model.jd_registry import resolve_jd_requirements
+from models.runtime.cache import cached_result, content_hash
 
 router = APIRouter(
     prefix="/improvement",
@@ -16,6 +23,9 @@ router = APIRouter(
 
 MAX_PAGES = 5  # ✅ LIMIT PDF PAGES (huge memory saver)
 
+# Bump when suggestion logic changes (invalidates cached results)
+ANALYZER_VERSION = "improvement-v3"
+
 REQUIRED_SECTIONS = {
     "summary": ("summary", "profile", "objective"),
     "skills": ("skills", "technical skills"),
@@ -36,20 +46,7 @@ ACTION_VERBS = (
     "integrated", "deployed"
 )
 
-SKILL_VOCAB = (
-    "react", "javascript", "node", "nodejs", "express",
-    "mongodb", "python", "machine learning", "sql",
-    "html", "css", "angular", "docker", "aws",
-    "rest", "api", "socket", "firebase"
-)
-
-STACK_MAP = {
-    "mern": ("mongodb", "express", "react", "node"),
-    "mean": ("mongodb", "express", "angular", "node")
-}
-
 BULLET_REGEX = re.compile(r"(?:•|-|–|\*|\d+\.)\s*(.+)")
-YEAR_REGEX = re.compile(r"(\d+)\+?\s*years?")
 EXP_REGEX = re.compile(r"(\d+)\s*(?:years?|months?)")
 
 # =================================================
@@ -60,14 +57,10 @@ def normalize_text(text: str) -> str:
     return " ".join(text.lower().split())
 
 
+@timed("pdf_parse")
 def extract_text_from_pdf(pdf_path: str) -> str:
-    texts = []
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages[:MAX_PAGES]:  # ✅ LIMIT PAGES
-            page_text = page.extract_text()
-            if page_text:
-                texts.append(page_text)
-    return "\n".join(texts)
+    # ✅ LIMIT PAGES (no char budget: every page up to MAX_PAGES is used)
+    return extract_text(pdf_path, MAX_PAGES, analyzer="improvement")
 
 
 def extract_bullets(text: str):
@@ -77,35 +70,24 @@ def extract_bullets(text: str):
 # =================================================
 # SKILL GAP
 # =================================================
+# JD skills / required years come from the JD profile (computed once
+# per unique JD); only the resume side is extracted here.
 
-def extract_skills(text: str):
-    skills = set(s for s in SKILL_VOCAB if s in text)
-    for stack, expanded in STACK_MAP.items():
-        if stack in text:
-            skills.update(expanded)
-    return skills
-
-
-def compute_missing_skills(resume_text: str, jd_text: str):
-    return list(extract_skills(jd_text) - extract_skills(resume_text))
+def compute_missing_skills(resume_text: str, jd_skills):
+    resume_skills = set(find_skills(resume_text))
+    return [s for s in jd_skills if s not in resume_skills]
 
 
 # =================================================
 # EXPERIENCE
 # =================================================
 
-def extract_experience_requirement(jd_text):
-    match = YEAR_REGEX.search(jd_text)
-    return int(match.group(1)) if match else None
-
-
 def resume_experience_years(resume_text):
     matches = EXP_REGEX.findall(resume_text)
     return max(map(int, matches)) if matches else 0
 
 
-def experience_requirement_suggestions(resume_text, jd_text):
-    jd_years = extract_experience_requirement(jd_text)
+def experience_requirement_suggestions(resume_text, jd_years):
     resume_years = resume_experience_years(resume_text)
 
     if jd_years and resume_years < jd_years:
@@ -200,17 +182,18 @@ def project_section_suggestions(text):
 # MAIN ENGINE
 # =================================================
 
-def generate_resume_improvements(resume_text, jd_text):
+@timed("improvements")
+def generate_resume_improvements(resume_text, profile: JDRequirements):
+    # profile: JDRequirements, or a full JDProfile (same fields)
     resume_clean = normalize_text(resume_text)
-    jd_clean = normalize_text(jd_text)
 
-    missing_skills = compute_missing_skills(resume_clean, jd_clean)
+    missing_skills = compute_missing_skills(resume_clean, profile.skills)
 
     return {
         "critical_improvements": (
             missing_section_suggestions(resume_clean)
             + soft_section_suggestions(resume_clean)
-            + experience_requirement_suggestions(resume_clean, jd_clean)
+            + experience_requirement_suggestions(resume_clean, profile.required_years)
         ),
         "skill_gap_suggestions": skill_gap_suggestions(missing_skills),
         "bullet_point_improvements": weak_bullet_suggestions(resume_text),
@@ -228,20 +211,34 @@ def generate_resume_improvements(resume_text, jd_text):
 @router.post("/suggestions")
 async def resume_improvements(
     resume: UploadFile = File(...),
-    job_description: str = Form(...),
+    job_description: Optional[str] = Form(None),
+    jd_id: Optional[str] = Form(None),
     current_user: str = Depends(get_current_user)
 ):
     if not resume.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF resumes are supported")
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        tmp.write(await resume.read())
-        tmp_path = tmp.name
-
-    try:
-        resume_text = extract_text_from_pdf(tmp_path)
-        if not resume_text.strip():
-            raise HTTPException(status_code=400, detail="Unable to extract resume text")
-        return generate_resume_improvements(resume_text, job_description)
-    finally:
-        os.remove(tmp_path)
+    # keyword analyzer: JD requirements only, nothing embedded
+    profile = await run_in_threadpool(resolve_jd_requirements, job_description, jd_id)
+    data = await resume.read()
+
+    def compute():
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+            tmp.write(data)
+            tmp_path = tmp.name
+
+        try:
+            resume_text = extract_text_from_pdf(tmp_path)
+            if not resume_text.strip():
+                raise HTTPException(status_code=400, detail="Unable to extract resume text")
+            return generate_resume_improvements(resume_text, profile)
+        finally:
+            os.remove(tmp_path)
+
+    return await run_in_threadpool(
+        cached_result,
+        "improvement",
+        ANALYZER_VERSION,
+        (content_hash(data), profile.jd_id),
+        compute
+    )
@@ -0,0 +1,275 @@
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
+from models.runtime.profiling import run_in_threadpool
+from collections import Counter
+from typing import Optional
+from functools import lru_cache
+import os
+import numpy as np
+from models.auth.dependencies import get_current_user
+from models.model import semantic_resume_jb_matcher as semantic
+from models.model import resume_quality_score as quality
+from models.model import resume_ml_score as ml
+from models.model.resume_features import (
+    FEATURE_SCHEMA_VERSION,
+    SKILL_VOCAB,
+    WEAK_PHRASES,
+    BULLET_CHARS,
+    max_experience_years
+)
+from models.model.jd_profile import JDProfile
+from models.model.jd_registry import resolve_jd
+from models.model.pdf_text import parse_pages, joined, combined_budget
+from models.model.resume_index import index_resumes
+from models.model.resume_chunks import (
+    CHUNK_STORE_PATH,
+    split_chunks,
+    lookup_chunks,
+    chunk_vectors
+)
+from models.runtime.cache import SQLiteBackend, content_hash
+
+router = APIRouter(
+    prefix="/incremental",
+    tags=["Incremental Re-analysis"]
+)
+
+# =================================================
+# CONFIG (ENV)
+# =================================================
+# Each user's previous version sits next to the chunk store (same file).
+VERSION_STORE_MAX_ENTRIES = int(os.getenv("VERSION_STORE_MAX_ENTRIES", "100000"))
+
+MAX_LISTED_CHANGES = 20
+
+# Tracked in the "scores" block of the response (current / previous / delta)
+SCORE_FIELDS = {
+    "semantic": ("semantic_match_score",),
+    "quality": (
+        "resume_score", "section_completeness", "grammar_quality",
+        "bullet_quality", "skill_structure", "formatting_quality"
+    ),
+    "ml": ("ml_resume_score",),
+}
+
+# =================================================
+# STORES
+# =================================================
+@lru_cache(maxsize=1)
+def get_version_store():
+    return SQLiteBackend(
+        CHUNK_STORE_PATH, VERSION_STORE_MAX_ENTRIES, ttl=0, table="resume_versions"
+    )
+
+# =================================================
+# CHUNK FEATURES (ML)
+# =================================================
+# Same definitions as resume_features.extract_features. Chunks are split
+# at line breaks and whitespace-collapsed, so only what can't straddle
+# whitespace is kept per chunk (words, single-word skills, "project",
+# bullets: counts summed, skills OR-ed as a bitmask). Experience ("5\n
+# years"), weak phrases and multi-word skills are counted on the whole
+# text.
+
+# bump when the per-chunk row changes (keys in the chunk store)
+CHUNK_FEATURES_VERSION = 2
+
+
+def skill_bits(text: str, multi_word: bool) -> int:
+    # bit i = SKILL_VOCAB[i] named in the text
+    bits = 0
+    for i, s in enumerate(SKILL_VOCAB):
+        if (" " in s) == multi_word and s in text:
+            bits |= 1 << i
+    return bits
+
+
+def chunk_features(text: str) -> list:
+    return [
+        len(text.split()),
+        skill_bits(text, multi_word=False),
+        text.count("project"),
+        sum(text.count(c) for c in BULLET_CHARS),
+    ]
+
+
+def text_features(text: str) -> list:
+    text = text.lower()
+    return [
+        skill_bits(text, multi_word=True),
+        max_experience_years(text),
+        sum(text.count(p) for p in WEAK_PHRASES),
+    ]
+
+
+def combine_features(rows, whole) -> list:
+    # rows: chunk_features per chunk, whole: text_features of the text
+    skills = whole[0]
+    for row in rows:
+        skills |= row[1]
+
+    return [
+        sum(r[0] for r in rows),
+        bin(skills).count("1"),
+        sum(r[2] for r in rows),
+        sum(r[3] for r in rows),
+        whole[1],
+        whole[2],
+    ]
+
+# =================================================
+# CHUNK LOOKUPS
+# =================================================
+def chunk_feature_rows(chunks):
+    prefix = f"feat:v{FEATURE_SCHEMA_VERSION}.{CHUNK_FEATURES_VERSION}:"
+
+    def compute(missing):
+        return [chunk_features(chunks[i][2]) for i in missing]
+
+    return lookup_chunks("chunk_features", [prefix + h for _, h, _ in chunks], compute)
+
+
+def pooled_vector(chunks, vectors):
+    # word-weighted mean of chunk vectors -> the resume vector
+    weights = np.array([len(text.split()) for _, _, text in chunks], dtype=np.float32)
+    pooled = weights @ np.asarray(vectors, dtype=np.float32)
+    norm = np.linalg.norm(pooled)
+    return pooled / norm if norm else pooled
+
+# =================================================
+# DIFF
+# =================================================
+def diff_versions(previous, chunks) -> dict:
+    old = Counter((s, h) for s, h, _ in previous)
+    new = Counter((s, h) for s, h, _ in chunks)
+    texts = {(s, h): t for s, h, t in previous + chunks}
+
+    added, removed = new - old, old - new
+    sections = {}
+    for section in dict.fromkeys([s for s, _, _ in previous + chunks]):
+        sections[section] = {
+            "added": sum(n for (s, _), n in added.items() if s == section),
+            "removed": sum(n for (s, _), n in removed.items() if s == section),
+            "unchanged": sum(
+                n for (s, _), n in (old & new).items() if s == section
+            ),
+        }
+
+    def listed(counter):
+        return [
+            {"section": s, "text": texts[(s, h)]}
+            for (s, h) in list(counter)[:MAX_LISTED_CHANGES]
+        ]
+
+    return {
+        "sections": sections,
+        "changed_sections": [
+            s for s, c in sections.items() if c["added"] or c["removed"]
+        ],
+        "added": listed(added),
+        "removed": listed(removed),
+    }
+
+
+def score_deltas(current: dict, previous: dict) -> dict:
+    deltas = {}
+    for name, value in current.items():
+        before = previous.get(name) if previous else None
+        deltas[name] = {
+            "current": value,
+            "previous": before,
+            "delta": round(value - before, 2) if before is not None else None,
+        }
+    return deltas
+
+# =================================================
+# ANALYSIS
+# =================================================
+def incremental_analysis(user: str, pdf_bytes: bytes, profile: JDProfile,
+                         filename: Optional[str] = None) -> dict:
+    max_pages, max_chars = combined_budget(
+        (semantic.MAX_PAGES, semantic.MAX_TEXT_CHARS),
+        (quality.MAX_PAGES, quality.MAX_TEXT_CHARS),
+        (ml.MAX_PAGES, ml.MAX_TEXT_CHARS)
+    )
+    pages, _ = parse_pages(pdf_bytes, max_pages, max_chars, analyzer="incremental")
+
+    semantic_text = joined(pages, semantic.MAX_PAGES).lower()[:semantic.MAX_TEXT_CHARS]
+    quality_text = joined(pages, quality.MAX_PAGES)[:quality.MAX_TEXT_CHARS]
+    ml_text = joined(pages, ml.MAX_PAGES)[:ml.MAX_TEXT_CHARS]
+    if not ml_text.strip():
+        raise HTTPException(400, "Unable to extract resume text")
+    index_resumes(user, [(content_hash(pdf_bytes), filename, joined(pages, max_pages))])
+
+    semantic_chunks = split_chunks(semantic_text)
+    ml_chunks = split_chunks(ml_text)
+
+    # semantic: only new chunks are embedded; the resume vector is pooled
+    vectors, embedded = chunk_vectors(semantic_chunks)
+    semantic_result = {}
+    for part in semantic.iter_gap_analysis(
+        semantic_text, profile,
+        resume_vec=pooled_vector(semantic_chunks, vectors)
+    ):
+        semantic_result.update(part)
+
+    # ml: per-chunk feature counts, summed, plus the whole-text ones
+    rows, counted = chunk_feature_rows(ml_chunks)
+    ml_result = ml.score_features(combine_features(rows, text_features(ml_text)))
+
+    # quality is regex-only (no model) -> recomputed on the full text
+    quality_result = quality.compute_resume_quality_score(quality_text)
+
+    results = {"semantic": semantic_result, "quality": quality_result, "ml": ml_result}
+    scores = {
+        field: results[name][field]
+        for name, fields in SCORE_FIELDS.items()
+        for field in fields
+    }
+
+    store = get_version_store()
+    previous = store.get(f"user:{user}")
+    jd_hash = profile.jd_id
+    prev_chunks = [tuple(c) for c in previous["chunks"]] if previous else []
+
+    store.set(f"user:{user}", {
+        "resume_hash": content_hash(pdf_bytes),
+        "jd_hash": jd_hash,
+        "chunks": ml_chunks,
+        "scores": scores,
+    })
+
+    return {
+        "status": "success",
+        "semantic_method": "chunk_pooled",
+        **results,
+        "scores": score_deltas(scores, previous["scores"] if previous else None),
+        "changes": {
+            "previous_version": previous is not None,
+            "jd_changed": bool(previous) and previous["jd_hash"] != jd_hash,
+            **diff_versions(prev_chunks, ml_chunks),
+            "chunks": {
+                "total": len(set(h for _, h, _ in semantic_chunks + ml_chunks)),
+                "embedded": embedded,
+                "features_computed": counted,
+            },
+        },
+    }
+
+# =================================================
+# API
+# =================================================
+@router.post("/analyze")
+async def incremental_reanalysis(
+    resume: UploadFile = File(...),
+    job_description: Optional[str] = Form(None),
+    jd_id: Optional[str] = Form(None),
+    current_user: str = Depends(get_current_user)
+):
+    if not resume.filename.lower().endswith(".pdf"):
+        raise HTTPException(400, "Only PDF allowed")
+
+    profile = await run_in_threadpool(resolve_jd, job_description, jd_id)
+    data = await resume.read()
+    return await run_in_threadpool(
+        incremental_analysis, current_user, data, profile, resume.filename
+    )
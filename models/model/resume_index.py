@@ -0,0 +1,363 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from models.runtime.profiling import run_in_threadpool
+from functools import lru_cache
+from typing import Optional
+import json
+import logging
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+import numpy as np
+from models.auth.dependencies import get_current_user
+from models.model.skill_taxonomy import SKILL_STACKS, find_skills, get_skill_index
+from models.runtime.metrics import timed
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/resume-index",
+    tags=["Resume Search"]
+)
+
+# =================================================
+# CONFIG (ENV)
+# =================================================
+RESUME_INDEX_ENABLED = os.getenv("RESUME_INDEX_ENABLED", "1") == "1"
+RESUME_INDEX_PATH = os.getenv(
+    "RESUME_INDEX_PATH",
+    os.path.join(tempfile.gettempdir(), "resume_ai_resume_index.sqlite")
+)
+
+# doc ids per stored postings block: an append rewrites one block only
+POSTINGS_BLOCK_SIZE = int(os.getenv("RESUME_INDEX_BLOCK_SIZE", "4096"))
+
+# experience buckets 0, 1, ..., MAX_YEAR_BUCKET (= that many or more);
+# year bounds above it are still exact (filtered on the stored years)
+MAX_YEAR_BUCKET = 15
+# same reading as the semantic experience-gap detector
+RESUME_YEARS_REGEX = re.compile(r"(\d+)\s+years")
+
+MAX_PAGE_SIZE = 100
+
+# =================================================
+# TERMS
+# =================================================
+# skill:<skill>  taxonomy skills named in the resume
+# stack:<stack>  every part of the stack named (mern, mean, ...)
+# years:<n>      experience bucket (largest "<n> years" in the text)
+# all            every document (base set for NOT-only queries)
+
+def resume_years(text: str) -> int:
+    years = [int(y) for y in RESUME_YEARS_REGEX.findall(text) if int(y) < 60]
+    return max(years) if years else 0
+
+
+def document_terms(text: str):
+    # -> (skills, years, terms); text lowercased
+    skills = find_skills(text)
+    years = resume_years(text)
+    have = set(skills)
+    terms = ["all", f"years:{min(years, MAX_YEAR_BUCKET)}"]
+    terms += [f"skill:{s}" for s in skills]
+    terms += [f"stack:{st}" for st, parts in SKILL_STACKS.items() if have.issuperset(parts)]
+    return skills, years, terms
+
+# =================================================
+# SORTED POSTINGS
+# =================================================
+# Doc ids only grow, so appending keeps every list sorted; lists are
+# uint32 arrays and combine with binary search instead of sets.
+
+def intersect(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    if len(a) > len(b):
+        a, b = b, a
+    if not len(a):
+        return a
+    pos = np.minimum(np.searchsorted(b, a), len(b) - 1)
+    return a[b[pos] == a]
+
+
+def subtract(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    if not len(a) or not len(b):
+        return a
+    pos = np.minimum(np.searchsorted(b, a), len(b) - 1)
+    return a[b[pos] != a]
+
+
+def union(lists) -> np.ndarray:
+    lists = [p for p in lists if len(p)]
+    if not lists:
+        return np.empty(0, dtype=np.uint32)
+    return lists[0] if len(lists) == 1 else np.unique(np.concatenate(lists))
+
+# =================================================
+# STORE (SQLITE)
+# =================================================
+# documents: one row per (owner, resume hash); postings: per (owner,
+# term) a list of blocks of POSTINGS_BLOCK_SIZE sorted uint32 ids.
+
+class ResumeIndex:
+    def __init__(self, path: str = RESUME_INDEX_PATH):
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            "doc_id INTEGER PRIMARY KEY AUTOINCREMENT, owner TEXT NOT NULL, "
+            "resume_hash TEXT NOT NULL, filename TEXT, years INTEGER NOT NULL, "
+            "skills TEXT NOT NULL, created REAL NOT NULL, UNIQUE (owner, resume_hash))"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS postings ("
+            "owner TEXT NOT NULL, term TEXT NOT NULL, block INTEGER NOT NULL, "
+            "ids BLOB NOT NULL, PRIMARY KEY (owner, term, block))"
+        )
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        # re-open after fork: a sqlite handle must not cross processes
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def add(self, owner: str, docs) -> int:
+        # docs: [(resume_hash, filename, lowercased text)] -> number added.
+        # One write transaction: doc ids are handed out and appended in
+        # order even with several workers writing.
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            new_postings = {}
+            added = 0
+            for resume_hash, filename, text in docs:
+                exists = conn.execute(
+                    "SELECT 1 FROM documents WHERE owner = ? AND resume_hash = ?",
+                    (owner, resume_hash)
+                ).fetchone()
+                if exists:
+                    continue
+                skills, years, terms = document_terms(text)
+                doc_id = conn.execute(
+                    "INSERT INTO documents (owner, resume_hash, filename, years, skills, created) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (owner, resume_hash, filename, years, json.dumps(skills), time.time())
+                ).lastrowid
+                for term in terms:
+                    new_postings.setdefault(term, []).append(doc_id)
+                added += 1
+
+            for term, ids in new_postings.items():
+                self._append(conn, owner, term, np.array(ids, dtype=np.uint32))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return added
+
+    def _append(self, conn, owner: str, term: str, ids: np.ndarray):
+        last = conn.execute(
+            "SELECT block, ids FROM postings WHERE owner = ? AND term = ? "
+            "ORDER BY block DESC LIMIT 1", (owner, term)
+        ).fetchone()
+        block = 0
+        if last is not None:
+            block = last[0]
+            ids = np.concatenate([np.frombuffer(last[1], dtype="<u4"), ids])
+
+        for start in range(0, len(ids), POSTINGS_BLOCK_SIZE):
+            conn.execute(
+                "INSERT OR REPLACE INTO postings (owner, term, block, ids) VALUES (?, ?, ?, ?)",
+                (owner, term, block, ids[start:start + POSTINGS_BLOCK_SIZE].astype("<u4").tobytes())
+            )
+            block += 1
+
+    def postings(self, owner: str, term: str) -> np.ndarray:
+        rows = self._conn().execute(
+            "SELECT ids FROM postings WHERE owner = ? AND term = ? ORDER BY block",
+            (owner, term)
+        ).fetchall()
+        if not rows:
+            return np.empty(0, dtype=np.uint32)
+        return np.concatenate([np.frombuffer(r[0], dtype="<u4") for r in rows])
+
+    def years_between(self, owner: str, low: int, high: Optional[int]) -> np.ndarray:
+        # sorted doc ids with low <= years <= high (None = no upper bound),
+        # read from the stored years: the top bucket lumps MAX_YEAR_BUCKET+
+        # together
+        rows = self._conn().execute(
+            "SELECT doc_id FROM documents WHERE owner = ? AND years >= ? AND years <= ? "
+            "ORDER BY doc_id", (owner, low, high if high is not None else 2 ** 31)
+        ).fetchall()
+        return np.array([r[0] for r in rows], dtype=np.uint32)
+
+    def documents(self, owner: str, doc_ids):
+        if not doc_ids:
+            return []
+        rows = self._conn().execute(
+            "SELECT doc_id, resume_hash, filename, years, skills, created FROM documents "
+            f"WHERE owner = ? AND doc_id IN ({','.join('?' * len(doc_ids))})",
+            (owner, *doc_ids)
+        ).fetchall()
+        by_id = {
+            r[0]: {
+                "doc_id": r[0], "resume_hash": r[1], "filename": r[2],
+                "years": r[3], "skills": json.loads(r[4]), "indexed": r[5],
+            }
+            for r in rows
+        }
+        return [by_id[i] for i in doc_ids if i in by_id]
+
+
+@lru_cache(maxsize=1)
+def get_resume_index():
+    return ResumeIndex()
+
+# =================================================
+# INDEXING (SIDE EFFECT OF ANALYSIS)
+# =================================================
+def index_resumes(owner: str, docs):
+    # docs: [(resume_hash, filename, text)]. Never fails the analysis
+    # that triggered it.
+    if not RESUME_INDEX_ENABLED or not owner:
+        return
+    try:
+        get_resume_index().add(owner, [(h, name, text.lower()) for h, name, text in docs])
+    except Exception as e:
+        logger.warning("Resume indexing failed: %s", e)
+
+# =================================================
+# QUERIES
+# =================================================
+# A query is AND of OR-groups of skills / stacks, minus excluded ones,
+# optionally bounded by experience years. q="docker AND aws AND 3+ years"
+# is parsed into the same shape.
+
+QUERY_YEARS_REGEX = re.compile(r"^(\d+)\s*(\+|-\s*(\d+))?\s*years?$")
+
+
+def term_for(name: str) -> Optional[str]:
+    name = " ".join(name.lower().split())
+    if name in SKILL_STACKS:
+        return f"stack:{name}"
+    _, index, _, alias_to_skill = get_skill_index()
+    if name in index:
+        return f"skill:{name}"
+    if name in alias_to_skill:
+        return f"skill:{alias_to_skill[name]}"
+    return None
+
+
+def parse_query(q: str):
+    # -> (groups, excluded, min_years, max_years)
+    groups, excluded, min_years, max_years = [], [], None, None
+    for clause in re.split(r"\s+and\s+", q.strip().lower()):
+        clause = clause.strip()
+        years = QUERY_YEARS_REGEX.match(clause)
+        if years:
+            min_years = int(years.group(1))
+            if years.group(3):
+                max_years = int(years.group(3))
+            elif not years.group(2):
+                max_years = min_years
+        elif clause.startswith("not "):
+            excluded.append(clause[4:])
+        elif clause:
+            groups.append([t.strip() for t in re.split(r"\s+or\s+", clause) if t.strip()])
+    return groups, excluded, min_years, max_years
+
+
+@timed("resume_index_query")
+def search(owner: str, groups, excluded, min_years: Optional[int] = None,
+           max_years: Optional[int] = None):
+    # -> (sorted matching doc ids, names that are no known skill/stack)
+    index = get_resume_index()
+    unknown = []
+
+    def lookup(names):
+        lists = []
+        for name in names:
+            term = term_for(name)
+            if term is None:
+                unknown.append(name)
+            else:
+                lists.append(index.postings(owner, term))
+        return union(lists)
+
+    # smallest list first keeps every intersection cheap
+    required = sorted((lookup(g) for g in groups), key=len)
+    if min_years is not None or max_years is not None:
+        low, high = max(0, min_years or 0), max_years
+        below = MAX_YEAR_BUCKET - 1 if high is None else min(high, MAX_YEAR_BUCKET - 1)
+        buckets = [index.postings(owner, f"years:{y}") for y in range(low, below + 1)]
+        if high is None and low <= MAX_YEAR_BUCKET:
+            buckets.append(index.postings(owner, f"years:{MAX_YEAR_BUCKET}"))
+        elif high is None or high >= MAX_YEAR_BUCKET:
+            # a bound inside the MAX_YEAR_BUCKET+ bucket: the stored
+            # years decide (few documents)
+            buckets.append(index.years_between(owner, max(low, MAX_YEAR_BUCKET), high))
+        required.insert(0, union(buckets))
+
+    if required:
+        ids = required[0]
+        for postings in required[1:]:
+            ids = intersect(ids, postings)
+    else:
+        ids = index.postings(owner, "all")
+
+    if excluded and len(ids):
+        ids = subtract(ids, lookup(excluded))
+    return ids, unknown
+
+# =================================================
+# API
+# =================================================
+def split_names(raw: Optional[str]):
+    return [n.strip() for n in (raw or "").split(",") if n.strip()]
+
+
+@router.get("/search")
+async def search_resumes(
+    q: Optional[str] = Query(None, description='e.g. "docker AND aws AND 3+ years"'),
+    skills: Optional[str] = Query(None, description="comma separated, all required"),
+    any_skills: Optional[str] = Query(None, description="comma separated, at least one"),
+    exclude: Optional[str] = Query(None, description="comma separated, none allowed"),
+    min_years: Optional[int] = Query(None, ge=0, description="inclusive, any value (20 = 20+ years)"),
+    max_years: Optional[int] = Query(None, ge=0, description="inclusive, any value"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    current_user: str = Depends(get_current_user)
+):
+    groups, excluded = [[n] for n in split_names(skills)], split_names(exclude)
+    if any_skills:
+        groups.append(split_names(any_skills))
+    if q:
+        q_groups, q_excluded, q_min, q_max = parse_query(q)
+        groups += q_groups
+        excluded += q_excluded
+        min_years = q_min if min_years is None else min_years
+        max_years = q_max if max_years is None else max_years
+    if min_years is not None and max_years is not None and min_years > max_years:
+        raise HTTPException(400, "min_years is greater than max_years")
+
+    def run():
+        ids, unknown = search(current_user, groups, excluded, min_years, max_years)
+        # newest first
+        start = (page - 1) * page_size
+        page_ids = [int(i) for i in ids[::-1][start:start + page_size]]
+        return {
+            "status": "success",
+            "total": int(len(ids)),
+            "page": page,
+            "page_size": page_size,
+            "unknown_terms": unknown,
+            "results": get_resume_index().documents(current_user, page_ids),
+        }
+
+    return await run_in_threadpool(run)
@@ -1,11 +1,22 @@
-import pdfplumber
-import re
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import tempfile, os
-
-app = FastAPI(title="Industry-Grade ATS Resume System")
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
+from models.runtime.profiling import run_in_threadpool
+from scipy import sparse
+from typing import List, Optional
+from itertools import chain, filterfalse
+import numpy as np
+import os
+from models.auth.dependencies import get_current_user
+from models.runtime.metrics import timed
+from models.model.pdf_text import parse_pages, joined
+from models.model.jd_registry import lookup_jd
+from models.model.resume_dedup import find_duplicates, duplicate_flag
+from models.model.resume_index import index_resumes
+from models.runtime.cache import content_hash
+
+router = APIRouter(
+    prefix="/ats",
+    tags=["ATS Keyword Match"]
+)
 
 # =================================================
 # CONSTANTS (MEMORY SAFE)
@@ -13,6 +24,8 @@ app = FastAPI(title="Industry-Grade ATS Resume System")
 
 MAX_PAGES = 5  # 🔥 BIG memory saver
 
+ATS_BULK_MAX_RESUMES = int(os.getenv("ATS_BULK_MAX_RESUMES", "10000"))
+
 STOPWORDS = {
     "the","is","are","a","an","and","or","to","of","in","for",
     "on","with","as","by","at","from","this","that","it"
@@ -32,166 +45,340 @@ STACK_MAP = {
     "data science": {"python","machine learning"}
 }
 
-NON_ALPHA = re.compile(r"[^a-z0-9\s]")
-MULTI_SPACE = re.compile(r"\s+")
+PROJECT_KEYWORDS = ("api", "socket", "database", "auth")
+
+SECTION_TRIGGERS = {
+    "skills": "skills", "technical": "skills",
+    "projects": "projects", "project": "projects",
+    "experience": "experience", "internship": "experience",
+}
+
+# [^a-z0-9\s] -> " " as one bytes.translate (non-ASCII is replaced
+# first, so it becomes a space too)
+CLEAN_TABLE = bytes(
+    c if chr(c) in "abcdefghijklmnopqrstuvwxyz0123456789 \t\n\r\x0b\x0c" else 32
+    for c in range(256)
+)
+
+# Columns of every skill matrix, and the term -> skill expansion
+# (a skill implies itself, a stack implies its members).
+SKILLS = tuple(sorted(SKILL_VOCAB))
+SKILL_COLUMN = {s: i for i, s in enumerate(SKILLS)}
+TERMS = SKILLS + tuple(STACK_MAP)
+TERM_TO_SKILLS = sparse.csr_matrix(
+    (
+        np.ones(len(SKILLS) + sum(len(m) for m in STACK_MAP.values()), dtype=np.float32),
+        (
+            [i for i in range(len(SKILLS))]
+            + [len(SKILLS) + k for k, m in enumerate(STACK_MAP.values()) for _ in m],
+            [i for i in range(len(SKILLS))]
+            + [SKILL_COLUMN[s] for m in STACK_MAP.values() for s in sorted(m)],
+        ),
+    ),
+    shape=(len(TERMS), len(SKILLS))
+)
 
 # =================================================
 # UTILS
 # =================================================
 
-def extract_text_from_pdf(path: str) -> str:
-    texts = []
-    with pdfplumber.open(path) as pdf:
-        for page in pdf.pages[:MAX_PAGES]:  # 🔥 limit pages
-            t = page.extract_text()
-            if t:
-                texts.append(t)
-    text = "\n".join(texts)
-    if not text.strip():
-        raise ValueError("PDF contains no readable text")
-    return text
+def pdf_text(pdf_bytes: bytes) -> str:
+    pages, _ = parse_pages(pdf_bytes, MAX_PAGES, analyzer="ats")
+    return joined(pages, MAX_PAGES)
 
 
 def clean_text(text: str) -> str:
-    text = text.lower()
-    text = NON_ALPHA.sub(" ", text)
-    text = MULTI_SPACE.sub(" ", text)
-    return " ".join(w for w in text.split() if w not in STOPWORDS)
+    text = text.lower().encode("ascii", "replace").translate(CLEAN_TABLE).decode("ascii")
+    return " ".join(filterfalse(STOPWORDS.__contains__, text.split()))
 
 
 def extract_sections(text: str):
+    # a trigger word switches the current section; words (trigger
+    # included) go to the current section until the next trigger.
+    # Triggers are found with str.find, not a regex test at every offset.
     sections = {"skills": "", "projects": "", "experience": ""}
-    current = None
-
-    for word in text.split():
-        if word in {"skills","technical"}:
-            current = "skills"
-        elif word in {"projects","project"}:
-            current = "projects"
-        elif word in {"experience","internship"}:
-            current = "experience"
-
-        if current:
-            sections[current] += word + " "
-
+    padded = f" {text} "
+    hits = []
+    for word, section in SECTION_TRIGGERS.items():
+        needle = f" {word} "
+        i = padded.find(needle)
+        while i != -1:
+            hits.append((i, section))
+            i = padded.find(needle, i + 1)
+
+    hits.sort()
+    for (start, section), nxt in zip(hits, hits[1:] + [(len(padded), None)]):
+        sections[section] += padded[start:nxt[0]].strip() + " "
     return sections
 
 
-# =================================================
-# SKILLS
-# =================================================
-
-def extract_skills(text: str):
-    skills = {s for s in SKILL_VOCAB if s in text}
-    for stack, expanded in STACK_MAP.items():
-        if stack in text:
-            skills.update(expanded)
-    return skills
-
-
-def skill_gap_detection(resume_skills, jd_skills):
-    return {
-        "matched_skills": list(resume_skills & jd_skills),
-        "missing_skills": list(jd_skills - resume_skills),
-        "extra_skills": list(resume_skills - jd_skills)
-    }
-
-
-def skill_match_score(resume_skills, jd_skills):
-    return len(resume_skills & jd_skills) / len(jd_skills) if jd_skills else 0.0
-
+def ngram_counts(texts, bigrams: bool = True, with_terms: bool = False):
+    # (texts, terms) counts -- same as CountVectorizer(ngram_range=(1, 2))
+    # on clean_text output (tokens of 2+ chars, plus adjacent pairs), but
+    # bigrams are integer pairs in NumPy instead of Python strings.
+    # bigrams=False -> unigram counts only; with_terms -> (counts, the
+    # column terms as CountVectorizer spells them)
+    words = [t.split() for t in texts]
+    flat = list(chain.from_iterable(words))
+    vocab = {w: i for i, w in enumerate(dict.fromkeys(flat))}
+
+    ids = np.fromiter(map(vocab.__getitem__, flat), dtype=np.int64, count=len(flat))
+    doc = np.repeat(np.arange(len(texts)), [len(w) for w in words])
+    # the default token pattern skips 1-character words
+    keep = np.fromiter(map(len, vocab), dtype=np.int64, count=len(vocab))[ids] > 1
+    ids, doc = ids[keep], doc[keep]
+    codes, rows = ids, doc
+    if bigrams:
+        pair = doc[1:] == doc[:-1]
+        n_words = len(vocab)
+        codes = np.concatenate([ids, n_words + ids[:-1][pair] * n_words + ids[1:][pair]])
+        rows = np.concatenate([doc, doc[:-1][pair]])
+    uniq, cols = np.unique(codes, return_inverse=True)
+
+    counts = sparse.csr_matrix(
+        (np.ones(len(cols)), (rows, cols.ravel())),
+        shape=(len(texts), cols.max() + 1 if len(cols) else 0)
+    )
+    counts.sum_duplicates()
+    if not with_terms:
+        return counts
 
-# =================================================
-# PROJECT SCORE (LIGHTWEIGHT)
-# =================================================
+    words = list(vocab)
+    n_words = len(words)
+    terms = [
+        words[c] if c < n_words else f"{words[(c - n_words) // n_words]} {words[(c - n_words) % n_words]}"
+        for c in uniq.tolist()
+    ]
+    return counts, terms
 
-def project_relevance_score(project_text, jd_skills):
-    if not project_text or not jd_skills:
-        return 0.0
 
-    used = {s for s in jd_skills if s in project_text}
+def presence_matrix(texts, terms) -> sparse.csr_matrix:
+    # (texts, terms) 0/1 with `term in text` (substring) semantics
+    indptr, indices = [0], []
+    for text in texts:
+        indices.extend(j for j, term in enumerate(terms) if term in text)
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.float32)
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(texts), len(terms)))
 
-    coverage = len(used) / len(jd_skills)
 
-    bonus = 0.0
-    if project_text.count("project") >= 2:
-        bonus += 0.1
-    if any(k in project_text for k in ("api","socket","database","auth")):
-        bonus += 0.1
+def skill_matrix(texts) -> sparse.csr_matrix:
+    # (texts, SKILLS) 0/1: vocabulary hits plus stack expansions
+    hits = presence_matrix(texts, TERMS) @ TERM_TO_SKILLS
+    hits.data[:] = 1
+    hits.sort_indices()
+    return hits
 
-    return min(1.0, coverage + bonus)
 
+def skills_of(matrix: sparse.csr_matrix, i: int) -> list:
+    # row i of a sorted skill matrix, read off the CSR arrays
+    return [SKILLS[j] for j in matrix.indices[matrix.indptr[i]:matrix.indptr[i + 1]]]
 
 # =================================================
-# EXPERIENCE (SAFE TF-IDF)
+# VECTORIZED SCORING
 # =================================================
+# Same definitions as the original per-resume scorer: skill coverage,
+# project coverage + bonuses, TF-IDF similarity of the experience
+# section to the JD, weighted 0.5 / 0.3 / 0.2. Every resume in the
+# batch is scored by the same sparse / NumPy operations.
+
+def project_scores(project_texts, jd_skills: np.ndarray) -> np.ndarray:
+    n_jd = jd_skills.sum()
+    if not n_jd:
+        return np.zeros(len(project_texts))
+
+    coverage = (presence_matrix(project_texts, SKILLS) @ jd_skills) / n_jd
+    bonus = (
+        0.1 * (np.array([t.count("project") for t in project_texts]) >= 2)
+        + 0.1 * (presence_matrix(project_texts, PROJECT_KEYWORDS).getnnz(axis=1) > 0)
+    )
+    has_text = np.array([bool(t) for t in project_texts])
+    return np.where(has_text, np.minimum(1.0, coverage + bonus), 0.0)
+
+
+# Each resume is compared with the JD exactly as the original scorer
+# did: TfidfVectorizer(max_features=500, ngram_range=(1, 2)) fitted on
+# that (experience, JD) pair alone. So a resume's score never depends on
+# the rest of the batch. Per pair, over the union of both documents'
+# terms:
+#   cap  at most EXPERIENCE_MAX_TERMS terms, most frequent in the pair
+#        (same selection as sklearn, ties included)
+#   idf  ln(3 / (1 + df)) + 1, df = 1 or 2 documents (smooth_idf, n = 2)
+#   cos  (jd . resume) / (|jd| |resume|) of the tf x idf rows
+# One pass over all (pair, term) entries of the batch; entries run in
+# term order within a pair, so bulk and single-resume sums are identical.
+EXPERIENCE_MAX_TERMS = 500
+
+
+@timed("tfidf")
+def experience_scores(experience_texts, jd_text: str) -> np.ndarray:
+    scores = np.zeros(len(experience_texts))
+    rows = [i for i, t in enumerate(experience_texts) if t]
+    if not jd_text or not rows:
+        return scores
+
+    counts, terms = ngram_counts([jd_text] + [experience_texts[i] for i in rows], with_terms=True)
+    if not counts.shape[1]:
+        return scores
+    jd = counts[0].toarray().ravel()
+    resumes = counts[1:]
+
+    # alphabetical rank of each column (the vectorizer's feature order)
+    rank = np.empty(len(terms), dtype=np.int64)
+    rank[sorted(range(len(terms)), key=terms.__getitem__)] = np.arange(len(terms))
+
+    # pair entries: the resume's terms plus every JD term, per row
+    jd_cols = np.flatnonzero(jd)
+    union = resumes + sparse.csr_matrix(
+        (np.tile(jd[jd_cols], len(rows)), np.tile(jd_cols, len(rows)),
+         np.arange(len(rows) + 1) * len(jd_cols)),
+        shape=resumes.shape
+    )
+    union.sum_duplicates()
+    pair = np.repeat(np.arange(len(rows)), np.diff(union.indptr))
+    order = np.lexsort((rank[union.indices], pair))
+    pair, cols, total = pair[order], union.indices[order], union.data[order]
+    jd_tf = jd[cols]
+    res_tf = total - jd_tf
+
+    sizes = np.bincount(pair, minlength=len(rows))
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    keep = np.ones(len(pair), dtype=bool)
+    for r in np.flatnonzero(sizes > EXPERIENCE_MAX_TERMS):
+        seg = slice(starts[r], starts[r] + sizes[r])
+        dropped = np.ones(sizes[r], dtype=bool)
+        # integer term counts in feature order, as _limit_features sorts them
+        dropped[(-total[seg].astype(np.int64)).argsort()[:EXPERIENCE_MAX_TERMS]] = False
+        keep[seg] = ~dropped
+
+    pair, jd_tf, res_tf = pair[keep], jd_tf[keep], res_tf[keep]
+    idf = np.log(3.0 / (1.0 + (jd_tf > 0) + (res_tf > 0))) + 1.0
+    jd_w, res_w = jd_tf * idf, res_tf * idf
+
+    n = len(rows)
+    dot = np.bincount(pair, jd_w * res_w, minlength=n)
+    norms = np.sqrt(np.bincount(pair, jd_w * jd_w, minlength=n) * np.bincount(pair, res_w * res_w, minlength=n))
+    scores[rows] = np.divide(dot, norms, out=np.zeros(n), where=norms > 0)
+    return scores
+
+
+@timed("ats_score")
+def score_resumes(resume_texts, job_description: str):
+    resumes = [clean_text(t) for t in resume_texts]
+    jd_text = clean_text(job_description)
 
-def text_similarity(a: str, b: str):
-    if not a or not b:
-        return 0.0
+    sections = [extract_sections(t) for t in resumes]
+    resume_skills = skill_matrix(resumes)
+    jd_row = skill_matrix([jd_text])
+    jd_skills = jd_row.toarray().ravel()
+    n_jd = jd_skills.sum()
 
-    vectorizer = TfidfVectorizer(
-        max_features=500,  # 🔥 memory limit
-        ngram_range=(1, 2)
+    skill_score = (resume_skills @ jd_skills) / n_jd if n_jd else np.zeros(len(resumes))
+    project_score = project_scores([s["projects"] for s in sections], jd_skills)
+    experience_score = experience_scores([s["experience"] for s in sections], jd_text)
+
+    final = np.round(
+        (0.5 * skill_score + 0.3 * project_score + 0.2 * experience_score) * 100, 2
+    )
+    verdicts = np.select(
+        [final >= 75, final >= 55], ["STRONG MATCH", "MODERATE MATCH"], "WEAK MATCH"
     )
-    vectors = vectorizer.fit_transform([a, b])
-    return cosine_similarity(vectors[0], vectors[1])[0][0]
 
+    jd_set = set(skills_of(jd_row, 0))
+    results = []
+    for i in range(len(resumes)):
+        have = skills_of(resume_skills, i)
+        results.append({
+            "core_skills_matched": [s for s in have if s in jd_set],
+            "missing_skills": [s for s in SKILLS if s in jd_set and s not in have],
+            "extra_skills_detected": [s for s in have if s not in jd_set],
+            "skill_match_percent": round(float(skill_score[i]) * 100, 2),
+            "project_relevance": round(float(project_score[i]) * 100, 2),
+            "experience_relevance": round(float(experience_score[i]) * 100, 2),
+            "ats_match_score": float(final[i]),
+            "verdict": str(verdicts[i]),
+            "note": "Extra skills are treated as strengths, not penalties"
+        })
+    return results
 
 # =================================================
 # API
 # =================================================
 
-@app.post("/match-resume")
+def jd_text(job_description: Optional[str], jd_id: Optional[str]) -> str:
+    # keyword scoring needs no JD profile (embeddings); a registered
+    # jd_id just supplies its stored text
+    if jd_id:
+        profile = lookup_jd(jd_id)
+        if profile is None:
+            raise HTTPException(404, "Unknown jd_id, register the job description first")
+        return profile.text
+    if not job_description or not job_description.strip():
+        raise HTTPException(400, "job_description or jd_id is required")
+    return job_description
+
+
+@router.post("/match-resume")
 async def match_resume(
     resume: UploadFile = File(...),
-    job_description: str = Form(...)
+    job_description: Optional[str] = Form(None),
+    jd_id: Optional[str] = Form(None)
 ):
     if not resume.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF allowed")
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        tmp.write(await resume.read())
-        path = tmp.name
+    jd = await run_in_threadpool(jd_text, job_description, jd_id)
+    data = await resume.read()
 
-    try:
-        raw_resume = extract_text_from_pdf(path)
-    finally:
-        os.remove(path)
+    def compute():
+        text = pdf_text(data)
+        if not text.strip():
+            raise HTTPException(status_code=400, detail="PDF contains no readable text")
+        return score_resumes([text], jd)[0]
 
-    resume_text = clean_text(raw_resume)
-    jd_text = clean_text(job_description)
-
-    resume_sections = extract_sections(resume_text)
-
-    resume_skills = extract_skills(resume_text)
-    jd_skills = extract_skills(jd_text)
-
-    skill_score = skill_match_score(resume_skills, jd_skills)
-    project_score = project_relevance_score(resume_sections["projects"], jd_skills)
-    experience_score = text_similarity(resume_sections["experience"], jd_text)
+    return await run_in_threadpool(compute)
 
-    final_score = round(
-        (0.5 * skill_score + 0.3 * project_score + 0.2 * experience_score) * 100,
-        2
-    )
 
-    verdict = (
-        "STRONG MATCH" if final_score >= 75 else
-        "MODERATE MATCH" if final_score >= 55 else
-        "WEAK MATCH"
-    )
+@router.post("/bulk-match")
+async def bulk_match(
+    resumes: List[UploadFile] = File(...),
+    job_description: Optional[str] = Form(None),
+    jd_id: Optional[str] = Form(None),
+    current_user: str = Depends(get_current_user)
+):
+    if len(resumes) > ATS_BULK_MAX_RESUMES:
+        raise HTTPException(400, f"At most {ATS_BULK_MAX_RESUMES} resumes per request")
+    if any(not r.filename.lower().endswith(".pdf") for r in resumes):
+        raise HTTPException(status_code=400, detail="Only PDF allowed")
 
-    gap = skill_gap_detection(resume_skills, jd_skills)
-
-    return {
-        "core_skills_matched": gap["matched_skills"],
-        "missing_skills": gap["missing_skills"],
-        "extra_skills_detected": gap["extra_skills"],
-        "skill_match_percent": round(skill_score * 100, 2),
-        "project_relevance": round(project_score * 100, 2),
-        "experience_relevance": round(experience_score * 100, 2),
-        "ats_match_score": final_score,
-        "verdict": verdict,
-        "note": "Extra skills are treated as strengths, not penalties"
-    }
+    jd = await run_in_threadpool(jd_text, job_description, jd_id)
+    files = [(r.filename, await r.read()) for r in resumes]
+
+    def compute():
+        names, texts, skipped, indexed = [], [], [], []
+        for name, data in files:
+            try:
+                text = pdf_text(data)
+            except Exception:
+                text = ""
+            if text.strip():
+                names.append(name)
+                texts.append(text)
+                indexed.append((content_hash(data), name, text))
+            else:
+                skipped.append(name)
+        index_resumes(current_user, indexed)
+        duplicates = find_duplicates(current_user, list(zip(names, texts)))
+
+        results = score_resumes(texts, jd) if texts else []
+        order = sorted(range(len(results)), key=lambda i: -results[i]["ats_match_score"])
+        for rank, i in enumerate(order, start=1):
+            results[i] = {
+                "filename": names[i],
+                "rank": rank,
+                "duplicate_of": duplicate_flag(duplicates[i]),
+                **results[i]
+            }
+        return {"status": "success", "skipped_resumes": skipped, "results": results}
+
+    return await run_in_threadpool(compute)
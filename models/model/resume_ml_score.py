@@ -1,10 +1,16 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
-import pdfplumber
+from models.runtime.profiling import run_in_threadpool
 import joblib
-import re
 import os
+from functools import lru_cache
 import tempfile
 from models.auth.dependencies import get_current_user
+from models.model.resume_features import extract_features, check_schema_version
+from models.runtime.metrics import stage, timed
+from models.runtime.threads import get_budget
+from models.model.pdf_text import extract_text
+from models.runtime.cache import cached_result, content_hash, file_fingerprint
+from models.model.resume_features import FEATURE_SCHEMA_VERSION
 
 router = APIRouter(
     prefix="/ml-score",
@@ -23,66 +29,52 @@ MODEL_PATH = os.getenv(
     "models/resume_score_model.pkl"
 )
 
-# Load model ONCE (safe)
-try:
-    model = joblib.load(MODEL_PATH)
-except Exception as e:
-    raise RuntimeError(f"Failed to load ML model: {e}")
-
-SKILL_VOCAB = {
-    "react","javascript","node","express","mongodb",
-    "python","sql","html","css","machine learning",
-    "docker","aws","api","rest"
-}
-
-WEAK_PHRASES = {
-    "worked on",
-    "responsible for",
-    "helped with",
-    "basic knowledge",
-    "good knowledge"
-}
-
-BULLET_REGEX = re.compile(r"(?:•|-|–|\*)")
-EXP_REGEX = re.compile(r"(\d+)\s*(?:years?|months?)")
+# Model file fingerprint -> retraining invalidates cached predictions
+ANALYZER_VERSION = f"ml-v1-fs{FEATURE_SCHEMA_VERSION}-{file_fingerprint(MODEL_PATH)}"
+
+# =================================================
+# LOAD MODEL (LAZY, ONCE)
+# =================================================
+# Loaded on first use -- or in the master before fork when serving
+# with gunicorn preload (see models/gunicorn.conf.py).
+
+@lru_cache(maxsize=1)
+def get_model():
+    try:
+        model = joblib.load(MODEL_PATH)
+    except Exception as e:
+        raise RuntimeError(f"Failed to load ML model: {e}")
+
+    check_schema_version(model)
+    # trained with n_jobs=-1 (a thread per core on every predict call)
+    if hasattr(model, "n_jobs"):
+        model.n_jobs = get_budget().ml_n_jobs
+    return model
 
 # =================================================
 # UTILS
 # =================================================
 
+@timed("pdf_parse")
 def extract_text_from_pdf(path: str) -> str:
-    texts = []
-    with pdfplumber.open(path) as pdf:
-        for page in pdf.pages[:MAX_PAGES]:
-            t = page.extract_text()
-            if t:
-                texts.append(t)
+    # 🔥 cap size -- parsing stops once MAX_TEXT_CHARS is covered
+    return extract_text(path, MAX_PAGES, MAX_TEXT_CHARS, analyzer="ml")
 
-    text = "\n".join(texts)
-    return text[:MAX_TEXT_CHARS]  # 🔥 cap size
 
+def score_text(text: str) -> dict:
+    with stage("ml_features"):
+        features = extract_features(text)
+    return score_features(features)
 
-def extract_features(text: str):
-    text = text.lower()
-
-    resume_length = len(text.split())
-    num_skills = sum(1 for s in SKILL_VOCAB if s in text)
-    num_projects = text.count("project")
-    num_bullets = len(BULLET_REGEX.findall(text))
 
-    matches = EXP_REGEX.findall(text)
-    experience_years = max(map(int, matches)) if matches else 0
+def score_features(features) -> dict:
+    with stage("ml_predict"):
+        score = get_model().predict([features])[0]
 
-    grammar_issues = sum(text.count(p) for p in WEAK_PHRASES)
+    return {
+        "ml_resume_score": round(float(score), 2)
+    }
 
-    return [[
-        resume_length,
-        num_skills,
-        num_projects,
-        num_bullets,
-        experience_years,
-        grammar_issues
-    ]]
 
 # =================================================
 # API
@@ -96,21 +88,23 @@ async def predict_resume_score(
     if not resume.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF allowed")
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        tmp.write(await resume.read())
-        path = tmp.name
+    data = await resume.read()
 
-    try:
-        text = extract_text_from_pdf(path)
-        if not text.strip():
-            raise HTTPException(400, "Unable to extract resume text")
+    def compute():
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+            tmp.write(data)
+            path = tmp.name
 
-        features = extract_features(text)
-        score = model.predict(features)[0]
+        try:
+            text = extract_text_from_pdf(path)
+            if not text.strip():
+                raise HTTPException(400, "Unable to extract resume text")
+
+            return score_text(text)
 
-        return {
-            "ml_resume_score": round(float(score), 2)
-        }
+        finally:
+            os.remove(path)
 
-    finally:
-        os.remove(path)
+    return await run_in_threadpool(
+        cached_result, "ml", ANALYZER_VERSION, (content_hash(data),), compute
+    )
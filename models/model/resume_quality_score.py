@@ -1,9 +1,12 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
-import pdfplumber
+from models.runtime.profiling import run_in_threadpool
 import re
 import tempfile
 import os
 from models.auth.dependencies import get_current_user
+from models.runtime.metrics import timed
+from models.model.pdf_text import extract_text
+from models.runtime.cache import cached_result, content_hash
 
 router = APIRouter(
     prefix="/quality",
@@ -16,6 +19,9 @@ router = APIRouter(
 MAX_PAGES = 5
 MAX_TEXT_CHARS = 15000
 
+# Bump when scoring logic changes (invalidates cached results)
+ANALYZER_VERSION = "quality-v1"
+
 # =================================================
 # PRE-COMPILED REGEX
 # =================================================
@@ -58,16 +64,9 @@ def normalize_text(text: str) -> str:
     return SPACE_REGEX.sub(" ", text).strip()
 
 
+@timed("pdf_parse")
 def extract_text_from_pdf(path: str) -> str:
-    texts = []
-    with pdfplumber.open(path) as pdf:
-        for page in pdf.pages[:MAX_PAGES]:
-            t = page.extract_text()
-            if t:
-                texts.append(t)
-
-    text = "\n".join(texts)
-    return text[:MAX_TEXT_CHARS]
+    return extract_text(path, MAX_PAGES, MAX_TEXT_CHARS, analyzer="quality")
 
 
 # =================================================
@@ -148,6 +147,7 @@ def formatting_score(text: str) -> float:
     return 90
 
 
+@timed("quality_score")
 def compute_resume_quality_score(resume_text: str) -> dict:
     clean = normalize_text(resume_text)
 
@@ -186,16 +186,23 @@ async def resume_quality_score(
     if not resume.filename.lower().endswith(".pdf"):
         raise HTTPException(400, "Only PDF resumes are supported")
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        tmp.write(await resume.read())
-        path = tmp.name
+    data = await resume.read()
+
+    def compute():
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+            tmp.write(data)
+            path = tmp.name
 
-    try:
-        text = extract_text_from_pdf(path)
-        if not text.strip():
-            raise HTTPException(400, "Unable to extract text from PDF")
+        try:
+            text = extract_text_from_pdf(path)
+            if not text.strip():
+                raise HTTPException(400, "Unable to extract text from PDF")
 
-        return compute_resume_quality_score(text)
+            return compute_resume_quality_score(text)
 
-    finally:
-        os.remove(path)
+        finally:
+            os.remove(path)
+
+    return await run_in_threadpool(
+        cached_result, "quality", ANALYZER_VERSION, (content_hash(data),), compute
+    )
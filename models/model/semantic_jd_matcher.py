@@ -1,12 +1,17 @@
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Depends
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
+from models.runtime.profiling import run_in_threadpool
 import pdfplumber
 import tempfile
 import os
-from sentence_transformers import SentenceTransformer
+from typing import Optional
 from sklearn.metrics.pairwise import cosine_similarity
 from models.auth.dependencies import get_current_user
+from models.model.fidelity import encode_mode, resolve_mode
+from models.model.jd_registry import resolve_jd_requirements
 
-app = FastAPI(title="Semantic ATS Matcher (Model 6)")
+router = APIRouter(
+    tags=["Semantic ATS Matcher (Model 6)"]
+)
 
 # =================================================
 # LIMITS (VERY IMPORTANT FOR RENDER)
@@ -15,9 +20,9 @@ MAX_PAGES = 4
 MAX_TEXT_CHARS = 4000   # transformer safe limit
 
 # =================================================
-# LOAD MODEL ONCE
+# MODEL (see models.model.fidelity)
 # =================================================
-semantic_model = SentenceTransformer("all-MiniLM-L6-v2")
+# fast | balanced | accurate -- loaded on first use of each mode
 
 # =================================================
 # UTILS
@@ -34,23 +39,18 @@ def extract_text_from_pdf(pdf_path: str) -> str:
     return text[:MAX_TEXT_CHARS].strip()
 
 
-def semantic_resume_jd_match(resume_text: str, jd_text: str):
+def semantic_resume_jd_match(resume_text: str, jd_text: str, mode: str = "accurate"):
     # truncate JD also (very important)
     resume_text = resume_text[:MAX_TEXT_CHARS]
     jd_text = jd_text[:MAX_TEXT_CHARS]
 
-    resume_embedding = semantic_model.encode(
-        resume_text, normalize_embeddings=True
-    )
-    jd_embedding = semantic_model.encode(
-        jd_text, normalize_embeddings=True
-    )
+    resume_embedding, jd_embedding = encode_mode([resume_text, jd_text], mode)
 
     similarity = cosine_similarity(
         [resume_embedding], [jd_embedding]
     )[0][0]
 
-    score = round(similarity * 100, 2)
+    score = round(float(similarity) * 100, 2)
 
     verdict = (
         "STRONG MATCH" if score >= 75
@@ -66,32 +66,43 @@ def semantic_resume_jd_match(resume_text: str, jd_text: str):
 # =================================================
 # API
 # =================================================
-@app.post("/semantic-match")
+@router.post("/semantic-match")
 async def semantic_match_api(
     resume: UploadFile = File(...),
-    job_description: str = Form(...),
+    job_description: Optional[str] = Form(None),
+    jd_id: Optional[str] = Form(None),
+    mode: Optional[str] = Form(None, description="fast | balanced | accurate"),
     current_user: str = Depends(get_current_user)
 ):
     if not resume.filename.lower().endswith(".pdf"):
         raise HTTPException(400, "Only PDF resumes allowed")
+    mode = resolve_mode(mode)
+    # only the JD text is embedded here: no profile (probe vectors) built
+    jd = await run_in_threadpool(resolve_jd_requirements, job_description, jd_id)
+
+    data = await resume.read()
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        tmp.write(await resume.read())
-        path = tmp.name
+    def compute():
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+            tmp.write(data)
+            path = tmp.name
 
-    try:
-        resume_text = extract_text_from_pdf(path)
+        try:
+            resume_text = extract_text_from_pdf(path)
 
-        if not resume_text:
-            raise HTTPException(400, "Could not extract resume text")
+            if not resume_text:
+                raise HTTPException(400, "Could not extract resume text")
 
-        result = semantic_resume_jd_match(resume_text, job_description)
+            return semantic_resume_jd_match(resume_text, jd.text, mode)
 
-        return {
-            "status": "success",
-            "semantic_match_score": result["semantic_match_score"],
-            "verdict": result["verdict"]
-        }
+        finally:
+            os.remove(path)
 
-    finally:
-        os.remove(path)
+    result = await run_in_threadpool(compute)
+
+    return {
+        "status": "success",
+        "analysis_mode": mode,
+        "semantic_match_score": result["semantic_match_score"],
+        "verdict": result["verdict"]
+    }
@@ -180,11 +180,27 @@
 #         os.remove(path)
 
 
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-import pdfplumber, tempfile, os, re
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Query
+from models.runtime.profiling import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+import tempfile, os, re, weakref
 from functools import lru_cache
-from sentence_transformers import SentenceTransformer
+import numpy as np
+from typing import Optional
 from sklearn.metrics.pairwise import cosine_similarity
+from models.runtime.metrics import stage, timed, TEXTS_EMBEDDED
+from models.model.embeddings import MODEL_NAME
+from models.model.fidelity import encode_mode, resolve_mode
+from models.model.resume_chunks import split_chunks, chunk_vectors
+from models.model.skill_taxonomy import find_skills, skill_rows
+from models.model.jd_profile import JDProfile, mode_profile
+from models.model.jd_registry import resolve_jd
+from models.model.pdf_text import extract_text
+from models.model.resume_jb_matcher import score_resumes
+from models.runtime.cache import cached_result, lookup_result, store_result, content_hash
+from models.runtime.load_control import LoadController
+from models.runtime.streaming import STREAM_FORMATS, STREAM_HEADERS, encoder
 
 router = APIRouter(
     prefix="/semantic",
@@ -198,66 +214,66 @@ MAX_PAGES = 4
 MAX_TEXT_CHARS = 4000
 
 # ===============================
-# LOAD MODEL (LAZY + SAFE)
+# MODEL (see models.model.embeddings)
 # ===============================
-@lru_cache(maxsize=1)
-def get_model():
-    return SentenceTransformer("all-MiniLM-L6-v2")
+# Bump when gap logic changes (invalidates cached results)
+ANALYZER_VERSION = f"semantic-v4-{MODEL_NAME}"
+
+# ===============================
+# LOAD SHEDDING
+# ===============================
+# Under load (models.runtime.load_control) a request without a cached
+# result gets a cheaper analysis in the same response schema:
+#   reduced  per-probe detectors (projects / responsibilities / domain)
+#            skipped (None), skills checked on DEGRADED_MAX_CHUNKS chunks
+#   fast     reduced, with the fast encoder
+#   lexical  no embeddings: keyword score (resume_jb_matcher) + named skills
+# Degraded results are never cached; full fidelity returns on its own
+# once load drops.
+LOAD_LEVELS = ("full", "reduced", "fast", "lexical")
+DEGRADED_MAX_CHUNKS = int(os.getenv("DEGRADED_MAX_CHUNKS", "40"))
+
+SEMANTIC_LOAD = LoadController("semantic", LOAD_LEVELS)
+
+
+def load_plan(level: str, mode: str):
+    # -> (analysis mode actually used, reduced)
+    if level in ("fast", "lexical"):
+        return level, True
+    return mode, level == "reduced"
 
 # ===============================
 # HELPERS
 # ===============================
+@timed("pdf_parse")
 def extract_text_from_pdf(pdf_path: str) -> str:
-    texts = []
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages[:MAX_PAGES]:
-            t = page.extract_text()
-            if t:
-                texts.append(t)
+    text = extract_text(pdf_path, MAX_PAGES, MAX_TEXT_CHARS, analyzer="semantic")
+    return text.lower()[:MAX_TEXT_CHARS]
 
-    return "\n".join(texts).lower()[:MAX_TEXT_CHARS]
 
+def embed(text: str, mode: str = "accurate"):
+    TEXTS_EMBEDDED.inc()
+    with stage("embed"):
+        return encode_mode([text[:MAX_TEXT_CHARS]], mode)[0]
 
-def embed(text: str):
-    model = get_model()
-    return model.encode(
-        text[:MAX_TEXT_CHARS],
-        normalize_embeddings=True
-    )
+
+@lru_cache(maxsize=32)
+def probe_vector(text: str, mode: str = "accurate"):
+    # fixed probe phrases: embedded once per process (and mode)
+    return embed(text, mode)
 
 
 def similarity(vec_a, vec_b) -> float:
     return float(cosine_similarity([vec_a], [vec_b])[0][0])
 
-# ===============================
-# REQUIREMENT EXTRACTION
-# ===============================
-def extract_experience_requirement(jd: str):
-    m = re.search(r"(\d+)\+?\s+years", jd)
-    return int(m.group(1)) if m else None
-
-
-def extract_responsibility_requirements(jd: str):
-    keywords = [
-        "design", "develop", "deploy",
-        "optimize", "maintain", "collaborate",
-        "lead", "scale"
-    ]
-    return [k for k in keywords if k in jd]
-
-
-def extract_domain(jd: str):
-    domains = ["finance", "healthcare", "ecommerce", "banking", "education", "ai", "ml"]
-    for d in domains:
-        if d in jd:
-            return d
-    return None
-
 # ===============================
 # GAP DETECTORS
 # ===============================
-def detect_experience_gap(resume: str, jd: str):
-    req = extract_experience_requirement(jd)
+# JD-side requirements and probe vectors come from the JD profile
+# (models.model.jd_profile), computed once per unique JD.
+
+def detect_experience_gap(resume: str, profile: JDProfile):
+    req = profile.required_years
     if not req:
         return None
 
@@ -269,102 +285,266 @@ def detect_experience_gap(resume: str, jd: str):
     return None
 
 
-def detect_project_gap(resume_vec):
-    sim = similarity(embed("hands-on real world projects"), resume_vec)
+def detect_project_gap(resume_vec, mode: str = "accurate"):
+    sim = similarity(probe_vector("hands-on real world projects", mode), resume_vec)
     return "JD expects strong project experience" if sim < 0.55 else None
 
 
-def detect_responsibility_gap(resume_vec, jd: str):
+def detect_responsibility_gap(resume_vec, profile: JDProfile):
     gaps = []
-    for r in extract_responsibility_requirements(jd):
-        sim = similarity(embed(f"experience to {r} systems"), resume_vec)
+    for r, vec in zip(profile.responsibilities, profile.responsibility_vectors):
+        sim = similarity(vec, resume_vec)
         if sim < 0.50:
             gaps.append(f"Missing responsibility: {r}")
     return gaps or None
 
 
-def detect_domain_gap(resume_vec, jd: str):
-    domain = extract_domain(jd)
+def detect_domain_gap(resume_vec, profile: JDProfile):
+    domain = profile.domain
     if not domain:
         return None
 
-    sim = similarity(embed(f"{domain} domain experience"), resume_vec)
+    sim = similarity(profile.domain_vector, resume_vec)
     return f"No clear {domain} domain experience" if sim < 0.55 else None
 
 # ===============================
 # SKILL GAP (SEMANTIC)
 # ===============================
-SKILL_ALIASES = {
-    "rest api": ["rest api", "restful api", "apis"],
-    "react": ["react", "reactjs"],
-    "node": ["node", "nodejs"],
-    "mongodb": ["mongodb", "mongo"],
-    "express": ["express"],
-    "docker": ["docker", "container"],
-    "aws": ["aws", "ec2", "s3"]
-}
-
-
-def semantic_skill_gap(resume_text: str, resume_vec, jd: str):
-    missing = []
-    for skill, aliases in SKILL_ALIASES.items():
-        if skill in jd:
-            if any(a in resume_text for a in aliases):
-                continue
-
-            sim = similarity(embed(f"experience with {skill}"), resume_vec)
-            if sim < 0.55:
-                missing.append(skill)
-
-    return missing
+# Every JD skill found in the taxonomy is checked in one step: resume
+# chunk vectors (cached by chunk hash) x precomputed skill vectors.
+# A skill is covered if it is named in the resume, or if its best
+# matching chunk clears SKILL_MATCH_THRESHOLD.
+SKILL_MATCH_THRESHOLD = float(os.getenv("SKILL_MATCH_THRESHOLD", "0.55"))
+
+
+@timed("skill_gap")
+def semantic_skill_gap(resume_text: str, profile: JDProfile, mode: str = "accurate",
+                       max_chunks=None):
+    # -> (missing skills, evidence for every JD skill)
+    jd_skills = profile.skills
+    named = set(find_skills(resume_text))
+
+    evidence = {
+        s: {"skill": s, "matched_by": "text", "score": 1.0, "evidence": None}
+        for s in jd_skills if s in named
+    }
+    unnamed = [s for s in jd_skills if s not in named]
+
+    chunks = split_chunks(resume_text)[:max_chunks] if unnamed else []
+    if chunks:
+        vectors, _ = chunk_vectors(chunks, mode)
+        scores = np.asarray(vectors, dtype=np.float32) @ skill_rows(unnamed, mode).T
+        best = scores.argmax(axis=0)
+        for j, skill in enumerate(unnamed):
+            evidence[skill] = {
+                "skill": skill,
+                "matched_by": "semantic",
+                "score": round(float(scores[best[j], j]), 4),
+                "evidence": chunks[best[j]][2],
+            }
+    else:
+        for skill in unnamed:
+            evidence[skill] = {"skill": skill, "matched_by": None, "score": 0.0, "evidence": None}
+
+    ordered = [evidence[s] for s in jd_skills]
+    missing = [e["skill"] for e in ordered if e["score"] < SKILL_MATCH_THRESHOLD]
+    return missing, ordered
 
 # ===============================
 # MAIN ANALYSIS
 # ===============================
-def full_gap_analysis(resume: str, jd: str):
-    resume_vec = embed(resume)
-    jd_vec = embed(jd)
-
-    score = similarity(resume_vec, jd_vec) * 100
-
-    verdict = (
+def match_verdict(score: float) -> str:
+    return (
         "STRONG MATCH" if score >= 70 else
         "MODERATE MATCH" if score >= 50 else
         "WEAK MATCH"
     )
 
+
+# Yields the result in parts: score + verdict first (one embedding, the
+# JD's comes with its profile), then one part per gap detector as it
+# finishes. Callers that already hold the resume vector (incremental
+# re-analysis) pass it in -- embedded in the same mode.
+# mode: see models.model.fidelity; every mode yields the same parts.
+# reduced: see LOAD SHEDDING.
+def iter_gap_analysis(resume: str, profile: JDProfile, resume_vec=None, mode: str = "accurate",
+                      reduced: bool = False):
+    profile = mode_profile(profile, mode)
+    if resume_vec is None:
+        resume_vec = embed(resume, mode)
+
+    score = similarity(resume_vec, profile.vector) * 100
+    yield {"semantic_match_score": round(score, 2), "verdict": match_verdict(score)}
+    missing_skills, skill_evidence = semantic_skill_gap(
+        resume, profile, mode, DEGRADED_MAX_CHUNKS if reduced else None
+    )
+    yield {"missing_skills": missing_skills, "skill_evidence": skill_evidence}
+    yield {"missing_experience": detect_experience_gap(resume, profile)}
+    if reduced:
+        yield {"missing_projects": None, "missing_responsibilities": None, "missing_domain": None}
+        return
+    yield {"missing_projects": detect_project_gap(resume_vec, mode)}
+    yield {"missing_responsibilities": detect_responsibility_gap(resume_vec, profile)}
+    yield {"missing_domain": detect_domain_gap(resume_vec, profile)}
+
+
+@timed("lexical_analysis")
+def lexical_gap_analysis(resume: str, profile: JDProfile):
+    # keyword scoring (models.model.resume_jb_matcher) in this schema;
+    # skills count as covered only when named
+    score = score_resumes([resume], profile.text)[0]["ats_match_score"]
+    named = set(find_skills(resume))
+    evidence = [
+        {"skill": s, "matched_by": "text", "score": 1.0, "evidence": None} if s in named
+        else {"skill": s, "matched_by": None, "score": 0.0, "evidence": None}
+        for s in profile.skills
+    ]
     return {
-        "semantic_match_score": round(score, 2),
-        "verdict": verdict,
-        "missing_skills": semantic_skill_gap(resume, resume_vec, jd),
-        "missing_experience": detect_experience_gap(resume, jd),
-        "missing_projects": detect_project_gap(resume_vec),
-        "missing_responsibilities": detect_responsibility_gap(resume_vec, jd),
-        "missing_domain": detect_domain_gap(resume_vec, jd)
+        "semantic_match_score": score,
+        "verdict": match_verdict(score),
+        "missing_skills": [s for s in profile.skills if s not in named],
+        "skill_evidence": evidence,
+        "missing_experience": detect_experience_gap(resume, profile),
+        "missing_projects": None,
+        "missing_responsibilities": None,
+        "missing_domain": None,
     }
 
+
+def analysis_parts(resume: str, profile: JDProfile, mode: str = "accurate", reduced: bool = False):
+    if mode == "lexical":
+        return split_result(lexical_gap_analysis(resume, profile))
+    return iter_gap_analysis(resume, profile, mode=mode, reduced=reduced)
+
+
+@timed("semantic_analysis")
+def full_gap_analysis(resume: str, profile: JDProfile, mode: str = "accurate",
+                      reduced: bool = False):
+    result = {}
+    for part in analysis_parts(resume, profile, mode, reduced):
+        result.update(part)
+    return result
+
+
+def split_result(result: dict):
+    # replay a cached result in the same parts iter_gap_analysis yields
+    yield {k: result[k] for k in ("semantic_match_score", "verdict")}
+    for key, value in result.items():
+        if key not in ("semantic_match_score", "verdict"):
+            yield {key: value}
+
 # ===============================
 # API
 # ===============================
 @router.post("/full-gap-analysis")
 async def analyze(
     resume: UploadFile = File(...),
-    job_description: str = Form(...)
+    job_description: Optional[str] = Form(None),
+    jd_id: Optional[str] = Form(None),
+    mode: Optional[str] = Form(None, description="fast | balanced | accurate"),
+    stream: Optional[str] = Query(None, description="ndjson | sse")
 ):
     if not resume.filename.lower().endswith(".pdf"):
         raise HTTPException(400, "Only PDF allowed")
-
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        tmp.write(await resume.read())
-        path = tmp.name
+    if stream is not None and stream not in STREAM_FORMATS:
+        raise HTTPException(400, f"stream must be one of: {', '.join(STREAM_FORMATS)}")
+    mode = resolve_mode(mode)
+
+    profile = await run_in_threadpool(resolve_jd, job_description, jd_id)
+    data = await resume.read()
+    cache_parts = (content_hash(data), profile.jd_id)
+    if mode != "accurate":
+        cache_parts += (mode,)
+
+    def resume_text_from_upload():
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+            tmp.write(data)
+            path = tmp.name
+
+        try:
+            resume_text = extract_text_from_pdf(path)
+            if not resume_text.strip():
+                raise HTTPException(400, "Unable to extract resume text")
+            return resume_text
+
+        finally:
+            os.remove(path)
+
+    admission = SEMANTIC_LOAD.admit()
+    if stream:
+        # the response outlives this handler: events() calls done()
+        return await stream_gap_analysis(
+            stream, cache_parts, resume_text_from_upload, profile, mode, admission
+        )
+
+    with admission:
+        used, reduced = load_plan(admission.level, mode)
+
+        def compute():
+            return full_gap_analysis(resume_text_from_upload(), profile, mode)
+
+        def compute_degraded():
+            # a cached full result beats any degraded one
+            cached = lookup_result("semantic", ANALYZER_VERSION, cache_parts)
+            if cached is not None:
+                return mode, False, cached
+            return used, reduced, full_gap_analysis(resume_text_from_upload(), profile, used, reduced)
+
+        if admission.level == "full":
+            result = await run_in_threadpool(
+                cached_result, "semantic", ANALYZER_VERSION, cache_parts, compute
+            )
+        else:
+            used, reduced, result = await run_in_threadpool(compute_degraded)
+
+    return {"status": "success", "analysis_mode": used, "reduced": reduced, **result}
+
+
+async def stream_gap_analysis(fmt: str, cache_parts, get_resume_text, profile: JDProfile,
+                              mode: str = "accurate", admission=None):
+    encode = encoder(fmt)
+    admission = admission or SEMANTIC_LOAD.admit()
+    used, reduced = load_plan(admission.level, mode)
 
     try:
-        resume_text = extract_text_from_pdf(path)
-        if not resume_text.strip():
-            raise HTTPException(400, "Unable to extract resume text")
-
-        result = full_gap_analysis(resume_text, job_description.lower())
-        return {"status": "success", **result}
-
-    finally:
-        os.remove(path)
+        cached = await run_in_threadpool(lookup_result, "semantic", ANALYZER_VERSION, cache_parts)
+        if cached is not None:
+            used, reduced = mode, False
+            parts = split_result(cached)
+        else:
+            # parse before the response starts, so a bad PDF is still a 400
+            resume_text = await run_in_threadpool(get_resume_text)
+            parts = analysis_parts(resume_text, profile, used, reduced)
+    except BaseException:
+        admission.done()
+        raise
+
+    def events():
+        # sync generator -> Starlette pulls each part in the threadpool
+        result = {}
+        try:
+            for part in parts:
+                result.update(part)
+                yield encode("partial", part)
+        except Exception as e:
+            yield encode("error", {"detail": str(getattr(e, "detail", None) or repr(e))})
+            return
+        finally:
+            admission.done()
+
+        if cached is None and not reduced:
+            store_result("semantic", ANALYZER_VERSION, cache_parts, result)
+        yield encode("done", {"status": "success", "analysis_mode": used, "reduced": reduced, **result})
+
+    # the generator's finally only runs once iteration starts: a client
+    # gone before the first chunk releases via the background task, or,
+    # when the send fails and Starlette skips it, when the stream is
+    # collected (done() is idempotent)
+    stream = events()
+    weakref.finalize(stream, admission.done)
+    return StreamingResponse(
+        stream,
+        media_type=STREAM_FORMATS[fmt],
+        headers=STREAM_HEADERS,
+        background=BackgroundTask(admission.done)
+    )
@@ -0,0 +1,250 @@
+import json
+import os
+import re
+import tempfile
+from functools import lru_cache
+import numpy as np
+from models.model.fidelity import FIDELITY_MODES, MODE_TAGS, encode_mode
+from models.runtime.cache import content_hash
+from models.runtime.metrics import stage
+
+# =================================================
+# TAXONOMY
+# =================================================
+# canonical skill -> aliases matched literally (word-bounded) in the JD
+# and resume. Only the aliases are matched: a name that is also a common
+# word ("express", "security") is matched in context only ("express.js",
+# "application security"), and never via short ambiguous forms ("ts",
+# "ml", "apis"). SKILL_TAXONOMY_PATH may point to a JSON file of the
+# same shape to replace the built-in list.
+
+BUILTIN_TAXONOMY = {
+    # languages
+    "python": ["python"],
+    "java": ["java"],
+    "javascript": ["javascript", "js", "es6"],
+    "typescript": ["typescript"],
+    "c++": ["c++", "cpp"],
+    "c#": ["c#", "csharp"],
+    "golang": ["golang"],
+    "rust": ["rust"],
+    "kotlin": ["kotlin"],
+    "swift": ["swift"],
+    "scala": ["scala"],
+    "ruby": ["ruby"],
+    "php": ["php"],
+    "sql": ["sql"],
+    "bash": ["bash", "shell scripting"],
+    "html": ["html", "html5"],
+    "css": ["css", "css3"],
+    # frontend
+    "react": ["react", "reactjs", "react.js"],
+    "angular": ["angular", "angularjs"],
+    "vue": ["vue", "vuejs", "vue.js"],
+    "next.js": ["next.js", "nextjs"],
+    "redux": ["redux"],
+    "tailwind": ["tailwind", "tailwindcss"],
+    "sass": ["sass", "scss"],
+    "webpack": ["webpack"],
+    "react native": ["react native"],
+    "flutter": ["flutter"],
+    # backend
+    "node": ["node", "nodejs", "node.js"],
+    "express": ["express.js", "expressjs"],
+    "django": ["django"],
+    "flask": ["flask"],
+    "fastapi": ["fastapi"],
+    "spring boot": ["spring boot", "spring framework", "spring mvc"],
+    "asp.net": ["asp.net", ".net", "dotnet"],
+    "rails": ["rails", "ruby on rails"],
+    "laravel": ["laravel"],
+    "rest api": ["rest api", "restful api", "rest apis", "restful"],
+    "graphql": ["graphql"],
+    "grpc": ["grpc"],
+    "microservices": ["microservices", "microservice"],
+    "websockets": ["websockets", "websocket", "socket.io"],
+    # data stores
+    "mongodb": ["mongodb", "mongo"],
+    "postgresql": ["postgresql", "postgres"],
+    "mysql": ["mysql"],
+    "sqlite": ["sqlite"],
+    "redis": ["redis"],
+    "elasticsearch": ["elasticsearch", "elastic search", "opensearch"],
+    "cassandra": ["cassandra"],
+    "dynamodb": ["dynamodb"],
+    "firebase": ["firebase", "firestore"],
+    "oracle": ["oracle db", "oracle"],
+    # cloud / devops
+    "aws": ["aws", "ec2", "s3", "amazon web services"],
+    "azure": ["azure"],
+    "gcp": ["gcp", "google cloud"],
+    "docker": ["docker", "dockerfile"],
+    "kubernetes": ["kubernetes", "k8s"],
+    "terraform": ["terraform"],
+    "ansible": ["ansible"],
+    "jenkins": ["jenkins"],
+    "github actions": ["github actions"],
+    "ci/cd": ["ci/cd", "cicd", "continuous integration", "continuous delivery"],
+    "linux": ["linux", "unix"],
+    "nginx": ["nginx"],
+    "serverless": ["serverless", "aws lambda", "lambda functions"],
+    "helm": ["helm"],
+    "prometheus": ["prometheus"],
+    "grafana": ["grafana"],
+    "git": ["git", "github", "gitlab", "bitbucket"],
+    # data / ml
+    "machine learning": ["machine learning", "ml engineer", "ml models"],
+    "deep learning": ["deep learning"],
+    "nlp": ["nlp", "natural language processing"],
+    "computer vision": ["computer vision", "opencv"],
+    "llm": ["llm", "llms", "large language models"],
+    "pytorch": ["pytorch", "torch"],
+    "tensorflow": ["tensorflow", "keras"],
+    "scikit-learn": ["scikit-learn", "sklearn"],
+    "pandas": ["pandas"],
+    "numpy": ["numpy"],
+    "spark": ["spark", "pyspark"],
+    "hadoop": ["hadoop"],
+    "kafka": ["kafka"],
+    "airflow": ["airflow"],
+    "data analysis": ["data analysis", "data analytics"],
+    "data visualization": ["data visualization", "tableau", "power bi"],
+    "statistics": ["statistics", "statistical"],
+    "etl": ["etl", "data pipelines", "data pipeline"],
+    "mlops": ["mlops", "mlflow"],
+    # testing / quality
+    "unit testing": ["unit testing", "unit tests", "pytest", "junit", "jest"],
+    "test automation": ["test automation", "selenium", "cypress", "playwright"],
+    "tdd": ["tdd", "test driven development"],
+    # practices / architecture
+    "system design": ["system design", "distributed systems"],
+    "object oriented programming": ["object oriented programming", "oop"],
+    "data structures": ["data structures", "algorithms"],
+    "agile": ["agile", "scrum", "kanban"],
+    "security": [
+        "application security", "web security", "cybersecurity", "information security",
+        "owasp", "authentication", "oauth", "jwt"
+    ],
+    "performance optimization": ["performance optimization", "performance tuning", "profiling"],
+    "caching": ["caching", "cdn"],
+    "message queues": ["message queues", "rabbitmq", "sqs", "pubsub"],
+    "api design": ["api design", "openapi", "swagger"],
+    "monitoring": ["monitoring", "observability"],
+    # product / soft
+    "communication": ["communication", "stakeholder management"],
+    "leadership": ["leadership", "mentoring", "team lead"],
+    "project management": ["project management", "jira"],
+    "ui/ux": ["ui/ux", "figma", "user experience"],
+}
+
+# stack names that imply their parts ("mern developer" -> all four)
+SKILL_STACKS = {
+    "mern": ("mongodb", "express", "react", "node"),
+    "mean": ("mongodb", "express", "angular", "node"),
+    "mevn": ("mongodb", "express", "vue", "node"),
+}
+
+SKILL_TAXONOMY_PATH = os.getenv("SKILL_TAXONOMY_PATH")
+
+SKILL_PROBE_TEMPLATE = "experience with {skill}"
+
+SKILL_MATRIX_CACHE_DIR = os.getenv("SKILL_MATRIX_CACHE_DIR", tempfile.gettempdir())
+
+
+@lru_cache(maxsize=1)
+def get_taxonomy() -> dict:
+    if SKILL_TAXONOMY_PATH:
+        with open(SKILL_TAXONOMY_PATH, "r", encoding="utf-8") as f:
+            return {k.lower(): [a.lower() for a in v] for k, v in json.load(f).items()}
+    return BUILTIN_TAXONOMY
+
+
+@lru_cache(maxsize=1)
+def get_skill_index():
+    # -> (skill names, {skill: row}, alias regex, {alias: skill})
+    taxonomy = get_taxonomy()
+    skills = list(taxonomy)
+    alias_to_skill = {}
+    for skill, aliases in taxonomy.items():
+        # an entry without aliases matches its own name
+        for alias in aliases or (skill,):
+            alias_to_skill.setdefault(alias, skill)
+
+    # longest alias first, bounded so "java" doesn't match "javascript"
+    alternation = "|".join(
+        re.escape(a) for a in sorted(alias_to_skill, key=len, reverse=True)
+    )
+    pattern = re.compile(rf"(?<![\w+#.])(?:{alternation})(?![\w+#])")
+    return skills, {s: i for i, s in enumerate(skills)}, pattern, alias_to_skill
+
+
+def find_skills(text: str):
+    # taxonomy skills literally mentioned in text (lowercased), in order;
+    # stack names add their parts
+    _, index, pattern, alias_to_skill = get_skill_index()
+    found = dict.fromkeys(alias_to_skill[m] for m in pattern.findall(text))
+    for stack, parts in SKILL_STACKS.items():
+        if re.search(rf"\b{stack}\b", text):
+            found.update(dict.fromkeys(p for p in parts if p in index))
+    return list(found)
+
+
+@lru_cache(maxsize=512)
+def skill_patterns(skill: str):
+    # one regex per alias (and per stack containing the skill), each
+    # starting with its literal so re can scan for it quickly; the
+    # boundary checks come after the match. Used to test many texts for
+    # a few skills -- unlike find_skills, an alias inside a longer one
+    # ("react" in "react native") counts.
+    _, _, _, alias_to_skill = get_skill_index()
+    patterns = [
+        re.compile(rf"{re.escape(a)}(?<![\w+#.]{re.escape(a)})(?![\w+#])")
+        for a, s in alias_to_skill.items() if s == skill
+    ]
+    patterns += [
+        re.compile(rf"{stack}(?<!\w{stack})\b")
+        for stack, parts in SKILL_STACKS.items() if skill in parts
+    ]
+    return patterns
+
+
+def mentions_skill(text: str, skill: str) -> bool:
+    return any(p.search(text) for p in skill_patterns(skill))
+
+# =================================================
+# SKILL EMBEDDING MATRIX
+# =================================================
+# (n_skills, dim) float32, rows L2-normalised -- built once per taxonomy
+# + model (and fidelity mode) and kept on disk so restarts / new workers
+# skip the encode.
+
+@lru_cache(maxsize=len(FIDELITY_MODES))
+def get_skill_matrix(mode: str = "accurate") -> np.ndarray:
+    skills = get_skill_index()[0]
+    tag = content_hash(json.dumps([MODE_TAGS[mode], SKILL_PROBE_TEMPLATE, skills]))[:16]
+    path = os.path.join(SKILL_MATRIX_CACHE_DIR, f"resume_ai_skill_matrix_{tag}.npy")
+
+    try:
+        matrix = np.load(path)
+        if matrix.shape[0] == len(skills):
+            return matrix
+    except (OSError, ValueError):
+        pass
+
+    with stage("skill_matrix_build"):
+        matrix = np.asarray(
+            encode_mode([SKILL_PROBE_TEMPLATE.format(skill=s) for s in skills], mode),
+            dtype=np.float32
+        )
+    try:
+        tmp = f"{path}.{os.getpid()}.tmp.npy"
+        np.save(tmp, matrix)
+        os.replace(tmp, path)  # atomic for concurrent workers
+    except OSError:
+        pass
+    return matrix
+
+
+def skill_rows(skills, mode: str = "accurate") -> np.ndarray:
+    index = get_skill_index()[1]
+    return get_skill_matrix(mode)[[index[s] for s in skills]]
@@ -0,0 +1,147 @@
+import argparse
+import os
+import re
+import sys
+import tempfile
+from functools import lru_cache
+import numpy as np
+from scipy import sparse
+from models.model.embeddings import MODEL_NAME, get_model
+from models.runtime.metrics import stage
+
+# =================================================
+# STATIC TOKEN EMBEDDINGS ("fast")
+# =================================================
+# One vector per wordpiece of the model's vocabulary: the model's own
+# output for that piece on its own, computed once offline. A text is the
+# mean of its pieces' vectors -- no attention, just table lookups, so
+# thousands of resumes/sec per core. Scores are coarser than the
+# transformer's; meant for pre-screening.
+#
+#   python -m models.model.static_embeddings --out static.npz
+#
+# Without a prebuilt table at STATIC_EMBEDDINGS_PATH, the first fast
+# request builds it (one batched encode of the vocabulary) and saves it.
+
+STATIC_EMBEDDINGS_PATH = os.getenv(
+    "STATIC_EMBEDDINGS_PATH",
+    os.path.join(tempfile.gettempdir(), f"resume_ai_static_{MODEL_NAME}.npz")
+)
+STATIC_BUILD_BATCH = 512
+
+# per-process word -> piece ids memo; cleared when it grows past this
+STATIC_WORD_CACHE_SIZE = int(os.getenv("STATIC_WORD_CACHE_SIZE", "200000"))
+
+# BERT-style pre-tokenization: words and single punctuation marks
+WORD_REGEX = re.compile(r"\w+|[^\w\s]")
+MAX_WORD_CHARS = 100
+
+
+def build_table(model=None):
+    # -> (pieces, (n_pieces, dim) float16 table)
+    model = model or get_model()
+    vocab = model.tokenizer.get_vocab()
+    # special / unused slots ([PAD], [unused0], ...) never come out of
+    # the wordpiece split below
+    pieces = [p for p in sorted(vocab, key=vocab.get) if not (p.startswith("[") and p.endswith("]"))]
+    texts = [p[2:] if p.startswith("##") else p for p in pieces]
+    with stage("static_table_build"):
+        table = model.encode(texts, batch_size=STATIC_BUILD_BATCH, normalize_embeddings=True)
+    return pieces, np.asarray(table, dtype=np.float16)
+
+
+class StaticEncoder:
+    def __init__(self, pieces, table: np.ndarray):
+        self.index = {p: i for i, p in enumerate(pieces)}
+        self.table = np.asarray(table, dtype=np.float32)
+        self._words = {}
+
+    def piece_ids(self, word: str):
+        # greedy longest-match-first wordpiece split (as the tokenizer);
+        # a word with no split contributes nothing
+        ids = self._words.get(word)
+        if ids is not None:
+            return ids
+
+        ids, start = [], 0
+        if len(word) <= MAX_WORD_CHARS:
+            while start < len(word):
+                end = len(word)
+                while end > start:
+                    piece = word[start:end] if start == 0 else "##" + word[start:end]
+                    if piece in self.index:
+                        ids.append(self.index[piece])
+                        break
+                    end -= 1
+                if end == start:
+                    ids = []
+                    break
+                start = end
+
+        if len(self._words) >= STATIC_WORD_CACHE_SIZE:
+            self._words.clear()
+        self._words[word] = ids
+        return ids
+
+    def encode(self, texts) -> np.ndarray:
+        # -> float32 (len(texts), dim), L2-normalised (zero rows for texts
+        # without any known piece)
+        piece_ids = self.piece_ids
+        ids, indptr = [], [0]
+        for text in texts:
+            for w in WORD_REGEX.findall(text.lower()):
+                ids.extend(piece_ids(w))
+            indptr.append(len(ids))
+
+        # (texts x pieces) count matrix @ table: per-text sums without
+        # materialising a row per token (the mean's 1/n drops out in the
+        # normalisation)
+        counts = sparse.csr_matrix(
+            (np.ones(len(ids), dtype=np.float32), ids, indptr),
+            shape=(len(texts), len(self.table))
+        )
+        sums = np.asarray(counts @ self.table, dtype=np.float32)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        return sums / np.where(norms > 0, norms, 1)
+
+
+@lru_cache(maxsize=1)
+def get_static_encoder() -> StaticEncoder:
+    try:
+        data = np.load(STATIC_EMBEDDINGS_PATH, allow_pickle=False)
+        if str(data["model"]) == MODEL_NAME:
+            return StaticEncoder(list(data["pieces"]), data["table"])
+    except (OSError, KeyError, ValueError):
+        pass
+
+    pieces, table = build_table()
+    save_table(STATIC_EMBEDDINGS_PATH, pieces, table)
+    return StaticEncoder(pieces, table)
+
+
+def save_table(path: str, pieces, table):
+    try:
+        tmp = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp, model=MODEL_NAME, pieces=np.array(pieces), table=table)
+        os.replace(tmp, path)  # atomic for concurrent workers
+    except OSError:
+        pass
+
+
+def encode_texts_static(texts) -> np.ndarray:
+    return get_static_encoder().encode(texts)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the static token-embedding table")
+    parser.add_argument("--out", default=STATIC_EMBEDDINGS_PATH)
+    args = parser.parse_args(argv)
+
+    pieces, table = build_table()
+    save_table(args.out, pieces, table)
+    print(f"💾 {len(pieces)} x {table.shape[1]} table saved at: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from models.runtime.metrics import CACHE_HITS, CACHE_MISSES, stage
+
+# =================================================
+# CONFIG (ENV)
+# =================================================
+# RESULT_CACHE_BACKEND = lru (default) | sqlite | none
+#   sqlite keeps an in-process LRU in front of a SQLite file that every
+#   worker on the node shares. Read when the cache is created, not at
+#   import (see make_backend).
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "512"))
+RESULT_CACHE_PATH = os.getenv(
+    "RESULT_CACHE_PATH",
+    os.path.join(tempfile.gettempdir(), "resume_ai_results.sqlite")
+)
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "50000"))
+RESULT_CACHE_TTL = float(os.getenv("RESULT_CACHE_TTL_SECONDS", "0"))  # 0 = no expiry
+
+# Deploy identifier (e.g. git sha) -- part of every key, so a new deploy
+# never serves results computed by old code.
+BUILD_VERSION = os.getenv("BUILD_VERSION", "dev")
+
+# =================================================
+# KEYS
+# =================================================
+def content_hash(data) -> str:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_fingerprint(path: str) -> str:
+    # cheap model-version tag: changes whenever the file is replaced
+    try:
+        st = os.stat(path)
+    except OSError:
+        return "missing"
+    return content_hash(f"{os.path.abspath(path)}:{st.st_size}:{st.st_mtime_ns}")[:16]
+
+
+def cache_key(analyzer: str, version: str, parts) -> str:
+    return ":".join((analyzer, version, BUILD_VERSION, *parts))
+
+
+def _json_default(value):
+    # numpy scalars (e.g. round(np.float32)) sneak into result dicts
+    if hasattr(value, "item"):
+        return value.item()
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def to_jsonable(value):
+    return json.loads(json.dumps(value, default=_json_default))
+
+# =================================================
+# BACKENDS
+# =================================================
+class NullBackend:
+    def get(self, key):
+        return None
+
+    def set(self, key, value):
+        pass
+
+
+class LRUBackend:
+    def __init__(self, max_entries: int = RESULT_CACHE_SIZE, ttl: float = RESULT_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, created = item
+            if self.ttl and time.time() - created > self.ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.time())
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class SQLiteBackend:
+    # One connection per thread; WAL lets several worker processes read
+    # while one writes. Eviction is oldest-first, checked every
+    # PRUNE_EVERY writes.
+    PRUNE_EVERY = 200
+
+    def __init__(self, path: str = RESULT_CACHE_PATH,
+                 max_entries: int = RESULT_CACHE_MAX_ENTRIES,
+                 ttl: float = RESULT_CACHE_TTL,
+                 table: str = "results"):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.table = table
+        self._local = threading.local()
+        self._writes = 0
+        self._conn().execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+        )
+        self._conn().execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_created ON {table}(created)"
+        )
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        # re-open after fork: a sqlite handle must not cross processes
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        row = self._conn().execute(
+            f"SELECT value, created FROM {self.table} WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        if self.ttl and time.time() - row[1] > self.ttl:
+            return None
+        return json.loads(row[0])
+
+    def set(self, key, value):
+        conn = self._conn()
+        conn.execute(
+            f"INSERT OR REPLACE INTO {self.table} (key, value, created) VALUES (?, ?, ?)",
+            (key, json.dumps(value, default=_json_default), time.time())
+        )
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY == 0:
+            self.prune()
+
+    def prune(self):
+        conn = self._conn()
+        if self.ttl:
+            conn.execute(
+                f"DELETE FROM {self.table} WHERE created < ?", (time.time() - self.ttl,)
+            )
+        (count,) = conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+        if count > self.max_entries:
+            conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN ("
+                f"SELECT key FROM {self.table} ORDER BY created LIMIT ?)",
+                (count - self.max_entries,)
+            )
+
+
+class TieredBackend:
+    def __init__(self, front, back):
+        self.front = front
+        self.back = back
+
+    def get(self, key):
+        value = self.front.get(key)
+        if value is None:
+            value = self.back.get(key)
+            if value is not None:
+                self.front.set(key, value)
+        return value
+
+    def set(self, key, value):
+        self.front.set(key, value)
+        self.back.set(key, value)
+
+# =================================================
+# RESULT CACHE
+# =================================================
+def make_backend(kind: str = None):
+    # kind defaults to RESULT_CACHE_BACKEND as set now, so a process that
+    # sets it after importing this module (the bench) gets that backend
+    kind = (kind or os.getenv("RESULT_CACHE_BACKEND", "lru")).lower()
+    if kind == "none":
+        return NullBackend()
+    if kind == "lru":
+        return LRUBackend()
+    if kind == "sqlite":
+        return TieredBackend(LRUBackend(), SQLiteBackend())
+    raise ValueError(f"Unknown RESULT_CACHE_BACKEND: {kind}")
+
+
+@lru_cache(maxsize=1)
+def get_result_cache():
+    return make_backend()
+
+
+def lookup_result(analyzer: str, version: str, parts):
+    with stage("cache_lookup"):
+        value = get_result_cache().get(cache_key(analyzer, version, parts))
+    if value is not None:
+        CACHE_HITS.inc(cache=analyzer)
+    else:
+        CACHE_MISSES.inc(cache=analyzer)
+    return value
+
+
+def store_result(analyzer: str, version: str, parts, value):
+    value = to_jsonable(value)
+    get_result_cache().set(cache_key(analyzer, version, parts), value)
+    return value
+
+
+def cached_result(analyzer: str, version: str, parts, compute):
+    # parts: content hashes (resume, JD, ...); compute() runs on a miss.
+    # Exceptions (e.g. HTTPException for an unreadable PDF) are not cached.
+    value = lookup_result(analyzer, version, parts)
+    if value is not None:
+        return value
+    return store_result(analyzer, version, parts, compute())
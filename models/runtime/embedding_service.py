@@ -0,0 +1,300 @@
+import argparse
+import json
+import logging
+import os
+import queue
+import socket
+import struct
+import sys
+import threading
+import time
+import weakref
+from multiprocessing import shared_memory
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# =================================================
+# LOCAL EMBEDDING SERVICE
+# =================================================
+# One process owns the SentenceTransformer; API workers send texts over
+# a Unix socket and get the vectors back through a shared-memory buffer
+# each client thread owns (no vector bytes go over the socket). Requests
+# from all workers are batched together into one encode() call.
+#
+#   python -m models.runtime.embedding_service --socket /tmp/resume_ai_embed.sock
+#   EMBEDDING_SERVICE_SOCKET=/tmp/resume_ai_embed.sock gunicorn ...
+
+EMBEDDING_SERVICE_SOCKET = os.getenv("EMBEDDING_SERVICE_SOCKET")
+EMBEDDING_SHM_BYTES = int(os.getenv("EMBEDDING_SHM_BYTES", str(256 * 1024)))
+EMBEDDING_SERVICE_TIMEOUT = float(os.getenv("EMBEDDING_SERVICE_TIMEOUT", "30"))
+EMBEDDING_BATCH_MAX = int(os.getenv("EMBEDDING_BATCH_MAX", "64"))
+EMBEDDING_BATCH_WAIT_MS = float(os.getenv("EMBEDDING_BATCH_WAIT_MS", "5"))
+
+
+class EmbeddingServiceError(Exception):
+    pass
+
+# ---------------- FRAMING ----------------
+# 4-byte big-endian length + JSON
+
+def send_frame(sock, payload: dict):
+    data = json.dumps(payload).encode("utf-8")
+    sock.sendall(struct.pack(">I", len(data)) + data)
+
+
+def recv_frame(sock) -> dict:
+    (size,) = struct.unpack(">I", _recv_exact(sock, 4))
+    return json.loads(_recv_exact(sock, size))
+
+
+def _recv_exact(sock, n: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        buf.extend(chunk)
+    return bytes(buf)
+
+
+def _attach_shm(name: str):
+    # The client owns (and unlinks) the segment; keep the server's
+    # resource tracker from unlinking it when the server exits.
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+        return shm
+
+# =================================================
+# SERVER
+# =================================================
+class _Request:
+    __slots__ = ("texts", "normalize", "done", "vectors", "error")
+
+    def __init__(self, texts, normalize):
+        self.texts = texts
+        self.normalize = normalize
+        self.done = threading.Event()
+        self.vectors = None
+        self.error = None
+
+
+class EmbeddingServer:
+    def __init__(self, socket_path: str, model_name: str,
+                 max_batch: int = EMBEDDING_BATCH_MAX,
+                 max_wait_ms: float = EMBEDDING_BATCH_WAIT_MS):
+        from sentence_transformers import SentenceTransformer
+
+        self.socket_path = socket_path
+        self.model_name = model_name
+        self.model = SentenceTransformer(model_name)
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self.batches = 0
+        self.texts = 0
+
+    def serve_forever(self):
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.socket_path)
+        os.chmod(self.socket_path, 0o660)
+        server.listen(128)
+        threading.Thread(target=self._batch_loop, name="embed-batcher", daemon=True).start()
+        logger.info("Embedding service (%s, dim %d) on %s", self.model_name, self.dim, self.socket_path)
+
+        try:
+            while True:
+                conn, _ = server.accept()
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+        finally:
+            server.close()
+            os.remove(self.socket_path)
+
+    def _handle(self, conn):
+        shm = None
+        try:
+            hello = recv_frame(conn)
+            shm = _attach_shm(hello["shm"])
+            send_frame(conn, {"dim": self.dim, "model": self.model_name})
+
+            while True:
+                msg = recv_frame(conn)
+                req = _Request(msg["texts"], msg.get("normalize", True))
+                if len(req.texts) * self.dim * 4 > shm.size:
+                    send_frame(conn, {"error": "batch does not fit the shared buffer"})
+                    continue
+
+                self._queue.put(req)
+                req.done.wait()
+                if req.error:
+                    send_frame(conn, {"error": req.error})
+                    continue
+
+                out = np.ndarray(req.vectors.shape, dtype=np.float32, buffer=shm.buf)
+                out[:] = req.vectors
+                del out  # release the buffer export before the next close()
+                send_frame(conn, {"n": len(req.texts)})
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            if shm is not None:
+                shm.close()
+            conn.close()
+
+    def _batch_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            size = len(batch[0].texts)
+            deadline = time.monotonic() + self.max_wait
+            while size < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    req = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(req)
+                size += len(req.texts)
+
+            for normalize in (True, False):
+                group = [r for r in batch if r.normalize == normalize]
+                if group:
+                    self._encode(group, normalize)
+
+    def _encode(self, group, normalize: bool):
+        texts = [t for r in group for t in r.texts]
+        try:
+            vectors = np.asarray(
+                self.model.encode(texts, batch_size=self.max_batch,
+                                  normalize_embeddings=normalize),
+                dtype=np.float32
+            )
+        except Exception as e:
+            for r in group:
+                r.error = repr(e)
+                r.done.set()
+            return
+
+        self.batches += 1
+        self.texts += len(texts)
+        start = 0
+        for r in group:
+            r.vectors = vectors[start:start + len(r.texts)]
+            start += len(r.texts)
+            r.done.set()
+
+# =================================================
+# CLIENT
+# =================================================
+class _Session:
+    # one connection + one shared buffer per (process, thread)
+
+    def __init__(self, path: str, shm_bytes: int, timeout: float):
+        self.pid = os.getpid()
+        self.shm = shared_memory.SharedMemory(create=True, size=shm_bytes)
+        try:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.settimeout(timeout)
+            self.sock.connect(path)
+            send_frame(self.sock, {"shm": self.shm.name})
+            hello = recv_frame(self.sock)
+        except Exception:
+            self._cleanup(self.shm, getattr(self, "sock", None))
+            raise
+        self.dim = hello["dim"]
+        self.model = hello["model"]
+        self.capacity = max(1, self.shm.size // (self.dim * 4))
+        self._finalizer = weakref.finalize(self, self._cleanup, self.shm, self.sock)
+
+    @staticmethod
+    def _cleanup(shm, sock):
+        if sock is not None:
+            sock.close()
+        shm.close()
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+    def close(self):
+        self._finalizer()
+
+    def encode(self, texts, normalize: bool) -> np.ndarray:
+        send_frame(self.sock, {"texts": texts, "normalize": normalize})
+        reply = recv_frame(self.sock)
+        if "error" in reply:
+            raise EmbeddingServiceError(reply["error"])
+        view = np.ndarray((reply["n"], self.dim), dtype=np.float32, buffer=self.shm.buf)
+        # the buffer is reused by the next call from this thread
+        return view.copy()
+
+
+class EmbeddingClient:
+    def __init__(self, path: str, model_name: str,
+                 shm_bytes: int = EMBEDDING_SHM_BYTES,
+                 timeout: float = EMBEDDING_SERVICE_TIMEOUT):
+        self.path = path
+        self.model_name = model_name
+        self.shm_bytes = shm_bytes
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _session(self) -> _Session:
+        session = getattr(self._local, "session", None)
+        # never reuse a socket inherited across fork
+        if session is None or session.pid != os.getpid():
+            session = _Session(self.path, self.shm_bytes, self.timeout)
+            if session.model != self.model_name:
+                session.close()
+                raise EmbeddingServiceError(
+                    f"embedding service runs {session.model}, expected {self.model_name}"
+                )
+            self._local.session = session
+        return session
+
+    def encode(self, texts, normalize: bool = True) -> np.ndarray:
+        try:
+            session = self._session()
+            parts = [
+                session.encode(texts[i:i + session.capacity], normalize)
+                for i in range(0, len(texts), session.capacity)
+            ]
+        except (OSError, ConnectionError, ValueError) as e:
+            session = getattr(self._local, "session", None)
+            if session is not None:
+                session.close()
+                self._local.session = None
+            raise EmbeddingServiceError(f"embedding service unavailable: {e}") from e
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+# =================================================
+# CLI
+# =================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resume-AI local embedding service")
+    parser.add_argument("--socket", default=EMBEDDING_SERVICE_SOCKET or "/tmp/resume_ai_embed.sock")
+    parser.add_argument("--model", default=os.getenv("EMBEDDING_MODEL_NAME", "all-MiniLM-L6-v2"))
+    parser.add_argument("--max-batch", type=int, default=EMBEDDING_BATCH_MAX)
+    parser.add_argument("--max-wait-ms", type=float, default=EMBEDDING_BATCH_WAIT_MS)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    EmbeddingServer(args.socket, args.model, args.max_batch, args.max_wait_ms).serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
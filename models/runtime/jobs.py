@@ -0,0 +1,275 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from models.runtime.cache import to_jsonable
+from models.runtime.metrics import Counter, POOL_ACTIVE, POOL_QUEUE_DEPTH, register_collector
+
+# =================================================
+# CONFIG (ENV)
+# =================================================
+JOBS_DB_PATH = os.getenv(
+    "JOBS_DB_PATH",
+    os.path.join(tempfile.gettempdir(), "resume_ai_jobs.sqlite")
+)
+JOBS_WORKERS = int(os.getenv("JOBS_WORKERS", "2"))
+JOBS_MAX_QUEUED = int(os.getenv("JOBS_MAX_QUEUED", "64"))
+JOBS_RETENTION_SECONDS = float(os.getenv("JOBS_RETENTION_SECONDS", "3600"))
+JOBS_MAX_RETAINED = int(os.getenv("JOBS_MAX_RETAINED", "5000"))
+
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED = (
+    "queued", "running", "succeeded", "failed", "cancelled"
+)
+TERMINAL = {SUCCEEDED, FAILED, CANCELLED}
+
+JOBS_FINISHED = Counter(
+    "resume_ai_jobs_finished_total",
+    "Async analysis jobs by final status",
+    labels=("status",)
+)
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+class JobCancelled(Exception):
+    pass
+
+# =================================================
+# STORE (SQLITE)
+# =================================================
+# Shared by every worker process on the node, so a status poll or SSE
+# stream can land on any worker -- not just the one running the job.
+
+class JobStore:
+    def __init__(self, path: str = JOBS_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._conn().execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, owner TEXT NOT NULL, kind TEXT NOT NULL, "
+            "status TEXT NOT NULL, pid INTEGER, "
+            "results TEXT NOT NULL DEFAULT '{}', errors TEXT NOT NULL DEFAULT '{}', "
+            "created REAL NOT NULL, updated REAL NOT NULL)"
+        )
+        self._conn().execute("CREATE INDEX IF NOT EXISTS jobs_created ON jobs(created)")
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def create(self, owner: str, kind: str) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._conn().execute(
+            "INSERT INTO jobs (id, owner, kind, status, pid, created, updated) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (job_id, owner, kind, QUEUED, os.getpid(), now, now)
+        )
+        return job_id
+
+    def get(self, job_id: str):
+        row = self._conn().execute(
+            "SELECT id, owner, kind, status, results, errors, created, updated "
+            "FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            "job_id": row[0],
+            "owner": row[1],
+            "kind": row[2],
+            "status": row[3],
+            "results": json.loads(row[4]),
+            "errors": json.loads(row[5]),
+            "created": row[6],
+            "updated": row[7],
+        }
+
+    def status(self, job_id: str):
+        row = self._conn().execute(
+            "SELECT status FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_status(self, job_id: str, status: str, only_if_not_terminal: bool = True):
+        sql = "UPDATE jobs SET status = ?, updated = ? WHERE id = ?"
+        if only_if_not_terminal:
+            sql += " AND status NOT IN ('succeeded', 'failed', 'cancelled')"
+        cur = self._conn().execute(sql, (status, time.time(), job_id))
+        return cur.rowcount > 0
+
+    def add_result(self, job_id: str, name: str, value):
+        self._conn().execute(
+            "UPDATE jobs SET results = json_set(results, '$.' || ?, json(?)), "
+            "updated = ? WHERE id = ?",
+            (name, json.dumps(to_jsonable(value)), time.time(), job_id)
+        )
+
+    def add_error(self, job_id: str, name: str, message: str):
+        self._conn().execute(
+            "UPDATE jobs SET errors = json_set(errors, '$.' || ?, ?), "
+            "updated = ? WHERE id = ?",
+            (name, message, time.time(), job_id)
+        )
+
+    def prune(self, retention: float = JOBS_RETENTION_SECONDS, keep: int = JOBS_MAX_RETAINED):
+        conn = self._conn()
+        conn.execute(
+            "DELETE FROM jobs WHERE updated < ? AND status IN "
+            "('succeeded', 'failed', 'cancelled')",
+            (time.time() - retention,)
+        )
+        (count,) = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()
+        if count > keep:
+            conn.execute(
+                "DELETE FROM jobs WHERE id IN (SELECT id FROM jobs WHERE status IN "
+                "('succeeded', 'failed', 'cancelled') ORDER BY updated LIMIT ?)",
+                (count - keep,)
+            )
+
+    def fail_orphans(self):
+        # jobs left queued/running by a process that no longer exists
+        rows = self._conn().execute(
+            "SELECT id, pid FROM jobs WHERE status IN ('queued', 'running')"
+        ).fetchall()
+        for job_id, pid in rows:
+            if pid and not _pid_alive(pid):
+                self.add_error(job_id, "job", "Interrupted by server restart")
+                self.set_status(job_id, FAILED)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+# =================================================
+# MANAGER (LOCAL WORKER POOL)
+# =================================================
+class JobContext:
+    # Handed to the job function, which runs in a pool thread.
+
+    def __init__(self, store: JobStore, job_id: str):
+        self.store = store
+        self.job_id = job_id
+
+    def check_cancelled(self):
+        if self.store.status(self.job_id) == CANCELLED:
+            raise JobCancelled()
+
+    def report(self, name: str, value):
+        # persist one partial result (picked up by polls / SSE streams)
+        self.check_cancelled()
+        self.store.add_result(self.job_id, name, value)
+
+    def error(self, name: str, message: str):
+        self.store.add_error(self.job_id, name, message)
+
+
+class JobManager:
+    def __init__(self, store: JobStore, workers: int = JOBS_WORKERS,
+                 max_queued: int = JOBS_MAX_QUEUED):
+        self.store = store
+        self.workers = workers
+        self.max_queued = max_queued
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="jobs")
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._futures)
+
+    def submit(self, owner: str, kind: str, run) -> str:
+        # run(ctx: JobContext) does the work
+        with self._lock:
+            if len(self._futures) >= self.max_queued + self.workers:
+                raise JobQueueFull()
+
+        self.store.prune()
+        job_id = self.store.create(owner, kind)
+        future = self._pool.submit(self._execute, job_id, run)
+        with self._lock:
+            self._futures[job_id] = future
+        future.add_done_callback(lambda _: self._forget(job_id))
+        return job_id
+
+    def cancel(self, job_id: str) -> bool:
+        if not self.store.set_status(job_id, CANCELLED):
+            return False
+        JOBS_FINISHED.inc(status=CANCELLED)
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None:
+            future.cancel()  # no-op once running; the job stops at its next step
+        return True
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _forget(self, job_id: str):
+        with self._lock:
+            self._futures.pop(job_id, None)
+
+    def _execute(self, job_id: str, run):
+        store = self.store
+        try:
+            if not store.set_status(job_id, RUNNING):
+                return  # cancelled while queued
+            run(JobContext(store, job_id))
+            if store.set_status(job_id, SUCCEEDED):
+                JOBS_FINISHED.inc(status=SUCCEEDED)
+        except JobCancelled:
+            pass
+        except Exception as e:
+            store.add_error(job_id, "job", str(getattr(e, "detail", None) or repr(e)))
+            if store.set_status(job_id, FAILED):
+                JOBS_FINISHED.inc(status=FAILED)
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            store = JobStore()
+            store.fail_orphans()
+            _manager = JobManager(store)
+        return _manager
+
+
+def shutdown_job_manager():
+    global _manager
+    with _manager_lock:
+        if _manager is not None:
+            _manager.shutdown()
+            _manager = None
+
+
+@register_collector
+def _collect_jobs():
+    if _manager is None:
+        return
+    pending = _manager.pending()
+    POOL_ACTIVE.set(min(pending, _manager.workers), pool="jobs")
+    POOL_QUEUE_DEPTH.set(max(pending - _manager.workers, 0), pool="jobs")
@@ -0,0 +1,148 @@
+import os
+import threading
+import time
+from collections import deque
+import numpy as np
+from models.runtime.metrics import Counter, Gauge
+
+# =================================================
+# CONFIG (ENV)
+# =================================================
+# Level n applies once queue depth (requests in flight on the analyzer
+# in this worker, waiting or running) reaches the n-th DEGRADE_QUEUE_DEPTH
+# value, or the p95 latency of recent requests the n-th DEGRADE_P95_MS
+# value. One threshold per degraded level, ascending.
+DEGRADE_ENABLED = os.getenv("DEGRADE_ENABLED", "1") == "1"
+DEGRADE_QUEUE_DEPTH = os.getenv("DEGRADE_QUEUE_DEPTH", "8,16,32")
+DEGRADE_P95_MS = os.getenv("DEGRADE_P95_MS", "3000,6000,12000")
+
+# latency window: the last DEGRADE_WINDOW_SIZE requests younger than
+# DEGRADE_WINDOW_SECONDS; p95 is ignored below DEGRADE_MIN_SAMPLES
+DEGRADE_WINDOW_SECONDS = float(os.getenv("DEGRADE_WINDOW_SECONDS", "30"))
+DEGRADE_WINDOW_SIZE = int(os.getenv("DEGRADE_WINDOW_SIZE", "512"))
+DEGRADE_MIN_SAMPLES = int(os.getenv("DEGRADE_MIN_SAMPLES", "10"))
+
+# recovery: one level down at a time, once the level has held for
+# DEGRADE_HOLD_SECONDS and both signals are below DEGRADE_RECOVER_RATIO
+# of that level's thresholds -- no flapping at a threshold
+DEGRADE_HOLD_SECONDS = float(os.getenv("DEGRADE_HOLD_SECONDS", "10"))
+DEGRADE_RECOVER_RATIO = float(os.getenv("DEGRADE_RECOVER_RATIO", "0.7"))
+
+DEGRADATION_LEVEL = Gauge(
+    "resume_ai_degradation_level",
+    "Current load level of an analyzer (0 = full fidelity)",
+    labels=("analyzer",)
+)
+
+DEGRADED_REQUESTS = Counter(
+    "resume_ai_degraded_requests_total",
+    "Requests served below full fidelity because of load",
+    labels=("analyzer", "level")
+)
+
+
+def thresholds(value: str):
+    return tuple(float(v) for v in value.split(",") if v.strip())
+
+# =================================================
+# CONTROLLER
+# =================================================
+# One per analyzer and worker process: admit() on entry returns the
+# level the request should run at, done() on exit feeds the latency
+# window. Levels are names, cheapest last; 0 is full fidelity.
+
+class LoadController:
+    def __init__(self, analyzer: str, levels,
+                 queue_depth=DEGRADE_QUEUE_DEPTH, p95_ms=DEGRADE_P95_MS):
+        self.analyzer = analyzer
+        self.levels = tuple(levels)
+        self.queue_depth = thresholds(queue_depth)[:len(self.levels) - 1]
+        self.p95_ms = thresholds(p95_ms)[:len(self.levels) - 1]
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._latencies = deque(maxlen=DEGRADE_WINDOW_SIZE)  # (finished, seconds)
+        self._level = 0
+        self._since = time.monotonic()
+        DEGRADATION_LEVEL.set(0, analyzer=analyzer)
+
+    def p95_ms_now(self, now: float):
+        recent = [s for t, s in self._latencies if now - t <= DEGRADE_WINDOW_SECONDS]
+        if len(recent) < DEGRADE_MIN_SAMPLES:
+            return 0.0
+        return float(np.percentile(recent, 95)) * 1000
+
+    def _pressure(self, depth: int, p95: float, ratio: float = 1.0) -> int:
+        # highest level whose queue or latency threshold (x ratio) is met
+        level = 0
+        for n in range(1, len(self.levels)):
+            over_queue = n <= len(self.queue_depth) and depth >= self.queue_depth[n - 1] * ratio
+            over_p95 = n <= len(self.p95_ms) and p95 >= self.p95_ms[n - 1] * ratio
+            if over_queue or over_p95:
+                level = n
+        return level
+
+    def _update(self, now: float) -> int:
+        # caller holds the lock
+        depth, p95 = self._in_flight, self.p95_ms_now(now)
+        target = self._pressure(depth, p95)
+        if target > self._level:
+            self._level, self._since = target, now
+        elif (target < self._level
+              and now - self._since >= DEGRADE_HOLD_SECONDS
+              and self._pressure(depth, p95, DEGRADE_RECOVER_RATIO) < self._level):
+            self._level, self._since = self._level - 1, now
+        DEGRADATION_LEVEL.set(self._level, analyzer=self.analyzer)
+        return self._level
+
+    def admit(self) -> "Admission":
+        now = time.monotonic()
+        with self._lock:
+            level = self._update(now) if DEGRADE_ENABLED else 0
+            self._in_flight += 1
+        if level:
+            DEGRADED_REQUESTS.inc(analyzer=self.analyzer, level=self.levels[level])
+        return Admission(self, self.levels[level], now)
+
+    def _finish(self, start: float):
+        now = time.monotonic()
+        with self._lock:
+            self._in_flight -= 1
+            self._latencies.append((now, now - start))
+
+    def status(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            level = self._update(now) if DEGRADE_ENABLED else 0
+            return {
+                "analyzer": self.analyzer,
+                "level": self.levels[level],
+                "in_flight": self._in_flight,
+                "p95_ms": round(self.p95_ms_now(now), 1),
+                "queue_depth_thresholds": list(self.queue_depth),
+                "p95_ms_thresholds": list(self.p95_ms),
+            }
+
+
+class Admission:
+    # with controller.admit() as admission: ... admission.level
+    # (or call done() yourself when the work outlives the block, e.g. a
+    # streamed response); done() is idempotent.
+    __slots__ = ("controller", "level", "start", "_done")
+
+    def __init__(self, controller: LoadController, level: str, start: float):
+        self.controller = controller
+        self.level = level
+        self.start = start
+        self._done = False
+
+    def done(self):
+        if not self._done:
+            self._done = True
+            self.controller._finish(self.start)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.done()
+        return False
@@ -0,0 +1,245 @@
+import functools
+import threading
+import time
+from bisect import bisect_left
+
+# =================================================
+# LIGHTWEIGHT PROMETHEUS-STYLE METRICS
+# =================================================
+# No external dependency. Each metric keeps one child per label-value
+# tuple; updates are a dict lookup + a few float ops under a lock,
+# which keeps a timed stage in the low microseconds.
+
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+_lock = threading.Lock()
+_registry = []
+_collectors = []
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=None) -> str:
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._children = {}
+        _registry.append(self)
+
+    def _key(self, labels: dict):
+        if not self.label_names:
+            return ()
+        return tuple(labels.get(n, "") for n in self.label_names)
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+        with _lock:
+            items = list(self._children.items())
+        for key, value in sorted(items):
+            yield from self._render_child(key, value)
+
+    def _render_child(self, key, value):
+        yield f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with _lock:
+            self._children[key] = self._children.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with _lock:
+            self._children[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with _lock:
+            self._children[key] = self._children.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels):
+        self.observe_key(self._key(labels), value)
+
+    # hot path: caller already holds the label-value tuple
+    def observe_key(self, key: tuple, value: float):
+        idx = bisect_left(self.buckets, value)
+        with _lock:
+            child = self._children.get(key)
+            if child is None:
+                # per-bucket (non-cumulative) counts, sum, count
+                child = self._children[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            child[0][idx] += 1
+            child[1] += value
+            child[2] += 1
+
+    def snapshot(self, **labels):
+        with _lock:
+            child = self._children.get(self._key(labels))
+            return None if child is None else (list(child[0]), child[1], child[2])
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+        with _lock:
+            items = [(k, (list(c[0]), c[1], c[2])) for k, c in self._children.items()]
+        for key, (counts, total, count) in sorted(items):
+            running = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                running += n
+                labels = _format_labels(self.label_names, key, ("le", _format_value(bound)))
+                yield f"{self.name}_bucket{labels} {running}"
+            labels = _format_labels(self.label_names, key)
+            yield f"{self.name}_sum{labels} {total!r}"
+            yield f"{self.name}_count{labels} {count}"
+
+
+def register_collector(fn):
+    # fn() is called on every scrape -- used for gauges that are cheaper
+    # to read on demand (pool queue depth) than to keep updated.
+    _collectors.append(fn)
+    return fn
+
+
+def render_metrics() -> str:
+    for fn in _collectors:
+        try:
+            fn()
+        except Exception:
+            pass
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+# =================================================
+# SHARED METRICS
+# =================================================
+STAGE_SECONDS = Histogram(
+    "resume_ai_stage_seconds",
+    "Duration of one pipeline stage",
+    labels=("stage",)
+)
+
+CACHE_HITS = Counter(
+    "resume_ai_cache_hits_total",
+    "Cache lookups served from cache",
+    labels=("cache",)
+)
+
+CACHE_MISSES = Counter(
+    "resume_ai_cache_misses_total",
+    "Cache lookups that had to compute",
+    labels=("cache",)
+)
+
+PAGES_PARSED = Counter(
+    "resume_ai_pdf_pages_parsed_total",
+    "PDF pages run through pdfplumber",
+    labels=("analyzer",)
+)
+
+PAGES_SKIPPED = Counter(
+    "resume_ai_pdf_pages_skipped_total",
+    "PDF pages within MAX_PAGES left unparsed because the text budget was met",
+    labels=("analyzer",)
+)
+
+TEXTS_EMBEDDED = Counter(
+    "resume_ai_texts_embedded_total",
+    "Texts encoded by the sentence-transformer"
+)
+
+POOL_QUEUE_DEPTH = Gauge(
+    "resume_ai_pool_queue_depth",
+    "Tasks waiting for a worker in a pool",
+    labels=("pool",)
+)
+
+POOL_ACTIVE = Gauge(
+    "resume_ai_pool_active",
+    "Tasks currently running in a pool",
+    labels=("pool",)
+)
+
+# =================================================
+# STAGE TIMER
+# =================================================
+# with stage("pdf_parse"): ...
+class stage:
+    __slots__ = ("key", "start")
+
+    def __init__(self, name: str):
+        self.key = (name,)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        STAGE_SECONDS.observe_key(self.key, time.perf_counter() - self.start)
+        return False
+
+
+def timed(name: str):
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# FastAPI runs sync endpoints (auth) on anyio's worker threads
+@register_collector
+def _collect_threadpool():
+    from anyio.to_thread import current_default_thread_limiter
+
+    try:
+        stats = current_default_thread_limiter().statistics()
+    except RuntimeError:
+        return  # no event loop in this thread (e.g. scrape from a test)
+    POOL_ACTIVE.set(stats.borrowed_tokens, pool="anyio")
+    POOL_QUEUE_DEPTH.set(stats.tasks_waiting, pool="anyio")
@@ -0,0 +1,36 @@
+import gc
+import logging
+
+logger = logging.getLogger(__name__)
+
+# =================================================
+# PRELOAD (PRE-FORK)
+# =================================================
+# Called in the gunicorn master (preload_app) so the models are built
+# once and shared copy-on-write by every forked worker.
+
+def warm_models():
+    from models.model import resume_ml_score as ml
+    from models.model import embeddings
+
+    ml.get_model()
+    if embeddings.get_embedding_client() is None:
+        # first encode initialises tokenizer / torch kernels lazily;
+        # with the embedding service the model isn't loaded here at all
+        embeddings.get_model().encode("warm up", normalize_embeddings=True)
+
+    from models.model.fidelity import SEMANTIC_DEFAULT_MODE
+    from models.model.skill_taxonomy import get_skill_matrix
+    get_skill_matrix()
+    if SEMANTIC_DEFAULT_MODE != "accurate":
+        # also loads that mode's encoder
+        get_skill_matrix(SEMANTIC_DEFAULT_MODE)
+    logger.info("Models preloaded")
+
+
+def freeze_heap():
+    # Move everything allocated so far into the permanent generation:
+    # the cyclic GC then never walks (and writes to) those objects in a
+    # worker, which would otherwise copy every shared page.
+    gc.collect()
+    gc.freeze()
@@ -0,0 +1,153 @@
+import cProfile
+import contextvars
+import os
+import pstats
+import re
+import tempfile
+import threading
+import time
+
+from jose import jwt, JWTError
+from starlette.concurrency import run_in_threadpool as _run_in_threadpool
+
+# =================================================
+# CONFIG (ENV)
+# =================================================
+# PROFILE_REQUESTS=1          profile every request
+# PROFILE_ALLOWED_USERS=a,b   emails allowed to ask via the header
+# PROFILE_THRESHOLD_MS        only keep profiles slower than this
+# PROFILE_DIR / PROFILE_KEEP  where dumps go, how many are kept
+
+PROFILE_ALL = os.getenv("PROFILE_REQUESTS", "0") == "1"
+PROFILE_HEADER = "x-profile-request"
+ALLOWED_USERS = {
+    u.strip().lower()
+    for u in os.getenv("PROFILE_ALLOWED_USERS", "").split(",")
+    if u.strip()
+}
+THRESHOLD_MS = float(os.getenv("PROFILE_THRESHOLD_MS", "1000"))
+PROFILE_DIR = os.getenv(
+    "PROFILE_DIR",
+    os.path.join(tempfile.gettempdir(), "resume_ai_profiles")
+)
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "50"))
+
+SAFE_NAME = re.compile(r"[^a-zA-Z0-9_-]+")
+
+# Profile one request at a time and let the others through unprofiled
+# (bounded overhead; on 3.12+ only one cProfile can be active at once).
+_busy = threading.Lock()
+
+# =================================================
+# HELPERS
+# =================================================
+def _header_user(request, secret_key: str, algorithm: str):
+    auth = request.headers.get("authorization", "")
+    if not auth.lower().startswith("bearer "):
+        return None
+    try:
+        payload = jwt.decode(auth[7:], secret_key, algorithms=[algorithm])
+    except JWTError:
+        return None
+    return (payload.get("sub") or "").lower() or None
+
+
+def wants_profile(request, secret_key: str, algorithm: str) -> bool:
+    if PROFILE_ALL:
+        return True
+    if request.headers.get(PROFILE_HEADER) != "1" or not ALLOWED_USERS:
+        return False
+    return _header_user(request, secret_key, algorithm) in ALLOWED_USERS
+
+
+def _prune(directory: str, keep: int):
+    dumps = sorted(
+        (e for e in os.scandir(directory) if e.name.endswith(".pstats")),
+        key=lambda e: e.stat().st_mtime
+    )
+    for entry in dumps[:max(len(dumps) - keep, 0)]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def dump_profile(profilers, method: str, path: str, elapsed_ms: float) -> str:
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    name = "{}-{}-{}-{}ms.pstats".format(
+        time.strftime("%Y%m%dT%H%M%S"),
+        method.lower(),
+        SAFE_NAME.sub("_", path.strip("/")) or "root",
+        int(elapsed_ms)
+    )
+    stats = pstats.Stats(profilers[0])
+    for profiler in profilers[1:]:
+        stats.add(profiler)
+    stats.dump_stats(os.path.join(PROFILE_DIR, name))
+    _prune(PROFILE_DIR, PROFILE_KEEP)
+    return name
+
+# =================================================
+# THREADPOOL HOOK
+# =================================================
+# The analyzers run in the threadpool, not on the event loop, so that is
+# where a profiled request is profiled: each call made through this
+# run_in_threadpool gets its own profiler in the worker thread, and the
+# request's dump merges them. Handler code on the event loop is not
+# profiled (a loop-side profiler would also record every other request
+# interleaved on the loop), nor are sync generators Starlette iterates
+# for a StreamingResponse, nor background job threads.
+
+_request_profilers = contextvars.ContextVar("request_profilers", default=None)
+
+
+async def run_in_threadpool(func, *args, **kwargs):
+    # drop-in for fastapi.concurrency.run_in_threadpool
+    profilers = _request_profilers.get()
+    if profilers is None:
+        return await _run_in_threadpool(func, *args, **kwargs)
+    return await _run_in_threadpool(_profiled_call, profilers, func, *args, **kwargs)
+
+
+def _profiled_call(profilers, func, *args, **kwargs):
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # another profiler is active in this process (one at a time on 3.12+)
+        return func(*args, **kwargs)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        profiler.disable()
+        profilers.append(profiler)
+
+# =================================================
+# MIDDLEWARE
+# =================================================
+def install_profiler(app, secret_key: str, algorithm: str):
+    # Dumps land in PROFILE_DIR; inspect with
+    #   python -m pstats <file>   or   snakeviz <file>
+    @app.middleware("http")
+    async def profile_slow_requests(request, call_next):
+        if not wants_profile(request, secret_key, algorithm):
+            return await call_next(request)
+        if not _busy.acquire(blocking=False):
+            return await call_next(request)
+
+        profilers = []
+        token = _request_profilers.set(profilers)
+        start = time.perf_counter()
+        try:
+            # the handler's task copies this context -> run_in_threadpool sees it
+            response = await call_next(request)
+        finally:
+            _request_profilers.reset(token)
+            _busy.release()
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if elapsed_ms >= THRESHOLD_MS and profilers:
+            response.headers["X-Profile-Id"] = dump_profile(
+                profilers, request.method, request.url.path, elapsed_ms
+            )
+        return response
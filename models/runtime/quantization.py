@@ -0,0 +1,152 @@
+import base64
+import os
+import numpy as np
+
+# =================================================
+# CONFIG (ENV)
+# =================================================
+# How embeddings are stored in the chunk store:
+#   float32  4 bytes / dim (exact)
+#   float16  2 bytes / dim (score error ~1e-4)
+#   int8     1 byte / dim + one float32 scale per vector (error ~1e-3)
+# Searches (match matrix, candidate ranking) score the stored codes
+# as-is: with int8, about 1 in 12 of a top-10 differs from float32's
+# (models/bench/quantization.py); float16 ranks like float32.
+VECTOR_FORMATS = ("float32", "float16", "int8")
+VECTOR_STORAGE = os.getenv("VECTOR_STORAGE", "float16")
+if VECTOR_STORAGE not in VECTOR_FORMATS:
+    raise ValueError(f"VECTOR_STORAGE must be one of: {', '.join(VECTOR_FORMATS)}")
+
+# rows scored per step when searching quantized rows: bounds the
+# float32 working copy to QUANTIZED_TILE_ROWS x dim
+QUANTIZED_TILE_ROWS = int(os.getenv("QUANTIZED_TILE_ROWS", "8192"))
+
+# =================================================
+# SCALAR QUANTIZATION
+# =================================================
+# int8: per-row scale = max |v| / 127, code = round(v / scale).
+# Rows come from encode_texts (L2-normalised), so a dot product of the
+# dequantized rows with a float32 query is the cosine, off by the
+# rounding error only.
+
+def quantize(vectors: np.ndarray, fmt: str = VECTOR_STORAGE):
+    # (n, dim) float32 -> (codes, per-row scales or None)
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if fmt == "float32":
+        return vectors, None
+    if fmt == "float16":
+        return vectors.astype(np.float16), None
+
+    peak = np.abs(vectors).max(axis=-1, keepdims=True)
+    scales = np.where(peak > 0, peak / 127.0, 1.0).astype(np.float32)
+    codes = np.clip(np.rint(vectors / scales), -127, 127).astype(np.int8)
+    return codes, scales[..., 0]
+
+
+def dequantize(codes: np.ndarray, scales=None) -> np.ndarray:
+    vectors = codes.astype(np.float32)
+    if scales is not None:
+        vectors *= np.asarray(scales, dtype=np.float32)[..., None]
+    return vectors
+
+# =================================================
+# STORAGE FORMAT
+# =================================================
+# One JSON-able value per vector ({"f": format, "s": scale, "b": base64
+# bytes}) -- a 384-dim vector is ~0.7 KB as float16 and ~0.5 KB as int8,
+# against ~8 KB as a JSON list of floats. Values carry their format, so
+# entries written under another VECTOR_STORAGE (or older plain lists)
+# still read back.
+
+def pack(vector, fmt: str = VECTOR_STORAGE) -> dict:
+    codes, scales = quantize(np.asarray(vector, dtype=np.float32)[None], fmt)
+    value = {"f": fmt, "b": base64.b64encode(codes.tobytes()).decode("ascii")}
+    if scales is not None:
+        value["s"] = float(scales[0])
+    return value
+
+
+def unpack(value) -> np.ndarray:
+    if isinstance(value, list):
+        return np.asarray(value, dtype=np.float32)
+    codes = np.frombuffer(base64.b64decode(value["b"]), dtype=value["f"])
+    return dequantize(codes[None], [value["s"]] if "s" in value else None)[0]
+
+
+def unpack_rows(values) -> np.ndarray:
+    # -> (n, dim) float32
+    if not values:
+        return np.empty((0, 0), dtype=np.float32)
+    return np.stack([unpack(v) for v in values])
+
+# =================================================
+# QUANTIZED SEARCH
+# =================================================
+class QuantizedMatrix:
+    # Rows kept quantized in RAM; scores are computed tile by tile
+    # straight from the codes. top_k can re-score a shortlist exactly
+    # with float32 rows from exact_rows(indices).
+
+    def __init__(self, vectors: np.ndarray, fmt: str = "int8"):
+        self.fmt = fmt
+        self.codes, self.scales = quantize(vectors, fmt)
+
+    @classmethod
+    def from_packed(cls, values) -> "QuantizedMatrix":
+        # stored values (pack()) -> matrix over their codes as stored, no
+        # float32 copy. Mixed formats (old lists, entries written under
+        # another VECTOR_STORAGE) are re-quantized to VECTOR_STORAGE.
+        formats = {v["f"] if isinstance(v, dict) else None for v in values}
+        if len(formats) != 1 or None in formats:
+            return cls(unpack_rows(values), VECTOR_STORAGE)
+
+        matrix = cls.__new__(cls)
+        matrix.fmt = formats.pop()
+        matrix.codes = np.stack([
+            np.frombuffer(base64.b64decode(v["b"]), dtype=matrix.fmt) for v in values
+        ])
+        matrix.scales = (
+            np.array([v["s"] for v in values], dtype=np.float32) if "s" in values[0] else None
+        )
+        return matrix
+
+    def __len__(self):
+        return len(self.codes)
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def rows(self, indices) -> np.ndarray:
+        # -> the rows dequantized to float32
+        return dequantize(
+            self.codes[indices], None if self.scales is None else self.scales[indices]
+        )
+
+    def scores(self, queries: np.ndarray, start: int = 0, stop=None) -> np.ndarray:
+        # queries (q, dim) float32 -> (stop - start, q) for rows start:stop
+        queries = np.asarray(queries, dtype=np.float32)
+        stop = len(self.codes) if stop is None else min(stop, len(self.codes))
+        out = np.empty((max(stop - start, 0), len(queries)), dtype=np.float32)
+        for lo in range(start, stop, QUANTIZED_TILE_ROWS):
+            hi = min(lo + QUANTIZED_TILE_ROWS, stop)
+            scores = self.codes[lo:hi].astype(np.float32) @ queries.T
+            if self.scales is not None:
+                scores *= self.scales[lo:hi, None]
+            out[lo - start:hi - start] = scores
+        return out
+
+    def top_k(self, query: np.ndarray, k: int, exact_rows=None, shortlist: int = 0):
+        # -> (row indices, scores) best first. With exact_rows, the best
+        # max(k, shortlist) rows by quantized score are re-scored in float32.
+        scores = self.scores(np.asarray(query, dtype=np.float32)[None])[:, 0]
+        n = min(max(k, shortlist) if exact_rows is not None else k, len(scores))
+        if not n:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        best = np.argpartition(-scores, n - 1)[:n]
+        if exact_rows is not None:
+            scores = np.zeros(len(scores), dtype=np.float32)
+            scores[best] = np.asarray(exact_rows(best), dtype=np.float32) @ query
+        best = best[np.argsort(-scores[best])][:k]
+        return best, scores[best]
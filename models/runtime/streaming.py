@@ -0,0 +1,29 @@
+import json
+
+from models.runtime.cache import _json_default
+
+# =================================================
+# WIRE FORMATS
+# =================================================
+# ndjson: one JSON object per line, {"event": ..., "data": ...}
+# sse:    text/event-stream ("event: ...\ndata: ...\n\n")
+
+STREAM_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+
+# keep proxies (nginx) from buffering the whole response
+STREAM_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=_json_default)}\n\n"
+
+
+def ndjson_event(event: str, data) -> str:
+    return json.dumps({"event": event, "data": data}, default=_json_default) + "\n"
+
+
+def encoder(fmt: str):
+    return sse_event if fmt == "sse" else ndjson_event
@@ -0,0 +1,147 @@
+import os
+import sys
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+
+# Stdlib-only at import time: configure_env() has to run before numpy,
+# torch or sklearn are first imported.
+
+# =================================================
+# CONFIG (ENV)
+# =================================================
+# WEB_CONCURRENCY     worker processes on this box (gunicorn/uvicorn)
+# THREADS_PER_WORKER  override the per-worker share of the cores
+# TORCH_THREADS / BLAS_THREADS / ML_N_JOBS  per-library overrides
+
+BLAS_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+
+def available_cores() -> int:
+    # respects taskset / cgroup cpusets, unlike os.cpu_count()
+    try:
+        return len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        return os.cpu_count() or 1
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+# =================================================
+# BUDGET
+# =================================================
+@dataclass(frozen=True)
+class ThreadBudget:
+    cores: int
+    workers: int
+    per_worker: int
+    torch_threads: int
+    torch_interop_threads: int
+    blas_threads: int
+    ml_n_jobs: int
+
+
+@lru_cache(maxsize=1)
+def get_budget() -> ThreadBudget:
+    cores = available_cores()
+    workers = max(1, _env_int("WEB_CONCURRENCY", 1))
+    per_worker = max(1, _env_int("THREADS_PER_WORKER", cores // workers))
+
+    return ThreadBudget(
+        cores=cores,
+        workers=workers,
+        per_worker=per_worker,
+        torch_threads=_env_int("TORCH_THREADS", per_worker),
+        # requests are already concurrent across the anyio threadpool
+        torch_interop_threads=_env_int("TORCH_INTEROP_THREADS", 1),
+        blas_threads=_env_int("BLAS_THREADS", per_worker),
+        # single-row predicts: joblib dispatch costs more than it saves
+        ml_n_jobs=_env_int("ML_N_JOBS", 1),
+    )
+
+
+def configure_env(budget: ThreadBudget = None):
+    # OpenMP / BLAS read these once, when their library is loaded.
+    # Explicitly set variables are left alone.
+    budget = budget or get_budget()
+    for var in BLAS_ENV_VARS:
+        os.environ.setdefault(var, str(budget.blas_threads))
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+# =================================================
+# RUNTIME (PER WORKER)
+# =================================================
+def set_torch_threads(n: int, interop: int = None):
+    if "torch" not in sys.modules:
+        try:
+            import torch  # noqa: F401
+        except ImportError:
+            return
+    torch = sys.modules["torch"]
+    torch.set_num_threads(n)
+    if interop is not None:
+        try:
+            torch.set_num_interop_threads(interop)
+        except RuntimeError:
+            pass  # only settable before the first inter-op parallel work
+
+
+def apply_budget(budget: ThreadBudget = None):
+    # Call once per worker process (after fork): the env vars only cover
+    # pools not yet created, this also resizes the live ones.
+    budget = budget or get_budget()
+    set_torch_threads(budget.torch_threads, budget.torch_interop_threads)
+
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return
+    threadpool_limits(limits=budget.blas_threads, user_api="blas")
+    threadpool_limits(limits=budget.blas_threads, user_api="openmp")
+
+# =================================================
+# DIAGNOSTICS
+# =================================================
+def effective_settings() -> dict:
+    budget = get_budget()
+    settings = {
+        "pid": os.getpid(),
+        "budget": asdict(budget),
+        "env": {v: os.getenv(v) for v in BLAS_ENV_VARS},
+    }
+
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        settings["torch"] = {
+            "num_threads": torch.get_num_threads(),
+            "num_interop_threads": torch.get_num_interop_threads(),
+        }
+
+    try:
+        from threadpoolctl import threadpool_info
+    except ImportError:
+        threadpool_info = None
+    if threadpool_info is not None:
+        settings["threadpools"] = [
+            {
+                "user_api": p.get("user_api"),
+                "internal_api": p.get("internal_api"),
+                "num_threads": p.get("num_threads"),
+                "library": os.path.basename(p.get("filepath", "")),
+            }
+            for p in threadpool_info()
+        ]
+
+    # only report the forest if it is already loaded (don't load it here)
+    ml = sys.modules.get("models.model.resume_ml_score")
+    if ml is not None and ml.get_model.cache_info().currsize:
+        settings["ml_model_n_jobs"] = getattr(ml.get_model(), "n_jobs", None)
+
+    return settings
@@ -0,0 +1,60 @@
+import asyncio
+import gc
+import uuid
+
+import pytest
+from starlette.requests import ClientDisconnect
+
+from models.model import semantic_resume_jb_matcher as semantic
+from models.runtime.load_control import LoadController
+
+# Run from the repo root: python -m pytest models/tests
+
+
+@pytest.fixture
+def controller(monkeypatch):
+    controller = LoadController("test", semantic.LOAD_LEVELS)
+    monkeypatch.setattr(semantic, "SEMANTIC_LOAD", controller)
+    return controller
+
+
+def dropped_stream(spec_version: str):
+    # admit a streamed analysis, then lose the client before the first
+    # chunk: the response never pulls from the analysis generator
+    async def run():
+        response = await semantic.stream_gap_analysis(
+            "sse", ("test", uuid.uuid4().hex), lambda: "python developer", None
+        )
+        assert semantic.SEMANTIC_LOAD._in_flight == 1
+
+        async def receive():
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if spec_version == "2.4":
+                raise OSError("connection reset")
+            await asyncio.sleep(1)  # the disconnect wins
+
+        scope = {"type": "http", "asgi": {"spec_version": spec_version}}
+        try:
+            await response(scope, receive, send)
+        except ClientDisconnect:
+            pass
+
+    asyncio.run(run())
+    gc.collect()
+
+
+@pytest.mark.parametrize("spec_version", ["2.0", "2.4"])
+def test_stream_dropped_before_iteration_releases_admission(controller, spec_version):
+    dropped_stream(spec_version)
+    assert controller._in_flight == 0
+    assert controller.status()["in_flight"] == 0
+
+
+def test_admission_done_is_idempotent(controller):
+    admission = controller.admit()
+    admission.done()
+    admission.done()
+    assert controller._in_flight == 0
+    assert len(controller._latencies) == 1
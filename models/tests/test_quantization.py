@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from models.model.match_matrix import top_matches
+from models.runtime.quantization import QuantizedMatrix, pack
+
+# Run from the repo root: python -m pytest models/tests
+
+
+def unit_rows(n, dim, seed):
+    rows = np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+    return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+
+@pytest.mark.parametrize("fmt", ["float32", "float16", "int8"])
+def test_from_packed_keeps_stored_codes(fmt):
+    rows = unit_rows(20, 32, 0)
+    matrix = QuantizedMatrix.from_packed([pack(v, fmt) for v in rows])
+    assert matrix.codes.dtype == np.dtype(fmt)
+    assert np.allclose(matrix.rows(np.arange(20)), QuantizedMatrix(rows, fmt).rows(np.arange(20)))
+
+
+@pytest.mark.parametrize("fmt", ["float16", "int8"])
+def test_top_matches_equals_dense_search(fmt):
+    # tiled scan over the stored codes == top-n of the dense
+    # float32 matrix of the same (dequantized) rows
+    resumes = QuantizedMatrix.from_packed([pack(v, fmt) for v in unit_rows(300, 64, 1)])
+    jds = unit_rows(30, 64, 2)
+    per_resume, per_jd, _ = top_matches(resumes, jds, 5, tile=64)
+
+    dense = resumes.rows(np.arange(len(resumes))) @ jds.T
+    for i, top in enumerate(per_resume):
+        assert [j for j, _ in top] == list(np.argsort(-dense[i])[:5])
+        assert np.allclose([s for _, s in top], np.sort(dense[i])[::-1][:5], atol=1e-6)
+    for j, top in enumerate(per_jd):
+        assert [i for i, _ in top] == list(np.argsort(-dense[:, j])[:5])
@@ -0,0 +1,28 @@
+import pytest
+
+from models.bench.ats_bulk import resume_texts
+from models.model.resume_chunks import split_chunks
+from models.model.resume_features import extract_features
+from models.model.resume_incremental import chunk_features, combine_features, text_features
+
+# Run from the repo root: python -m pytest models/tests
+
+
+def chunked_features(text):
+    rows = [chunk_features(chunk) for _, _, chunk in split_chunks(text)]
+    return combine_features(rows, text_features(text))
+
+
+@pytest.mark.parametrize("text", [
+    "Experience\nSoftware engineer with 5\nyears of python. Worked  on APIs.",
+    "Skills\nMachine  learning, Machine\nlearning, REST apis.\n• Responsible\nfor docker",
+    "Projects\n- Project one: react + node.   - project two!  Helped with SQL\n\n12 months",
+    "",
+])
+def test_chunked_features_match_extract_features(text):
+    assert chunked_features(text) == extract_features(text)
+
+
+def test_chunked_features_match_on_corpus():
+    for text in resume_texts(50):
+        assert chunked_features(text) == extract_features(text)
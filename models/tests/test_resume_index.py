@@ -0,0 +1,31 @@
+import pytest
+
+from models.model import resume_index
+
+# Run from the repo root: python -m pytest models/tests
+
+YEARS = (0, 3, 14, 15, 18, 25)
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    index = resume_index.ResumeIndex(str(tmp_path / "index.sqlite"))
+    monkeypatch.setattr(resume_index, "get_resume_index", lambda: index)
+    index.add("u1", [
+        (f"h{y}", f"{y}.pdf", f"python developer with {y} years of experience") for y in YEARS
+    ])
+    return index
+
+
+def years_found(index, min_years, max_years):
+    ids, _ = resume_index.search("u1", [], [], min_years, max_years)
+    return sorted(d["years"] for d in index.documents("u1", [int(i) for i in ids]))
+
+
+@pytest.mark.parametrize("min_years,max_years", [
+    (3, None), (15, None), (16, None), (20, None), (30, None),
+    (None, 14), (None, 15), (None, 20), (3, 15), (14, 18), (16, 24), (18, 18),
+])
+def test_year_bounds_are_exact(index, min_years, max_years):
+    low, high = min_years or 0, max_years if max_years is not None else 10 ** 6
+    assert years_found(index, min_years, max_years) == [y for y in YEARS if low <= y <= high]
@@ -0,0 +1,129 @@
+import re
+
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from models.bench.ats_bulk import resume_texts
+from models.bench.corpus import generate_jd
+from models.model.resume_jb_matcher import score_resumes
+
+# Run from the repo root: python -m pytest models/tests
+
+# =================================================
+# LEGACY SCORER (the per-request scorer score_resumes replaced, minus
+# the PDF step)
+# =================================================
+STOPWORDS = {
+    "the","is","are","a","an","and","or","to","of","in","for",
+    "on","with","as","by","at","from","this","that","it"
+}
+SKILL_VOCAB = {
+    "react","javascript","node","nodejs","express",
+    "mongodb","python","machine learning","sql",
+    "html","css","angular"
+}
+STACK_MAP = {
+    "mern": {"mongodb","express","react","node"},
+    "mean": {"mongodb","express","angular","node"},
+    "frontend": {"react","javascript","html","css"},
+    "backend": {"node","express"},
+    "data science": {"python","machine learning"}
+}
+NON_ALPHA = re.compile(r"[^a-z0-9\s]")
+MULTI_SPACE = re.compile(r"\s+")
+
+
+def legacy_clean_text(text):
+    text = text.lower()
+    text = NON_ALPHA.sub(" ", text)
+    text = MULTI_SPACE.sub(" ", text)
+    return " ".join(w for w in text.split() if w not in STOPWORDS)
+
+
+def legacy_sections(text):
+    sections = {"skills": "", "projects": "", "experience": ""}
+    current = None
+    for word in text.split():
+        if word in {"skills","technical"}:
+            current = "skills"
+        elif word in {"projects","project"}:
+            current = "projects"
+        elif word in {"experience","internship"}:
+            current = "experience"
+        if current:
+            sections[current] += word + " "
+    return sections
+
+
+def legacy_skills(text):
+    skills = {s for s in SKILL_VOCAB if s in text}
+    for stack, expanded in STACK_MAP.items():
+        if stack in text:
+            skills.update(expanded)
+    return skills
+
+
+def legacy_project_score(project_text, jd_skills):
+    if not project_text or not jd_skills:
+        return 0.0
+    coverage = len({s for s in jd_skills if s in project_text}) / len(jd_skills)
+    bonus = 0.0
+    if project_text.count("project") >= 2:
+        bonus += 0.1
+    if any(k in project_text for k in ("api","socket","database","auth")):
+        bonus += 0.1
+    return min(1.0, coverage + bonus)
+
+
+def legacy_similarity(a, b):
+    if not a or not b:
+        return 0.0
+    vectors = TfidfVectorizer(max_features=500, ngram_range=(1, 2)).fit_transform([a, b])
+    return cosine_similarity(vectors[0], vectors[1])[0][0]
+
+
+def legacy_score(raw_resume, job_description):
+    resume_text = legacy_clean_text(raw_resume)
+    jd_text = legacy_clean_text(job_description)
+    sections = legacy_sections(resume_text)
+    resume_skills = legacy_skills(resume_text)
+    jd_skills = legacy_skills(jd_text)
+
+    skill = len(resume_skills & jd_skills) / len(jd_skills) if jd_skills else 0.0
+    project = legacy_project_score(sections["projects"], jd_skills)
+    experience = legacy_similarity(sections["experience"], jd_text)
+    return {
+        "skill_match_percent": round(skill * 100, 2),
+        "project_relevance": round(project * 100, 2),
+        "experience_relevance": round(experience * 100, 2),
+        "ats_match_score": round((0.5 * skill + 0.3 * project + 0.2 * experience) * 100, 2),
+        "missing_skills": sorted(jd_skills - resume_skills),
+    }
+
+# =================================================
+# TESTS
+# =================================================
+RESUMES = resume_texts(40)
+JDS = {
+    "short": generate_jd(0),
+    # long enough that (experience, JD) pairs exceed the 500-term cap
+    "long": " ".join(generate_jd(k) for k in range(40)),
+}
+
+
+@pytest.mark.parametrize("jd", JDS.values(), ids=JDS.keys())
+def test_bulk_scores_equal_single_resume_scores(jd):
+    bulk = score_resumes(RESUMES, jd)
+    for i, text in enumerate(RESUMES):
+        assert bulk[i] == score_resumes([text], jd)[0]
+
+
+@pytest.mark.parametrize("jd", JDS.values(), ids=JDS.keys())
+def test_scores_match_legacy_scorer(jd):
+    for text, result in zip(RESUMES, score_resumes(RESUMES, jd)):
+        expected = legacy_score(text, jd)
+        for key in ("skill_match_percent", "project_relevance",
+                    "experience_relevance", "ats_match_score"):
+            assert result[key] == pytest.approx(expected[key], abs=0.01), key
+        assert sorted(result["missing_skills"]) == expected["missing_skills"]
@@ -38,13 +38,49 @@ api.interceptors.response.use(
   }
 );
 
+/* =====================================================
+   📋 JOB DESCRIPTION REGISTRY
+   Register a JD once, then pass { jdId } instead of the
+   JD text to any analysis below.
+===================================================== */
+const appendJobDescription = (formData, jobDescription) => {
+  if (jobDescription && jobDescription.jdId) {
+    formData.append('jd_id', jobDescription.jdId);
+  } else {
+    formData.append('job_description', jobDescription);
+  }
+};
+
+export const registerJobDescription = async (jobDescription, title) => {
+  const formData = new FormData();
+  formData.append('job_description', jobDescription);
+  if (title) {
+    formData.append('title', title);
+  }
+
+  const response = await api.post('/jd', formData);
+  return response.data; // { jd_id, title, skills, ... }
+};
+
+export const listJobDescriptions = async () => {
+  const response = await api.get('/jd');
+  return response.data.job_descriptions;
+};
+
+export const deleteJobDescription = async (jdId) => {
+  const response = await api.delete(`/jd/${jdId}`);
+  return response.data;
+};
+
 /* =====================================================
    🧠 SEMANTIC MATCH
 ===================================================== */
-export const getSemanticMatch = async (resume, jobDescription) => {
+// mode: 'fast' | 'balanced' | 'accurate' (omit for the server default)
+export const getSemanticMatch = async (resume, jobDescription, mode) => {
   const formData = new FormData();
   formData.append('resume', resume);
-  formData.append('job_description', jobDescription);
+  appendJobDescription(formData, jobDescription);
+  if (mode) formData.append('mode', mode);
 
   const response = await api.post(
     '/semantic/full-gap-analysis',
@@ -53,6 +89,17 @@ export const getSemanticMatch = async (resume, jobDescription) => {
   return response.data;
 };
 
+// score + verdict only, no gap analysis
+export const getSemanticScore = async (resume, jobDescription, mode) => {
+  const formData = new FormData();
+  formData.append('resume', resume);
+  appendJobDescription(formData, jobDescription);
+  if (mode) formData.append('mode', mode);
+
+  const response = await api.post('/semantic-match', formData);
+  return response.data;
+};
+
 /* =====================================================
    📊 RESUME QUALITY SCORE
 ===================================================== */
@@ -73,7 +120,7 @@ export const getResumeQuality = async (resume) => {
 export const getImprovementSuggestions = async (resume, jobDescription) => {
   const formData = new FormData();
   formData.append('resume', resume);
-  formData.append('job_description', jobDescription);
+  appendJobDescription(formData, jobDescription);
 
   const response = await api.post(
     '/improvement/suggestions',
@@ -82,6 +129,51 @@ export const getImprovementSuggestions = async (resume, jobDescription) => {
   return response.data;
 };
 
+/* =====================================================
+   🔑 KEYWORD ATS MATCH
+   Bulk: every resume scored against one JD in one call,
+   results carry filename + rank.
+===================================================== */
+export const getKeywordMatch = async (resume, jobDescription) => {
+  const formData = new FormData();
+  formData.append('resume', resume);
+  appendJobDescription(formData, jobDescription);
+
+  const response = await api.post('/ats/match-resume', formData);
+  return response.data;
+};
+
+export const getBulkKeywordMatch = async (resumes, jobDescription) => {
+  const formData = new FormData();
+  resumes.forEach((resume) => formData.append('resumes', resume));
+  appendJobDescription(formData, jobDescription);
+
+  const response = await api.post('/ats/bulk-match', formData);
+  return response.data; // { skipped_resumes, results }
+};
+
+/* =====================================================
+   🔎 RESUME SEARCH
+   Over every resume you've analyzed, e.g.
+   searchResumes({ q: 'docker AND aws AND 3+ years' })
+   or { skills: ['docker', 'aws'], minYears: 3, page: 2 }
+===================================================== */
+export const searchResumes = async ({ q, skills, anySkills, exclude, minYears, maxYears, page, pageSize } = {}) => {
+  const params = {
+    q,
+    skills: skills?.join(','),
+    any_skills: anySkills?.join(','),
+    exclude: exclude?.join(','),
+    min_years: minYears,
+    max_years: maxYears,
+    page,
+    page_size: pageSize,
+  };
+
+  const response = await api.get('/resume-index/search', { params });
+  return response.data; // { total, page, results, unknown_terms }
+};
+
 /* =====================================================
    🤖 ML SCORE
 ===================================================== */
@@ -96,4 +188,93 @@ export const getMLScore = async (resume) => {
   return response.data;
 };
 
+/* =====================================================
+   ⏳ ASYNC ANALYSIS JOBS
+   Submit once, then poll or stream partial results
+===================================================== */
+export const submitAnalysisJob = async (resume, jobDescription, analyzers) => {
+  const formData = new FormData();
+  formData.append('resume', resume);
+  appendJobDescription(formData, jobDescription);
+  if (analyzers) {
+    formData.append('analyzers', analyzers.join(','));
+  }
+
+  const response = await api.post('/jobs/analyze', formData);
+  return response.data; // { job_id, status, ... }
+};
+
+export const getAnalysisJob = async (jobId) => {
+  const response = await api.get(`/jobs/${jobId}`);
+  return response.data;
+};
+
+export const cancelAnalysisJob = async (jobId) => {
+  const response = await api.delete(`/jobs/${jobId}`);
+  return response.data;
+};
+
+/* =====================================================
+   📡 SSE READER
+   EventSource can't send the Authorization header (or POST
+   a file), so SSE streams are read with fetch instead.
+   onEvent(type, data) fires once per event.
+===================================================== */
+const readEventStream = async (path, options, onEvent) => {
+  const token = localStorage.getItem("token");
+  const response = await fetch(`${API_BASE_URL}${path}`, {
+    ...options,
+    headers: token ? { Authorization: `Bearer ${token}` } : {},
+  });
+  if (!response.ok) {
+    throw new Error(`Stream failed: ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let sep;
+    while ((sep = buffer.indexOf('\n\n')) !== -1) {
+      const block = buffer.slice(0, sep);
+      buffer = buffer.slice(sep + 2);
+
+      let type = 'message';
+      let data = '';
+      for (const line of block.split('\n')) {
+        if (line.startsWith('event: ')) type = line.slice(7);
+        else if (line.startsWith('data: ')) data += line.slice(6);
+      }
+      if (data) onEvent(type, JSON.parse(data));
+    }
+  }
+};
+
+// "result" / "error" / "status" events; resolves when the job is final
+export const streamAnalysisJob = (jobId, onEvent, signal) =>
+  readEventStream(`/jobs/${jobId}/events`, { signal }, onEvent);
+
+/* =====================================================
+   🧠 SEMANTIC MATCH (PROGRESSIVE)
+   "partial" events: score + verdict first, then one gap
+   category each; "done" carries the full result.
+===================================================== */
+export const streamSemanticMatch = (resume, jobDescription, onEvent, signal, mode) => {
+  const formData = new FormData();
+  formData.append('resume', resume);
+  appendJobDescription(formData, jobDescription);
+  if (mode) formData.append('mode', mode);
+
+  return readEventStream(
+    '/semantic/full-gap-analysis?stream=sse',
+    { method: 'POST', body: formData, signal },
+    onEvent
+  );
+};
+
 export default api;